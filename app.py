@@ -1,937 +1,966 @@
-# app.py
-import streamlit as st
-import pandas as pd
-import json, os, io, textwrap
-from io import BytesIO
-from collections import defaultdict
-
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-
-st.set_page_config(page_title="Ders Programı (Greedy + PDF/Excel + Pin + Kıtlık-Önce + JSON İndir/Yükle)", layout="wide")
-
-# ====================== Yardımcılar ======================
-
-APP_STATE_VERSION = 2  # JSON şemasına basit sürüm etiketi
-
-def default_constraint_settings():
-    return {
-        "online_cap": 3,
-        "max_per_room": 1,
-        "enf_instructor_no_overlap": True,
-        "enf_class_no_overlap": True,
-    }
-
-def ensure_session_defaults():
-    if "days" not in st.session_state:
-        st.session_state.days = ["Pzt","Sal","Çar","Per","Cum"]
-    if "slots_per_day" not in st.session_state:
-        st.session_state.slots_per_day = 10
-    if "time_labels" not in st.session_state:
-        st.session_state.time_labels = {
-            0:"08:45",1:"09:35",2:"10:25",3:"11:15",4:"12:05",
-            5:"13:40",6:"14:30",7:"15:20",8:"16:10",9:"17:00"
-        }
-    if "rooms" not in st.session_state:
-        st.session_state.rooms = [{"id":"Oda-1"},{"id":"Oda-2"}]
-    if "instructors" not in st.session_state:
-        st.session_state.instructors = ["Hoca_A","Hoca_B"]
-    if "instructor_unavailable" not in st.session_state:
-        st.session_state.instructor_unavailable = {h: set() for h in st.session_state.instructors}
-    if "courses" not in st.session_state:
-        st.session_state.courses = [
-            {"id":"SAN1101","ad":"Eski Anadolu Uygarlıkları I","hoca":"Hoca_A","sinif":1,"sure":3,"ardisik":True,"online":False},
-            {"id":"SAN1102","ad":"Sanat Tarihine Giriş","hoca":"Hoca_B","sinif":1,"sure":3,"ardisik":True,"online":False},
-            {"id":"KAR100","ad":"Kariyer Planlama","hoca":"Hoca_A","sinif":1,"sure":1,"ardisik":False,"online":True},
-        ]
-    if "constraint_settings" not in st.session_state:
-        st.session_state.constraint_settings = default_constraint_settings()
-    if "day_start_slot" not in st.session_state:
-        st.session_state.day_start_slot = {i: 0 for i in range(len(st.session_state.days))}
-    if "day_use_slots" not in st.session_state:
-        st.session_state.day_use_slots = {i: st.session_state.slots_per_day for i in range(len(st.session_state.days))}
-    if "pins" not in st.session_state:
-        st.session_state.pins = []
-    if "strategy" not in st.session_state:
-        st.session_state.strategy = "Kıtlık-önce (önerilir)"
-
-def _to_bool(v):
-    if isinstance(v, bool): return v
-    if v is None: return False
-    s = str(v).strip().lower()
-    return s in ["true","1","evet","yes","y","t","e","doğru","on"]
-
-# --- JSON İndir/Yükle (Kullanıcı tarafı kalıcılık) ---
-
-def build_state_payload() -> dict:
-    """Şu anki durumu JSON'a uygun bir dict olarak çıkar."""
-    return {
-        "_version": APP_STATE_VERSION,
-        "days": st.session_state.days,
-        "slots_per_day": st.session_state.slots_per_day,
-        "time_labels": st.session_state.time_labels,
-        "rooms": st.session_state.rooms,
-        "instructors": st.session_state.instructors,
-        "instructor_unavailable": {
-            k: [[int(d), int(s)] for (d, s) in v]
-            for k, v in st.session_state.instructor_unavailable.items()
-        },
-        "courses": st.session_state.courses,
-        "constraint_settings": st.session_state.constraint_settings,
-        "day_start_slot": st.session_state.day_start_slot,
-        "day_use_slots": st.session_state.day_use_slots,
-        "pins": st.session_state.pins,
-        "strategy": st.session_state.strategy,
-    }
-
-def apply_state_payload(data: dict):
-    """JSON'dan alınan dict'i session'a uygula (tip dönüşümleri dahil)."""
-    # Zorunlu alanlar için varsayılanlar
-    days = data.get("days", ["Pzt","Sal","Çar","Per","Cum"])
-    spd = int(data.get("slots_per_day", 10))
-    st.session_state.days = [str(d) for d in days]
-    st.session_state.slots_per_day = spd
-    st.session_state.time_labels = {int(k): str(v) for k, v in data.get("time_labels", {}).items()} or {
-        i: f"{9+i:02d}:00" for i in range(spd)
-    }
-    st.session_state.rooms = list(data.get("rooms", [{"id":"Oda-1"},{"id":"Oda-2"}]))
-    st.session_state.instructors = list(data.get("instructors", []))
-    # Hoca uygunlukları set(tuple) olarak geri yükle
-    iu = {}
-    for h, slots in data.get("instructor_unavailable", {}).items():
-        try:
-            iu[h] = set((int(d), int(s)) for d, s in slots)
-        except Exception:
-            iu[h] = set()
-    st.session_state.instructor_unavailable = iu
-    # Kurslar
-    st.session_state.courses = []
-    for c in data.get("courses", []):
-        st.session_state.courses.append({
-            "id": str(c.get("id","")).strip(),
-            "ad": str(c.get("ad","")).strip(),
-            "hoca": str(c.get("hoca","")).strip(),
-            "sinif": int(c.get("sinif",1)),
-            "sure": int(c.get("sure",1)),
-            "ardisik": bool(c.get("ardisik", False)),
-            "online": bool(c.get("online", False)),
-        })
-    # Kısıtlar & gün penceresi & pinler
-    st.session_state.constraint_settings = data.get("constraint_settings", default_constraint_settings())
-    dcount = len(st.session_state.days)
-    st.session_state.day_start_slot = {int(k): int(v) for k, v in data.get("day_start_slot", {i:0 for i in range(dcount)}).items()}
-    st.session_state.day_use_slots  = {int(k): int(v) for k, v in data.get("day_use_slots",  {i:spd for i in range(dcount)}).items()}
-    st.session_state.pins = list(data.get("pins", []))
-    st.session_state.strategy = str(data.get("strategy", "Kıtlık-önce (önerilir)"))
-
-def export_courses_csv(courses):
-    out = io.StringIO()
-    cols = ["id","ad","hoca","sinif","sure","ardisik","online"]
-    pd.DataFrame([{k:c.get(k,"") for k in cols} for c in courses], columns=cols).to_csv(out, index=False)
-    return out.getvalue()
-
-def export_courses_xlsx(courses):
-    cols = ["id","ad","hoca","sinif","sure","ardisik","online"]
-    df = pd.DataFrame([{k:c.get(k,"") for k in cols} for c in courses], columns=cols)
-    bio = BytesIO()
-    with pd.ExcelWriter(bio, engine="openpyxl") as w:
-        df.to_excel(w, sheet_name="dersler", index=False)
-    bio.seek(0)
-    return bio
-
-# ====================== Kıtlık Hesabı ======================
-
-def count_feasible_starts_for_course(c, day_start_slot, day_use_slots, spd, inst_unav, days_len):
-    L = int(c["sure"])
-    h = c["hoca"]
-    if L <= 0: return 0
-    feas = 0
-    for d in range(days_len):
-        start0 = int(day_start_slot.get(d, 0))
-        use0   = int(day_use_slots.get(d, spd))
-        end_allowed = min(spd, start0 + use0) - 1
-        if end_allowed < start0 or L > (end_allowed - start0 + 1):
-            continue
-        for s in range(start0, end_allowed - L + 2):
-            if any((d, ss) in inst_unav.get(h, set()) for ss in range(s, s+L)):
-                continue
-            feas += 1
-    return feas
-
-# ====================== Greedy Planlayıcı (Gün-Gün) + PIN ======================
-
-def greedy_schedule(days, spd, rooms, courses, inst_unav, cs, day_start_slot, day_use_slots, pins, strategy):
-    n_days = len(days)
-    n_rooms = len(rooms)
-    online_cap = int(cs["online_cap"])
-    max_per_room = int(cs["max_per_room"])
-    enf_inst = bool(cs["enf_instructor_no_overlap"])
-    enf_class = bool(cs["enf_class_no_overlap"])
-
-    room_occ = [[[0]*spd for _ in range(n_rooms)] for __ in range(n_days)]
-    online_load = [[0]*spd for _ in range(n_days)]
-    busy_inst = [[set() for _ in range(spd)] for __ in range(n_days)]
-    busy_class = [[set() for _ in range(spd)] for __ in range(n_days)]
-
-    placed, unplaced = [], []
-    idx_by_id = {c["id"]: i for i, c in enumerate(courses)}
-
-    # ---- 1) PIN'ler ----
-    pinned_ci = set()
-    for p in pins:
-        cid = p.get("id", "").strip()
-        if cid not in idx_by_id:
-            continue
-        ci = idx_by_id[cid]
-        if ci in pinned_ci:
-            continue
-        c = courses[ci]; L = int(c["sure"])
-        d = int(p.get("day", 0))
-        start = int(p.get("start", 0))
-        channel = p.get("channel", "FaceToFace")
-        room_id = p.get("room", None)
-
-        start0 = int(day_start_slot.get(d, 0))
-        use0   = int(day_use_slots.get(d, spd))
-        end_allowed = min(spd, start0 + use0) - 1
-        if start < start0 or start + L - 1 > end_allowed or start + L - 1 >= spd:
-            unplaced.append((ci, f"PIN geçersiz: gün penceresi dışında ({days[d]} {start0}-{end_allowed})"))
-            continue
-
-        if any((d, s) in inst_unav.get(c["hoca"], set()) for s in range(start, start+L)):
-            unplaced.append((ci, "PIN geçersiz: hoca uygunsuz saat"))
-            continue
-
-        if enf_inst and any((c["hoca"] in busy_inst[d][s]) for s in range(start, start+L)):
-            unplaced.append((ci, "PIN geçersiz: hoca çakışması"))
-            continue
-        if enf_class and any((c["sinif"] in busy_class[d][s]) for s in range(start, start+L)):
-            unplaced.append((ci, "PIN geçersiz: sınıf çakışması"))
-            continue
-
-        if channel == "Online" or c["online"]:
-            if any(online_load[d][s] >= online_cap for s in range(start, start+L)):
-                unplaced.append((ci, "PIN geçersiz: online kapasite dolu"))
-                continue
-            for s in range(start, start+L):
-                online_load[d][s] += 1
-                busy_inst[d][s].add(c["hoca"])
-                busy_class[d][s].add(c["sinif"])
-            placed.append((ci, d, start, "Online", "ONLINE"))
-            pinned_ci.add(ci)
-        else:
-            if not room_id:
-                unplaced.append((ci, "PIN geçersiz: oda belirtilmemiş"))
-                continue
-            try:
-                ri = [r["id"] for r in rooms].index(room_id)
-            except ValueError:
-                unplaced.append((ci, f"PIN geçersiz: oda bulunamadı ({room_id})"))
-                continue
-            if any(room_occ[d][ri][s] >= max_per_room for s in range(start, start+L)):
-                unplaced.append((ci, "PIN geçersiz: oda kapasitesi dolu"))
-                continue
-            for s in range(start, start+L):
-                room_occ[d][ri][s] += 1
-                busy_inst[d][s].add(c["hoca"])
-                busy_class[d][s].add(c["sinif"])
-            placed.append((ci, d, start, "FaceToFace", rooms[ri]["id"]))
-            pinned_ci.add(ci)
-
-    # ---- 2) Sıralama ----
-    idx_offline = [i for i,c in enumerate(courses) if (not c["online"]) and i not in pinned_ci]
-    idx_online  = [i for i,c in enumerate(courses) if c["online"] and i not in pinned_ci]
-
-    def scarcity_key(i):
-        c = courses[i]
-        feas = count_feasible_starts_for_course(c, day_start_slot, day_use_slots, spd, inst_unav, n_days)
-        return (feas, -int(c.get("sinif", 1) == 4), -int(c["sure"]))
-
-    if strategy.startswith("Kıtlık"):
-        idx_offline.sort(key=scarcity_key)
-        idx_online.sort(key=scarcity_key)
-    else:
-        idx_offline.sort(key=lambda i: -int(courses[i]["sure"]))
-        idx_online.sort(key=lambda i: -int(courses[i]["sure"]))
-
-    # ---- 3) Yerleştirme: OFFLINE ----
-    for ci in idx_offline:
-        c = courses[ci]; L = int(c["sure"])
-        done = False
-        for d in range(n_days):
-            start0 = int(day_start_slot.get(d, 0))
-            use0   = int(day_use_slots.get(d, spd))
-            end_allowed = min(spd, start0 + use0) - 1
-            if end_allowed < start0 or L > (end_allowed - start0 + 1):
-                continue
-            for start in range(start0, end_allowed - L + 2):
-                if any((d, s) in inst_unav.get(c["hoca"], set()) for s in range(start, start+L)):
-                    continue
-                if enf_inst and any((c["hoca"] in busy_inst[d][s]) for s in range(start, start+L)):
-                    continue
-                if enf_class and any((c["sinif"] in busy_class[d][s]) for s in range(start, start+L)):
-                    continue
-                chosen_ri = None
-                for ri in range(n_rooms):
-                    if any(room_occ[d][ri][s] >= max_per_room for s in range(start, start+L)):
-                        continue
-                    chosen_ri = ri; break
-                if chosen_ri is None:
-                    continue
-                for s in range(start, start+L):
-                    room_occ[d][chosen_ri][s] += 1
-                    busy_inst[d][s].add(c["hoca"])
-                    busy_class[d][s].add(c["sinif"])
-                placed.append((ci, d, start, "FaceToFace", rooms[chosen_ri]["id"]))
-                done = True
-                break
-            if done: break
-        if not done:
-            unplaced.append((ci, "Uygun oda/slot (gün penceresi içinde) bulunamadı"))
-
-    # ---- 4) Yerleştirme: ONLINE ----
-    for ci in idx_online:
-        c = courses[ci]; L = int(c["sure"])
-        done = False
-        for d in range(n_days):
-            start0 = int(day_start_slot.get(d, 0))
-            use0   = int(day_use_slots.get(d, spd))
-            end_allowed = min(spd, start0 + use0) - 1
-            if end_allowed < start0 or L > (end_allowed - start0 + 1):
-                continue
-            for start in range(start0, end_allowed - L + 2):
-                if any((d, s) in inst_unav.get(c["hoca"], set()) for s in range(start, start+L)):
-                    continue
-                if enf_inst and any((c["hoca"] in busy_inst[d][s]) for s in range(start, start+L)):
-                    continue
-                if enf_class and any((c["sinif"] in busy_class[d][s]) for s in range(start, start+L)):
-                    continue
-                if any(online_load[d][s] >= int(online_cap) for s in range(start, start+L)):
-                    continue
-                for s in range(start, start+L):
-                    online_load[d][s] += 1
-                    busy_inst[d][s].add(c["hoca"])
-                    busy_class[d][s].add(c["sinif"])
-                placed.append((ci, d, start, "Online", "ONLINE"))
-                done = True
-                break
-            if done: break
-        if not done:
-            unplaced.append((ci, "Online kapasite/çakışma (gün penceresi)"))
-
-    # ---- 5) Görsel tablo verisi ----
-    placed_by_cell = defaultdict(list)
-    for ci, d, start, ch, rm in placed:
-        L = int(courses[ci]["sure"])
-        for s in range(start, start+L):
-            placed_by_cell[(d, s, ch, rm)].append(ci)
-
-    rows = []
-    for d in range(n_days):
-        for s in range(st.session_state.slots_per_day):
-            for ri in range(n_rooms):
-                key = (d, s, "FaceToFace", rooms[ri]["id"])
-                cis = placed_by_cell.get(key, [])
-                cell_txt = "-"
-                if cis:
-                    parts = []
-                    for ci in cis:
-                        c = courses[ci]
-                        parts.append(f"{c['id']} | {c['ad']} | {c['hoca']} | S{c['sinif']}")
-                    cell_txt = " / ".join(parts)
-                rows.append([st.session_state.days[d], st.session_state.time_labels.get(s, str(s+1)),
-                             "FaceToFace", rooms[ri]["id"], cell_txt])
-            key = (d, s, "Online", "ONLINE")
-            cis = placed_by_cell.get(key, [])
-            cell_txt = "-"
-            if cis:
-                parts = []
-                for ci in cis:
-                    c = courses[ci]
-                    parts.append(f"{c['id']} | {c['ad']} | {c['hoca']} | S{c['sinif']}")
-                cell_txt = " / ".join(parts)
-            rows.append([st.session_state.days[d], st.session_state.time_labels.get(s, str(s+1)),
-                         "Online", "ONLINE", cell_txt])
-
-    timetable_df = pd.DataFrame(rows, columns=["Day","Slot","Channel","Room","Courses"])
-
-    diag_rows = []
-    for ci, reason in unplaced:
-        c = courses[ci]
-        diag_rows.append({
-            "id": c["id"], "ad": c["ad"], "hoca": c["hoca"], "sinif": c["sinif"],
-            "sure": c["sure"], "online": c["online"], "neden": reason
-        })
-    diag_df = pd.DataFrame(diag_rows, columns=["id","ad","hoca","sinif","sure","online","neden"])
-
-    return timetable_df, diag_df, placed, unplaced
-
-# ====================== Gün Gün Okunur Tablo ======================
-
-def render_day_tables(timetable_df, days, rooms, time_labels):
-    def fmt(cell):
-        if not isinstance(cell, str) or cell.strip() == "-" or cell.strip() == "":
-            return ""
-        parts = [p.strip() for p in cell.split("/") if p.strip()]
-        return "\n".join(parts)
-    max_slot_index = max(time_labels.keys()) if time_labels else 0
-    for d in days:
-        cols = ["Saat"] + [r["id"] for r in rooms] + ["ONLINE"]
-        rows = []
-        for s in range(max_slot_index + 1):
-            saat = time_labels.get(s, f"{s+1}. Slot")
-            row = [saat]
-            for r in rooms:
-                mask = (
-                    (timetable_df["Day"] == d) &
-                    (timetable_df["Slot"] == saat) &
-                    (timetable_df["Channel"] == "FaceToFace") &
-                    (timetable_df["Room"] == r["id"])
-                )
-                vals = timetable_df.loc[mask, "Courses"].values
-                row.append(fmt(vals[0]) if len(vals) else "")
-            mask_on = (
-                (timetable_df["Day"] == d) &
-                (timetable_df["Slot"] == saat) &
-                (timetable_df["Channel"] == "Online") &
-                (timetable_df["Room"] == "ONLINE")
-            )
-            vals_on = timetable_df.loc[mask_on, "Courses"].values
-            row.append(fmt(vals_on[0]) if len(vals_on) else "")
-            rows.append(row)
-        day_df = pd.DataFrame(rows, columns=cols)
-        st.markdown(f"### {d}")
-        st.table(day_df.style.set_properties(**{"white-space": "pre-wrap"}))
-
-# ====================== PDF Üretimi (wrap + dinamik satır) ======================
-
-def _wrap_cell(text, max_chars):
-    if text is None: return ""
-    t = str(text).strip()
-    if t == "-" or t == "": return ""
-    t = t.replace(" / ", "\n")
-    lines = []
-    for part in t.split("\n"):
-        if not part.strip():
-            lines.append("")
-            continue
-        wrapped = textwrap.wrap(part, width=max_chars, break_long_words=True, break_on_hyphens=True)
-        lines.extend(wrapped if wrapped else [part])
-    return "\n".join(lines)
-
-def timetable_to_pdf(timetable_df, days, rooms, time_labels, pdf_path):
-    max_slot_index = max(time_labels.keys()) if time_labels else 0
-    n_content = len(rooms) + 1
-    saat_w = 0.12
-    rest_w = (1.0 - saat_w) / n_content
-    col_widths = [saat_w] + [rest_w]*(n_content)
-    col_char_limits = [8] + [max(16, int(rest_w*100))]*n_content
-
-    with PdfPages(pdf_path) as pdf:
-        for d in days:
-            cols = ["Saat"] + [r["id"] for r in rooms] + ["ONLINE"]
-            rows = []
-            for s in range(max_slot_index + 1):
-                saat = time_labels.get(s, f"{s+1}. Slot")
-                row = [saat]
-                for r in rooms:
-                    mask = (
-                        (timetable_df["Day"] == d) &
-                        (timetable_df["Slot"] == saat) &
-                        (timetable_df["Channel"] == "FaceToFace") &
-                        (timetable_df["Room"] == r["id"])
-                    )
-                    vals = timetable_df.loc[mask, "Courses"].values
-                    val = "" if len(vals)==0 else vals[0]
-                    row.append(val)
-                mask_on = (
-                    (timetable_df["Day"] == d) &
-                    (timetable_df["Slot"] == saat) &
-                    (timetable_df["Channel"] == "Online") &
-                    (timetable_df["Room"] == "ONLINE")
-                )
-                vals_on = timetable_df.loc[mask_on, "Courses"].values
-                val_on = "" if len(vals_on)==0 else vals_on[0]
-                row.append(val_on)
-                rows.append(row)
-
-            df = pd.DataFrame(rows, columns=cols)
-
-            # Wrap ve satır yükseklikleri
-            wrapped = []
-            row_max_lines = []
-            for r_i in range(len(df)):
-                wr_row = []
-                max_lines = 1
-                for c_i, col in enumerate(df.columns):
-                    raw = df.iat[r_i, c_i]
-                    w = _wrap_cell(raw, col_char_limits[c_i])
-                    wr_row.append(w)
-                    max_lines = max(max_lines, w.count("\n")+1 if w else 1)
-                wrapped.append(wr_row)
-                row_max_lines.append(max_lines)
-
-            fig = plt.figure(figsize=(11.69, 8.27))  # A4 yatay
-            ax = plt.gca()
-            ax.axis('off')
-            ax.set_title(f"{d} - Ders Programı", pad=12)
-
-            tbl = ax.table(cellText=wrapped, colLabels=df.columns, loc='center', cellLoc='left')
-            tbl.auto_set_font_size(False)
-            tbl.set_fontsize(7)
-
-            for (r, c), cell in tbl.get_celld().items():
-                w = col_widths[c] if c < len(col_widths) else rest_w
-                cell.set_width(w)
-
-            base_h = 0.04
-            for r in range(1, len(df)+1):  # 1..n, 0 header
-                lines = row_max_lines[r-1]
-                h = base_h * max(1.0, lines*0.9)
-                for c in range(len(cols)):
-                    tbl[(r, c)].set_height(h)
-
-            for c in range(len(cols)):
-                hdr = tbl[(0, c)]
-                hdr.set_height(0.05)
-                hdr.set_fontsize(8)
-
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
-
-# ====================== Excel Üretimi (gün başına ayrı sayfa) ======================
-
-def timetable_to_excel_bytes(timetable_df, days, rooms, time_labels):
-    from openpyxl import Workbook
-    from openpyxl.styles import Alignment, Font
-
-    wb = Workbook()
-    wb.remove(wb.active)
-    max_slot_index = max(time_labels.keys()) if time_labels else 0
-    room_ids = [r["id"] for r in rooms]
-
-    for d in days:
-        ws = wb.create_sheet(title=d)
-        headers = ["Saat"] + room_ids + ["ONLINE"]
-        ws.append(headers)
-        for col in range(1, len(headers)+1):
-            ws.cell(row=1, column=col).font = Font(bold=True)
-
-        for s in range(max_slot_index + 1):
-            saat = time_labels.get(s, f"{s+1}. Slot")
-            row_vals = [saat]
-            for rid in room_ids:
-                mask = (
-                    (timetable_df["Day"] == d) &
-                    (timetable_df["Slot"] == saat) &
-                    (timetable_df["Channel"] == "FaceToFace") &
-                    (timetable_df["Room"] == rid)
-                )
-                vals = timetable_df.loc[mask, "Courses"].values
-                v = "" if len(vals)==0 or str(vals[0]).strip()=="-" else str(vals[0]).replace(" / ", "\n")
-                row_vals.append(v)
-            mask_on = (
-                (timetable_df["Day"] == d) &
-                (timetable_df["Slot"] == saat) &
-                (timetable_df["Channel"] == "Online") &
-                (timetable_df["Room"] == "ONLINE")
-            )
-            vals_on = timetable_df.loc[mask_on, "Courses"].values
-            v_on = "" if len(vals_on)==0 or str(vals_on[0]).strip()=="-" else str(vals_on[0]).replace(" / ", "\n")
-            row_vals.append(v_on)
-            ws.append(row_vals)
-
-        wrap = Alignment(wrap_text=True, vertical="top")
-        for r in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-            for cell in r:
-                cell.alignment = wrap
-
-        ws.column_dimensions["A"].width = 10
-        for idx in range(2, len(headers)+1):
-            ws.column_dimensions[chr(64+idx)].width = 45
-        for rr in range(2, ws.max_row+1):
-            ws.row_dimensions[rr].height = 30
-
-    bio = BytesIO()
-    from openpyxl.writer.excel import save_workbook
-    save_workbook(wb, bio)
-    bio.seek(0)
-    return bio
-
-# ====================== Uygulama UI ======================
-
-ensure_session_defaults()
-
-left, right = st.columns([0.48, 0.52])
-
-with left:
-    st.header("Veri Girişi")
-
-    # ---- JSON İndir / JSON Yükle (Cloud kalıcılığı için önerilen) ----
-    with st.expander("💾 JSON İndir / 📂 JSON Yükle (Kalıcı kayıt için önerilir)", expanded=True):
-        # İndir
-        state_bytes = json.dumps(build_state_payload(), ensure_ascii=False, indent=2).encode("utf-8")
-        st.download_button("💾 JSON indir", data=state_bytes, file_name="timetable_state.json", mime="application/json")
-
-        # Yükle
-        up = st.file_uploader("JSON yükle ve uygula", type=["json"])
-        if up is not None and st.button("JSON'u Uygula"):
-            try:
-                data = json.load(up)
-                apply_state_payload(data)
-                st.success("JSON uygulandı. Arayüz güncellendi.")
-                st.rerun()
-            except Exception as e:
-                st.error(f"JSON okunamadı: {e}")
-
-    with st.expander("📥 Dersleri İçe/Dışa Aktar", expanded=False):
-        template_cols = ["id","ad","hoca","sinif","sure","ardisik","online"]
-        template_df = pd.DataFrame([{
-            "id":"SAN1101","ad":"Eski Anadolu Uygarlıkları I","hoca":"Hoca_A",
-            "sinif":1,"sure":3,"ardisik":True,"online":False
-        }], columns=template_cols)
-        t_csv = template_df.to_csv(index=False)
-        st.download_button("📄 Şablon (CSV) indir", data=t_csv, file_name="ders_sablon.csv", mime="text/csv")
-        t_xlsx = export_courses_xlsx(template_df.to_dict(orient="records"))
-        st.download_button("📊 Şablon (Excel) indir", data=t_xlsx.getvalue(), file_name="ders_sablon.xlsx",
-                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-        st.markdown("---")
-        col_e1, col_e2 = st.columns(2)
-        with col_e1:
-            st.download_button("Mevcut dersleri **CSV** indir",
-                               data=export_courses_csv(st.session_state.courses),
-                               file_name="dersler.csv", mime="text/csv")
-        with col_e2:
-            st.download_button("Mevcut dersleri **Excel** indir",
-                               data=export_courses_xlsx(st.session_state.courses).getvalue(),
-                               file_name="dersler.xlsx",
-                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-        uploaded = st.file_uploader("Excel (.xlsx) veya CSV yükle", type=["xlsx","csv"], key="course_upload")
-        replace_all = st.checkbox("Mevcut listeyi SİL (tam yerine yaz)", value=False)
-        update_existing = st.checkbox("Aynı ID'li dersi güncelle", value=True)
-        if st.button("İçe Aktar", key="import_courses"):
-            if not uploaded:
-                st.warning("Önce bir dosya yükleyin.")
-            else:
-                try:
-                    if uploaded.name.lower().endswith(".csv"):
-                        df = pd.read_csv(uploaded)
-                    else:
-                        df = pd.read_excel(uploaded, sheet_name=0)
-                    df.columns = [c.lower() for c in df.columns]
-                    required = set(template_cols)
-                    missing = required - set(df.columns)
-                    if missing:
-                        st.error(f"Eksik kolon(lar): {', '.join(sorted(missing))}")
-                    else:
-                        df["sinif"] = df["sinif"].astype(int)
-                        df["sure"]  = df["sure"].astype(int)
-                        df["ardisik"] = df["ardisik"].apply(_to_bool)
-                        df["online"]  = df["online"].apply(_to_bool)
-                        for h in sorted(set(df["hoca"].dropna())):
-                            if h not in st.session_state.instructors:
-                                st.session_state.instructors.append(h)
-                                st.session_state.instructor_unavailable[h] = set()
-                        new_courses = []
-                        for _, r in df.iterrows():
-                            new_courses.append({
-                                "id": str(r["id"]).strip(), "ad": str(r["ad"]).strip(),
-                                "hoca": str(r["hoca"]).strip(), "sinif": int(r["sinif"]),
-                                "sure": int(r["sure"]), "ardisik": bool(r["ardisik"]), "online": bool(r["online"])
-                            })
-                        if replace_all:
-                            st.session_state.courses = new_courses
-                        else:
-                            by_id = {c["id"]: c for c in st.session_state.courses}
-                            for nc in new_courses:
-                                if nc["id"] in by_id and update_existing:
-                                    by_id[nc["id"]].update(nc)
-                                elif nc["id"] not in by_id:
-                                    st.session_state.courses.append(nc)
-                        st.success(f"İçe aktarma tamam: {len(new_courses)} ders okundu.")
-                        st.rerun()
-                except Exception as e:
-                    st.error(f"İçe aktarma hatası: {e}")
-
-    with st.expander("Takvim, Sınıflar ve Gün Penceresi", expanded=True):
-        days_str = st.text_input("Günler (virgülle)", value=",".join(st.session_state.days))
-        spd = st.number_input("Günlük slot sayısı", min_value=1, max_value=16,
-                              value=st.session_state.slots_per_day, step=1)
-        if st.button("Takvim Güncelle"):
-            st.session_state.days = [d.strip() for d in days_str.split(",") if d.strip()]
-            st.session_state.slots_per_day = int(spd)
-            dcount = len(st.session_state.days)
-            st.session_state.day_start_slot = {i: st.session_state.day_start_slot.get(i, 0) for i in range(dcount)}
-            st.session_state.day_use_slots  = {i: st.session_state.day_use_slots.get(i, st.session_state.slots_per_day) for i in range(dcount)}
-            st.session_state.time_labels = {i: st.session_state.time_labels.get(i, f"{9+i:02d}:00")
-                                            for i in range(st.session_state.slots_per_day)}
-            st.rerun()
-
-        with st.form("slot_labels"):
-            st.markdown("**Slot Saat Etiketleri**")
-            tl = {}
-            for i in range(st.session_state.slots_per_day):
-                tl[i] = st.text_input(f"Slot {i+1}", value=st.session_state.time_labels.get(i, f"{9+i:02d}:00"))
-            if st.form_submit_button("Etiketleri Kaydet"):
-                st.session_state.time_labels = tl
-                st.success("Kaydedildi.")
-
-        st.markdown("**Sınıflar (Oda)**")
-        rm_to_del = st.selectbox("Silmek için seç", options=["(seçme)"] + [r["id"] for r in st.session_state.rooms])
-        c1, c2 = st.columns(2)
-        with c1:
-            if st.button("Seçili sınıfı sil") and rm_to_del != "(seçme)":
-                st.session_state.rooms = [r for r in st.session_state.rooms if r["id"] != rm_to_del]
-                st.rerun()
-        with c2:
-            rid = st.text_input("Yeni sınıf ID")
-            if st.button("Sınıf Ekle"):
-                if rid and rid not in [r["id"] for r in st.session_state.rooms]:
-                    st.session_state.rooms.append({"id": rid})
-                    st.rerun()
-        st.caption("Mevcut: " + ", ".join(r["id"] for r in st.session_state.rooms))
-
-        st.markdown("---")
-        st.markdown("### Gün Penceresi (Başlangıç Slotu & Kullanılacak Slot Sayısı)")
-        dcount = len(st.session_state.days)
-        for i in range(dcount):
-            col1, col2, col3 = st.columns([0.35, 0.35, 0.3])
-            with col1:
-                st.write(f"**{st.session_state.days[i]}**")
-            with col2:
-                st.session_state.day_start_slot[i] = st.number_input(
-                    f"{st.session_state.days[i]} başlangıç slotu", min_value=0,
-                    max_value=st.session_state.slots_per_day-1, value=int(st.session_state.day_start_slot.get(i,0)),
-                    key=f"start_{i}"
-                )
-            with col3:
-                st.session_state.day_use_slots[i] = st.number_input(
-                    f"{st.session_state.days[i]} kullanılacak slot sayısı", min_value=0,
-                    max_value=st.session_state.slots_per_day,
-                    value=int(st.session_state.day_use_slots.get(i, st.session_state.slots_per_day)),
-                    key=f"use_{i}"
-                )
-        st.caption("Not: Gün penceresi dışında kalan slotlara ders yerleştirilmez.")
-
-    with st.expander("Hocalar ve Uygunsuz Saatler", expanded=False):
-        colh1, colh2 = st.columns(2)
-        with colh1:
-            new_inst = st.text_input("Yeni hoca adı")
-            if st.button("Hoca Ekle"):
-                if new_inst and new_inst not in st.session_state.instructors:
-                    st.session_state.instructors.append(new_inst)
-                    st.session_state.instructor_unavailable[new_inst] = set()
-                    st.rerun()
-        with colh2:
-            del_inst = st.selectbox("Silinecek hoca", options=["(seçme)"] + st.session_state.instructors)
-            if st.button("Hoca Sil") and del_inst != "(seçme)":
-                st.session_state.instructors.remove(del_inst)
-                st.session_state.instructor_unavailable.pop(del_inst, None)
-                st.rerun()
-
-        if st.session_state.instructors:
-            sel = st.selectbox("Hoca seç", options=st.session_state.instructors)
-            st.caption("Uygun DEĞİL slotları işaretleyin")
-            days = st.session_state.days; spd = st.session_state.slots_per_day
-            for d in range(len(days)):
-                st.markdown(f"**{days[d]}**")
-                cols = st.columns(spd)
-                for s in range(spd):
-                    key = f"inst_{sel}_{d}_{s}"
-                    chk = (d, s) in st.session_state.instructor_unavailable.get(sel, set())
-                    cols[s].checkbox(st.session_state.time_labels.get(s, f"{s+1}"), value=chk, key=key)
-            if st.button("Kaydet (Hoca uygunluk)"):
-                updated = set()
-                for d in range(len(days)):
-                    for s in range(spd):
-                        if st.session_state.get(f"inst_{sel}_{d}_{s}"):
-                            updated.add((d, s))
-                st.session_state.instructor_unavailable[sel] = updated
-                st.success("Güncellendi.")
-
-    with st.expander("Dersler", expanded=True):
-        st.table(st.session_state.courses)
-        st.markdown("---")
-        ids = ["(yeni)"] + [c["id"] for c in st.session_state.courses]
-        choose = st.selectbox("Ders seç (düzenle)", options=ids)
-        editing = next((c for c in st.session_state.courses if c["id"] == choose), None)
-        if not editing:
-            editing = {"id":"", "ad":"", "hoca": (st.session_state.instructors[0] if st.session_state.instructors else ""),
-                       "sinif":1,"sure":1,"ardisik":False,"online":False}
-        c1, c2 = st.columns(2)
-        with c1:
-            cid = st.text_input("Ders ID", value=editing["id"])
-            cad = st.text_input("Ders Adı", value=editing["ad"])
-            choca = st.selectbox("Hoca", options=st.session_state.instructors or [""],
-                                 index=(st.session_state.instructors.index(editing["hoca"]) if editing["hoca"] in st.session_state.instructors else 0))
-        with c2:
-            csinif = st.number_input("Sınıf (1-4)", min_value=1, max_value=4, value=int(editing["sinif"]), step=1)
-            csure  = st.number_input("Süre (slot)", min_value=1, max_value=10, value=int(editing["sure"]), step=1)
-        card = st.toggle("Ardışık mı? (sure>1 ise)", value=bool(editing["ardisik"]))
-        conline = st.toggle("Online mı?", value=bool(editing["online"]))
-        b1, b2, b3 = st.columns(3)
-        with b1:
-            if st.button("Kaydet/Güncelle"):
-                if not cid: st.error("ID boş olamaz.")
-                else:
-                    if choose != "(yeni)":
-                        editing.update({"id":cid,"ad":cad,"hoca":choca,"sinif":int(csinif),
-                                        "sure":int(csure),"ardisik":bool(card),"online":bool(conline)})
-                    else:
-                        st.session_state.courses.append({"id":cid,"ad":cad,"hoca":choca,"sinif":int(csinif),
-                                                         "sure":int(csure),"ardisik":bool(card),"online":bool(conline)})
-                st.rerun()
-        with b2:
-            if choose != "(yeni)" and st.button("Seçileni Sil"):
-                st.session_state.courses = [c for c in st.session_state.courses if c["id"] != choose]
-                st.rerun()
-        with b3:
-            if st.button("Tüm Listeyi Temizle"):
-                st.session_state.courses = []
-                st.rerun()
-
-    with st.expander("📌 Pinler (Belirli slotlara sabitle)", expanded=True):
-        if not st.session_state.courses:
-            st.info("Önce ders ekleyin.")
-        else:
-            colp1, colp2 = st.columns(2)
-            with colp1:
-                pin_course = st.selectbox("Ders (ID)", options=[c["id"] for c in st.session_state.courses])
-                pin_day = st.selectbox("Gün", options=list(range(len(st.session_state.days))),
-                                       format_func=lambda i: st.session_state.days[i])
-                pin_start = st.number_input("Başlangıç slotu", min_value=0,
-                                            max_value=st.session_state.slots_per_day-1, value=0, step=1)
-            with colp2:
-                pin_channel = st.selectbox("Kanal", options=["FaceToFace","Online"])
-                pin_room = ""
-                if pin_channel == "FaceToFace":
-                    pin_room = st.selectbox("Oda", options=[r["id"] for r in st.session_state.rooms])
-                if st.button("Pin Ekle"):
-                    new_pin = {"id": pin_course, "day": int(pin_day), "start": int(pin_start), "channel": pin_channel}
-                    if pin_channel == "FaceToFace":
-                        new_pin["room"] = pin_room
-                    st.session_state.pins.append(new_pin)
-                    st.success("Pin eklendi.")
-                    st.rerun()
-
-            st.markdown("**Mevcut Pinler**")
-            if not st.session_state.pins:
-                st.caption("Henüz pin yok.")
-            else:
-                pin_df = pd.DataFrame(st.session_state.pins)
-                st.table(pin_df)
-                del_idx = st.number_input("Silinecek pin indexi (0-based)", min_value=0,
-                                          max_value=max(0, len(st.session_state.pins)-1),
-                                          value=0, step=1)
-                if st.button("Seçili pini sil"):
-                    if st.session_state.pins:
-                        st.session_state.pins.pop(int(del_idx))
-                        st.success("Pin silindi.")
-                        st.rerun()
-                if st.button("Tüm pinleri temizle"):
-                    st.session_state.pins = []
-                    st.success("Tüm pinler temizlendi.")
-                    st.rerun()
-
-with right:
-    st.header("Gün Gün Greedy Planlama")
-
-    with st.expander("⚙️ Kısıt Ayarları ve Strateji", expanded=True):
-        cs = st.session_state.constraint_settings
-        col1, col2 = st.columns(2)
-        with col1:
-            online_cap = st.number_input("Slot başına MAKS. ONLINE", min_value=0, max_value=50,
-                                         value=int(cs["online_cap"]), step=1)
-            max_per_room = st.number_input("Slot/ODA başına MAKS. yüz yüze", min_value=1, max_value=5,
-                                           value=int(cs["max_per_room"]), step=1)
-        with col2:
-            enf_inst = st.checkbox("Hoca aynı anda tek derste olsun", value=bool(cs["enf_instructor_no_overlap"]))
-            enf_class = st.checkbox("Sınıf (1–4) aynı anda tek derste olsun", value=bool(cs["enf_class_no_overlap"]))
-        st.session_state.strategy = st.selectbox(
-            "Sıralama stratejisi",
-            ["Kıtlık-önce (önerilir)", "Klasik: uzunluk-önce"],
-            index=0 if st.session_state.strategy.startswith("Kıtlık") else 1
-        )
-        if st.button("Kısıtları Kaydet"):
-            st.session_state.constraint_settings = {
-                "online_cap": int(online_cap),
-                "max_per_room": int(max_per_room),
-                "enf_instructor_no_overlap": bool(enf_inst),
-                "enf_class_no_overlap": bool(enf_class),
-            }
-            st.success("Kaydedildi.")
-
-    if st.button("📅 GÜN GÜN PLANLA (Greedy)"):
-        days = st.session_state.days
-        spd = st.session_state.slots_per_day
-        rooms = st.session_state.rooms
-        courses = st.session_state.courses
-        inst_unav = st.session_state.instructor_unavailable
-        cs = st.session_state.constraint_settings
-
-        timetable_df, diag_df, placed, unplaced = greedy_schedule(
-            days, spd, rooms, courses, inst_unav, cs,
-            day_start_slot=st.session_state.day_start_slot,
-            day_use_slots=st.session_state.day_use_slots,
-            pins=st.session_state.pins,
-            strategy=st.session_state.strategy
-        )
-
-        placed_courses = len(set(ci for (ci,_,_,_,_) in placed))
-        st.success(f"Yerleşen ders: {placed_courses}/{len(courses)}")
-
-        st.subheader("Haftalık Tablo (Gün Gün)")
-        render_day_tables(
-            timetable_df,
-            days=st.session_state.days,
-            rooms=st.session_state.rooms,
-            time_labels=st.session_state.time_labels
-        )
-
-        # CSV indir
-        out = io.StringIO()
-        timetable_df.to_csv(out, index=False)
-        st.download_button("Programı CSV indir", data=out.getvalue(),
-                           file_name="timetable.csv", mime="text/csv")
-
-        # Excel indir
-        excel_bytes = timetable_to_excel_bytes(
-            timetable_df,
-            days=st.session_state.days,
-            rooms=st.session_state.rooms,
-            time_labels=st.session_state.time_labels
-        )
-        st.download_button("📊 Programı Excel indir", data=excel_bytes.getvalue(),
-                           file_name="timetable.xlsx",
-                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-        # PDF indir
-        pdf_path = "timetable.pdf"
-        timetable_to_pdf(
-            timetable_df,
-            days=st.session_state.days,
-            rooms=st.session_state.rooms,
-            time_labels=st.session_state.time_labels,
-            pdf_path=pdf_path
-        )
-        with open(pdf_path, "rb") as f:
-            st.download_button("📄 Programı PDF indir", data=f.read(),
-                               file_name="timetable.pdf", mime="application/pdf")
-
-        # Yerleşemeyenler
-        st.subheader("Yerleşemeyen Dersler")
-        if diag_df.empty:
-            st.info("Tüm dersler yerleşti. 🎉")
-        else:
-            st.dataframe(diag_df, use_container_width=True)
-            out2 = io.StringIO()
-            diag_df.to_csv(out2, index=False)
-            st.download_button("Yerleşemeyenler (CSV)", data=out2.getvalue(),
-                               file_name="unscheduled_diagnostics.csv", mime="text/csv")
-
-    st.markdown("---")
-    st.caption("Streamlit Cloud'da kalıcı depolama olmadığı için 'JSON indir / JSON yükle' akışı ile verileri saklayın.")
+# app.py
+import streamlit as st
+import pandas as pd
+import copy, json, time
+
+from ders_programi import (
+    COURSE_COLS, SOFT_TERMS, STATE_KEYS, STRATEGIES, default_constraint_settings, default_soft_settings,
+    normalize_state, state_to_payload, score_breakdown,
+    export_courses_csv, export_courses_xlsx, incremental_schedule, multistart_schedule,
+    snapshot_plan, room_usage_frame, room_utilization, solve_departments,
+    check_state, import_courses, apply_variant, parse_spec, sweep_schedule, ScenarioStore, default_db_path,
+    export_key, timetable_to_csv, timetable_to_excel_bytes, timetable_to_pdf,
+    availability_frame, block_slots, copy_pattern, grid_to_unavailability, import_availability, unavailability_grid,
+)
+from ders_programi.grid import WEEKLY_VIEWS, build_grid, day_table, grid_to_frame, weekly_index, weekly_table
+from ders_programi.model import _to_features
+from ders_programi.scoring import SOFT_LABELS
+from ders_programi.perf import COUNTER_LABELS, PHASE_LABELS, enable_perf_logging, log_event, profile_call
+
+enable_perf_logging()  # "perf event=..." satırları sunucu loguna
+st.set_page_config(page_title="Ders Programı (Greedy + PDF/Excel + Pin + Kıtlık-Önce + JSON İndir/Yükle)", layout="wide")
+
+# ====================== Yardımcılar ======================
+
+def ensure_session_defaults():
+    if "days" not in st.session_state:
+        st.session_state.days = ["Pzt","Sal","Çar","Per","Cum"]
+    if "slots_per_day" not in st.session_state:
+        st.session_state.slots_per_day = 10
+    if "time_labels" not in st.session_state:
+        st.session_state.time_labels = {
+            0:"08:45",1:"09:35",2:"10:25",3:"11:15",4:"12:05",
+            5:"13:40",6:"14:30",7:"15:20",8:"16:10",9:"17:00"
+        }
+    if "rooms" not in st.session_state:
+        st.session_state.rooms = [{"id":"Oda-1","capacity":0,"features":[]},{"id":"Oda-2","capacity":0,"features":[]}]
+    if "instructors" not in st.session_state:
+        st.session_state.instructors = ["Hoca_A","Hoca_B"]
+    if "instructor_unavailable" not in st.session_state:
+        st.session_state.instructor_unavailable = {h: set() for h in st.session_state.instructors}
+    if "courses" not in st.session_state:
+        st.session_state.courses = [
+            {"id":"SAN1101","ad":"Eski Anadolu Uygarlıkları I","hoca":"Hoca_A","sinif":1,"sure":3,"ardisik":True,"online":False},
+            {"id":"SAN1102","ad":"Sanat Tarihine Giriş","hoca":"Hoca_B","sinif":1,"sure":3,"ardisik":True,"online":False},
+            {"id":"KAR100","ad":"Kariyer Planlama","hoca":"Hoca_A","sinif":1,"sure":1,"ardisik":False,"online":True},
+        ]
+    if "constraint_settings" not in st.session_state:
+        st.session_state.constraint_settings = default_constraint_settings()
+    if "day_start_slot" not in st.session_state:
+        st.session_state.day_start_slot = {i: 0 for i in range(len(st.session_state.days))}
+    if "day_use_slots" not in st.session_state:
+        st.session_state.day_use_slots = {i: st.session_state.slots_per_day for i in range(len(st.session_state.days))}
+    if "pins" not in st.session_state:
+        st.session_state.pins = []
+    if "strategy" not in st.session_state:
+        st.session_state.strategy = "Kıtlık-önce (önerilir)"
+    if "repair_budget" not in st.session_state:
+        st.session_state.repair_budget = 0.0
+    if "exact_node_limit" not in st.session_state:
+        st.session_state.exact_node_limit = 200000
+    if "exact_time_limit" not in st.session_state:
+        st.session_state.exact_time_limit = 10.0
+    if "incremental" not in st.session_state:
+        st.session_state.incremental = True
+    if "last_plan" not in st.session_state:
+        st.session_state.last_plan = None
+    if "last_result" not in st.session_state:
+        st.session_state.last_result = None
+    if "export_requested" not in st.session_state:
+        st.session_state.export_requested = set()
+    if "profile_plan" not in st.session_state:
+        st.session_state.profile_plan = False
+    if "faculty_result" not in st.session_state:
+        st.session_state.faculty_result = None
+    if "sweep_result" not in st.session_state:
+        st.session_state.sweep_result = None
+    if "pdf_views" not in st.session_state:
+        st.session_state.pdf_views = []
+    if "soft_settings" not in st.session_state:
+        st.session_state.soft_settings = default_soft_settings()
+    if "import_report" not in st.session_state:
+        st.session_state.import_report = None
+    if "availability_report" not in st.session_state:
+        st.session_state.availability_report = None
+    if "state_rev" not in st.session_state:
+        st.session_state.state_rev = 0
+    if "derived" not in st.session_state:
+        st.session_state.derived = {}
+    if "n_starts" not in st.session_state:
+        st.session_state.n_starts = 1
+    if "multistart_seed" not in st.session_state:
+        st.session_state.multistart_seed = 0
+
+def touch_state():
+    """STATE_KEYS verisi değişti: state_rev artar, ona bağlı türetilmiş çıktılar yenilenir."""
+    st.session_state.state_rev += 1
+
+def derived(name, fn):
+    """Oturum önbelleği: state_rev değişmedikçe fn yeniden çalışmaz (ör. ders listesi dışa aktarımları)."""
+    hit = st.session_state.derived.get(name)
+    if hit is None or hit[0] != st.session_state.state_rev:
+        hit = st.session_state.derived[name] = (st.session_state.state_rev, fn())
+    return hit[1]
+
+# --- JSON İndir/Yükle (Kullanıcı tarafı kalıcılık) ---
+
+def build_state_payload() -> dict:
+    """Şu anki durumu JSON'a uygun bir dict olarak çıkar."""
+    return state_to_payload(st.session_state)
+
+def current_state() -> dict:
+    """Çözücüye verilecek (pickle edilebilir) durum dict'i."""
+    return {k: st.session_state[k] for k in STATE_KEYS}
+
+def apply_state_payload(data: dict):
+    """JSON'dan alınan dict'i session'a uygula (tip dönüşümleri dahil)."""
+    for k, v in normalize_state(data).items():
+        st.session_state[k] = v
+    touch_state()
+
+def make_result(timetable_df, diag_df, grid, placed, courses, notes=(), perf=None):
+    """Sonuç, planlama anındaki takvim/oda/etiketlerle birlikte saklanır;
+    böylece sonraki yeniden çalıştırmalarda tablo ve indirmeler korunur."""
+    layout = {k: copy.deepcopy(st.session_state[k]) for k in ("days", "rooms", "time_labels")}
+    return {
+        "summary": f"Yerleşen ders: {len(set(p[0] for p in placed))}/{len(courses)}",
+        "notes": list(notes),
+        "timetable_df": timetable_df,
+        "diag_df": diag_df,
+        "grid": grid,
+        "placed": placed,
+        "courses": copy.deepcopy(courses),
+        "layout": layout,
+        "spd": st.session_state.slots_per_day,
+        "key": export_key(placed, courses, **layout),
+        "perf": perf or {"total": 0.0, "phases": [], "counters": {}, "exports": {}, "profile": None},
+    }
+
+# ====================== Gün Gün Okunur Tablo ======================
+
+def render_day_tables(grid, days, rooms, time_labels):
+    for di, d in enumerate(days):
+        day_df = day_table(grid, di, rooms, time_labels)
+        st.markdown(f"### {d}")
+        st.table(day_df.style.set_properties(**{"white-space": "pre-wrap"}))
+
+def render_perf_panel(perf):
+    with st.expander("Performans", expanded=False):
+        st.caption(f"Toplam planlama süresi: {perf['total']:.3f} sn")
+        if perf["phases"]:
+            st.markdown("**Aşamalar**")
+            total = sum(sec for _, sec in perf["phases"]) or 1.0
+            st.dataframe(pd.DataFrame(
+                [{"Aşama": PHASE_LABELS.get(name, name), "Süre (sn)": round(sec, 4), "Pay (%)": round(100*sec/total, 1)}
+                 for name, sec in perf["phases"]]), use_container_width=True, hide_index=True)
+        if perf["counters"]:
+            st.markdown("**Sayaçlar**")
+            st.dataframe(pd.DataFrame(
+                [{"Sayaç": COUNTER_LABELS.get(k, k), "Adet": v} for k, v in perf["counters"].items()]),
+                use_container_width=True, hide_index=True)
+        if perf["exports"]:
+            st.markdown("**Dışa aktarımlar** (önbellekten gelenler ~0 sn)")
+            st.dataframe(pd.DataFrame(
+                [{"Biçim": fmt, "Süre (sn)": round(v["seconds"], 4), "Bayt": v["bytes"]}
+                 for fmt, v in perf["exports"].items()]), use_container_width=True, hide_index=True)
+        if perf["profile"]:
+            st.markdown("**cProfile** (kümülatif süreye göre ilk 30)")
+            st.download_button("cProfile (.prof) indir", data=perf["profile"]["bytes"],
+                               file_name="planlama.prof", mime="application/octet-stream")
+            st.code(perf["profile"]["text"], language="text")
+
+# ====================== Dışa Aktarım (istek üzerine + önbellek) ======================
+
+EXPORT_FORMATS = {
+    "csv":  ("📄 Programı CSV", "timetable.csv", "text/csv"),
+    "xlsx": ("📊 Programı Excel", "timetable.xlsx",
+             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "pdf":  ("📄 Programı PDF", "timetable.pdf", "application/pdf"),
+}
+
+@st.cache_data(show_spinner=False)
+def course_templates():
+    """Ders şablonu (CSV metni, Excel baytları); sabit olduğu için bir kez üretilir."""
+    template_df = pd.DataFrame([{
+        "id":"SAN1101","ad":"Eski Anadolu Uygarlıkları I","hoca":"Hoca_A",
+        "sinif":1,"sure":3,"ardisik":True,"online":False,"enrollment":45,"features":""
+    }], columns=COURSE_COLS)
+    return template_df.to_csv(index=False), export_courses_xlsx(template_df.to_dict(orient="records")).getvalue()
+
+@st.cache_data(max_entries=32, show_spinner="Dosya hazırlanıyor...")
+def cached_export(fmt, key, _result, views=()):
+    """Tüm oturumlarca paylaşılan, en fazla 32 girdilik LRU önbellek.
+
+    Yalnızca (fmt, key, views) özetlenir; key = export_key(yerleşim + gün/oda/etiket),
+    views = PDF'e eklenecek haftalık görünümler.
+    """
+    if fmt == "csv":
+        return timetable_to_csv(_result["timetable_df"])
+    if fmt == "xlsx":
+        return timetable_to_excel_bytes(_result["grid"], placed=_result["placed"], courses=_result["courses"],
+                                        **_result["layout"]).getvalue()
+    # Sunucu sürecinde süreç havuzu açılmaz; sayfalar seri çizilir
+    return timetable_to_pdf(_result["grid"], placed=_result["placed"], courses=_result["courses"],
+                            views=list(views), workers=1, **_result["layout"])
+
+# ====================== Sol Panel (fragment'ler) ======================
+# Her bölüm kendi widget'larında yalnızca kendini yeniden çalıştırır; veriyi
+# değiştiren işlemler touch_state() + st.rerun() ile tüm sayfayı yeniler.
+
+@st.fragment
+def json_section():
+    """JSON indir / yükle."""
+    with st.expander("💾 JSON İndir / 📂 JSON Yükle (Kalıcı kayıt için önerilir)", expanded=True):
+        # İndir: JSON yalnızca istenince üretilir (her yeniden çalıştırmada değil)
+        if st.button("💾 JSON hazırla", key="prep_json"):
+            state_bytes = json.dumps(build_state_payload(), ensure_ascii=False, indent=2).encode("utf-8")
+            st.download_button("💾 JSON indir", data=state_bytes, file_name="timetable_state.json",
+                               mime="application/json")
+
+        # Yükle
+        up = st.file_uploader("JSON yükle ve uygula", type=["json"])
+        if up is not None and st.button("JSON'u Uygula"):
+            try:
+                data = json.load(up)
+                apply_state_payload(data)
+                st.success("JSON uygulandı. Arayüz güncellendi.")
+                st.rerun()
+            except Exception as e:
+                st.error(f"JSON okunamadı: {e}")
+
+@st.fragment
+def scenario_section():
+    """SQLite senaryoları: kaydet, yükle, sil, karşılaştır."""
+    with st.expander("🗄️ Senaryolar (sunucuda SQLite)", expanded=False):
+        st.caption(f"Veritabanı: {default_db_path()} — adlandırılmış senaryolar ve çözülmüş programları.")
+        with ScenarioStore() as store:
+            names = store.names()
+            if names:
+                st.dataframe(store.list_scenarios(), use_container_width=True, hide_index=True)
+            sc_name = st.text_input("Senaryo adı", value="", key="scenario_name")
+            plan = st.session_state.last_plan
+            solved = (plan is not None and st.session_state.last_result is not None
+                      and plan["state"] == current_state())
+            with_result = st.checkbox("Son çözümü de kaydet", value=solved, disabled=not solved,
+                                      help=None if solved else "Son çözüm yok ya da veri o zamandan beri değişti.")
+            if st.button("💾 Senaryoyu kaydet") and sc_name.strip():
+                res = st.session_state.last_result if with_result and solved else None
+                store.save(sc_name.strip(), current_state(), res and res["placed"], res and res["diag_df"])
+                st.success(f"Kaydedildi: {sc_name.strip()}")
+                st.rerun()
+            if names:
+                sel = st.selectbox("Senaryo", options=names, key="scenario_sel")
+                cl1, cl2 = st.columns(2)
+                if cl1.button("📂 Yükle", key="scenario_load"):
+                    state, placed, diag_df = store.load(sel)
+                    for k, v in state.items():
+                        st.session_state[k] = v
+                    touch_state()
+                    st.session_state.last_plan = st.session_state.last_result = None
+                    if placed is not None:
+                        grid = build_grid(placed, state["courses"], len(state["days"]),
+                                          state["slots_per_day"], state["rooms"])
+                        st.session_state.last_plan = snapshot_plan(current_state(), placed)
+                        st.session_state.last_result = make_result(
+                            grid_to_frame(grid, state["days"], state["rooms"], state["time_labels"]),
+                            diag_df, grid, placed, state["courses"], [f"Senaryodan yüklendi: {sel}"])
+                    st.rerun()
+                if cl2.button("🗑️ Sil", key="scenario_delete"):
+                    store.delete(sel)
+                    st.rerun()
+                if len(names) > 1:
+                    cd1, cd2 = st.columns(2)
+                    sa = cd1.selectbox("A", options=names, index=1, key="scenario_a")
+                    sb = cd2.selectbox("B", options=names, index=0, key="scenario_b")
+                    if st.button("Karşılaştır", key="scenario_diff"):
+                        diff = store.diff(sa, sb)
+                        if diff.empty:
+                            st.info("Senaryolar aynı.")
+                        else:
+                            st.caption(", ".join(f"{t}: {n}" for t, n in diff["Tür"].value_counts().items()))
+                            st.dataframe(diff, use_container_width=True, hide_index=True, height=300)
+
+@st.fragment
+def course_io_section():
+    """Ders içe/dışa aktarma (şablonlar, mevcut liste, içe aktarma raporu)."""
+    with st.expander("📥 Dersleri İçe/Dışa Aktar", expanded=False):
+        t_csv, t_xlsx = course_templates()
+        st.download_button("📄 Şablon (CSV) indir", data=t_csv, file_name="ders_sablon.csv", mime="text/csv")
+        st.download_button("📊 Şablon (Excel) indir", data=t_xlsx, file_name="ders_sablon.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+        st.markdown("---")
+        col_e1, col_e2 = st.columns(2)
+        with col_e1:
+            st.download_button("Mevcut dersleri **CSV** indir",
+                               data=derived("courses_csv", lambda: export_courses_csv(st.session_state.courses)),
+                               file_name="dersler.csv", mime="text/csv")
+        with col_e2:
+            st.download_button("Mevcut dersleri **Excel** indir",
+                               data=derived("courses_xlsx",
+                                            lambda: export_courses_xlsx(st.session_state.courses).getvalue()),
+                               file_name="dersler.xlsx",
+                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+        uploaded = st.file_uploader("Excel (.xlsx) veya CSV yükle", type=["xlsx","csv"], key="course_upload")
+        replace_all = st.checkbox("Mevcut listeyi SİL (tam yerine yaz)", value=False)
+        update_existing = st.checkbox("Aynı ID'li dersi güncelle", value=True)
+        allow_new = st.checkbox("Bilinmeyen hocaları listeye ekle", value=True)
+        if st.button("İçe Aktar", key="import_courses"):
+            if not uploaded:
+                st.warning("Önce bir dosya yükleyin.")
+            else:
+                try:
+                    res = import_courses(uploaded, uploaded.name, st.session_state.courses,
+                                         st.session_state.instructors, replace_all=replace_all,
+                                         update_existing=update_existing, allow_new_instructors=allow_new)
+                    for h in res["new_instructors"]:
+                        st.session_state.instructors.append(h)
+                        st.session_state.instructor_unavailable[h] = set()
+                    st.session_state.courses = res["courses"]
+                    st.session_state.import_report = res
+                    touch_state()
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"İçe aktarma hatası: {e}")
+
+        res = st.session_state.import_report
+        if res is not None:
+            msg = (f"İçe aktarma: {res['read']} satır okundu, {res['valid']} geçerli "
+                   f"(eklenen {res['added']}, güncellenen {res['updated']}, atlanan {res['skipped']}); "
+                   f"{res['rejected']} satır reddedildi, {len(res['new_instructors'])} yeni hoca.")
+            (st.warning if res["rejected"] else st.success)(msg)
+            if len(res["report"]):
+                st.dataframe(res["report"], use_container_width=True, hide_index=True, height=240)
+                st.download_button("Hata raporunu indir (CSV)", data=res["report"].to_csv(index=False),
+                                   file_name="ice_aktarma_raporu.csv", mime="text/csv")
+
+@st.fragment
+def calendar_section():
+    """Takvim, slot etiketleri, odalar ve gün penceresi."""
+    with st.expander("Takvim, Sınıflar ve Gün Penceresi", expanded=True):
+        days_str = st.text_input("Günler (virgülle)", value=",".join(st.session_state.days))
+        spd = st.number_input("Günlük slot sayısı", min_value=1, max_value=16,
+                              value=st.session_state.slots_per_day, step=1)
+        if st.button("Takvim Güncelle"):
+            st.session_state.days = [d.strip() for d in days_str.split(",") if d.strip()]
+            st.session_state.slots_per_day = int(spd)
+            dcount = len(st.session_state.days)
+            st.session_state.day_start_slot = {i: st.session_state.day_start_slot.get(i, 0) for i in range(dcount)}
+            st.session_state.day_use_slots  = {i: st.session_state.day_use_slots.get(i, st.session_state.slots_per_day) for i in range(dcount)}
+            st.session_state.time_labels = {i: st.session_state.time_labels.get(i, f"{9+i:02d}:00")
+                                            for i in range(st.session_state.slots_per_day)}
+            touch_state()
+            st.rerun()
+
+        with st.form("slot_labels"):
+            st.markdown("**Slot Saat Etiketleri**")
+            tl = {}
+            for i in range(st.session_state.slots_per_day):
+                tl[i] = st.text_input(f"Slot {i+1}", value=st.session_state.time_labels.get(i, f"{9+i:02d}:00"))
+            if st.form_submit_button("Etiketleri Kaydet"):
+                st.session_state.time_labels = tl
+                touch_state()
+                st.rerun()
+
+        st.markdown("**Sınıflar (Oda)**")
+        rm_to_del = st.selectbox("Silmek için seç", options=["(seçme)"] + [r["id"] for r in st.session_state.rooms])
+        c1, c2 = st.columns(2)
+        with c1:
+            if st.button("Seçili sınıfı sil") and rm_to_del != "(seçme)":
+                st.session_state.rooms = [r for r in st.session_state.rooms if r["id"] != rm_to_del]
+                touch_state()
+                st.rerun()
+        with c2:
+            rid = st.text_input("Yeni sınıf ID")
+            rcap = st.number_input("Kapasite (0 = sınırsız)", min_value=0, value=0, step=5, key="new_room_cap")
+            rfeat = st.text_input("Özellikler (virgülle, ör. lab, projeksiyon)", key="new_room_feat")
+            if st.button("Sınıf Ekle"):
+                if rid and rid not in [r["id"] for r in st.session_state.rooms]:
+                    st.session_state.rooms.append({"id": rid, "capacity": int(rcap), "features": _to_features(rfeat)})
+                    touch_state()
+                    st.rerun()
+        st.caption("Mevcut: " + ", ".join(
+            r["id"] + (f" ({r['capacity']} kişi)" if r.get("capacity") else "")
+            + (f" [{', '.join(r['features'])}]" if r.get("features") else "")
+            for r in st.session_state.rooms))
+
+        st.markdown("---")
+        st.markdown("### Gün Penceresi (Başlangıç Slotu & Kullanılacak Slot Sayısı)")
+        dcount = len(st.session_state.days)
+        window = {}
+        for i in range(dcount):
+            col1, col2, col3 = st.columns([0.35, 0.35, 0.3])
+            with col1:
+                st.write(f"**{st.session_state.days[i]}**")
+            with col2:
+                start = st.number_input(
+                    f"{st.session_state.days[i]} başlangıç slotu", min_value=0,
+                    max_value=st.session_state.slots_per_day-1, value=int(st.session_state.day_start_slot.get(i,0)),
+                    key=f"start_{i}"
+                )
+            with col3:
+                use = st.number_input(
+                    f"{st.session_state.days[i]} kullanılacak slot sayısı", min_value=0,
+                    max_value=st.session_state.slots_per_day,
+                    value=int(st.session_state.day_use_slots.get(i, st.session_state.slots_per_day)),
+                    key=f"use_{i}"
+                )
+            window[i] = (start, use)
+        if any((st.session_state.day_start_slot.get(i), st.session_state.day_use_slots.get(i)) != w
+               for i, w in window.items()):
+            for i, (start, use) in window.items():
+                st.session_state.day_start_slot[i], st.session_state.day_use_slots[i] = start, use
+            touch_state()
+            st.rerun()
+        st.caption("Not: Gün penceresi dışında kalan slotlara ders yerleştirilmez.")
+
+@st.fragment
+def instructor_section():
+    """Hocalar ve uygunsuz saatler (tablo düzenleyici + toplu işlemler)."""
+    with st.expander("Hocalar ve Uygunsuz Saatler", expanded=False):
+        colh1, colh2 = st.columns(2)
+        with colh1:
+            new_inst = st.text_input("Yeni hoca adı")
+            if st.button("Hoca Ekle"):
+                if new_inst and new_inst not in st.session_state.instructors:
+                    st.session_state.instructors.append(new_inst)
+                    st.session_state.instructor_unavailable[new_inst] = set()
+                    touch_state()
+                    st.rerun()
+        with colh2:
+            del_inst = st.selectbox("Silinecek hoca", options=["(seçme)"] + st.session_state.instructors)
+            if st.button("Hoca Sil") and del_inst != "(seçme)":
+                st.session_state.instructors.remove(del_inst)
+                st.session_state.instructor_unavailable.pop(del_inst, None)
+                touch_state()
+                st.rerun()
+
+        if st.session_state.instructors:
+            instructors = st.session_state.instructors
+            days = st.session_state.days; spd = st.session_state.slots_per_day
+            labels = st.session_state.time_labels
+            unav = st.session_state.instructor_unavailable
+            sel = st.selectbox("Hoca seç", options=instructors)
+            # Hoca başına tek tablo düzenleyici; form gönderilene kadar yeniden çalıştırma olmaz.
+            # Anahtar mevcut kümeye bağlı: toplu işlem / yükleme sonrası eski düzenlemeler taşınmaz.
+            cur = unav.get(sel, set())
+            with st.form(f"unav_form_{sel}"):
+                st.caption("Uygun DEĞİL slotları işaretleyin (satır: saat, sütun: gün)")
+                edited = st.data_editor(unavailability_grid(cur, days, labels, spd), hide_index=True,
+                                        disabled=["Saat"], use_container_width=True,
+                                        key=f"unav_{sel}_{hash((frozenset(cur), tuple(days), spd))}")
+                if st.form_submit_button("Kaydet (Hoca uygunluk)"):
+                    unav[sel] = grid_to_unavailability(edited)
+                    touch_state()
+                    st.rerun()
+
+            st.markdown("**Toplu işlemler**")
+            cb1, cb2 = st.columns(2)
+            with cb1:
+                targets = st.multiselect(f"{sel} desenini kopyala", [h for h in instructors if h != sel],
+                                         key="unav_copy_targets")
+                if st.button("Deseni Kopyala", disabled=not targets):
+                    st.session_state.instructor_unavailable = copy_pattern(unav, sel, targets)
+                    touch_state()
+                    st.rerun()
+            with cb2:
+                blk_days = st.multiselect("Günler (boş = tümü)", list(range(len(days))),
+                                          format_func=lambda d: days[d], key="unav_block_days")
+                blk_slots = st.multiselect("Slotlar (boş = tümü)", list(range(spd)),
+                                           format_func=lambda s: labels.get(s, f"{s+1}"), key="unav_block_slots")
+                blk_inst = st.multiselect("Hocalar (boş = tümü)", instructors, key="unav_block_inst")
+                blk_mode = st.radio("İşlem", ["Engelle", "Aç"], horizontal=True, key="unav_block_mode")
+                if st.button("Gün/Slot Uygula"):
+                    if not blk_days and not blk_slots:
+                        st.warning("En az bir gün ya da slot seçin.")
+                    else:
+                        st.session_state.instructor_unavailable = block_slots(
+                            unav, blk_inst or instructors, blk_days, blk_slots, len(days), spd,
+                            block=blk_mode == "Engelle")
+                        touch_state()
+                        st.rerun()
+
+            st.markdown("**Dosyadan içe aktar** — kolonlar: hoca, gun, slot (satır başına bir uygunsuz slot; "
+                        "slot boş = tüm gün, gun boş = her gün)")
+            st.download_button("Mevcut uygunsuzlukları CSV indir",
+                               data=derived("availability_csv", lambda: availability_frame(
+                                   unav, instructors, days, labels, spd).to_csv(index=False)),
+                               file_name="uygunsuzluk.csv", mime="text/csv")
+            av_file = st.file_uploader("Excel (.xlsx) veya CSV yükle", type=["xlsx", "csv"], key="availability_upload")
+            av_replace = st.checkbox("Dosyadaki hocaların mevcut uygunsuzluklarını değiştir", value=True)
+            if st.button("Uygunsuzlukları İçe Aktar"):
+                if not av_file:
+                    st.warning("Önce bir dosya yükleyin.")
+                else:
+                    try:
+                        res = import_availability(av_file, av_file.name, unav, instructors, days, labels, spd,
+                                                  replace=av_replace)
+                        instructors.extend(res["new_instructors"])
+                        st.session_state.instructor_unavailable = res["unavailable"]
+                        st.session_state.availability_report = res
+                        touch_state()
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"İçe aktarma hatası: {e}")
+            res = st.session_state.availability_report
+            if res is not None:
+                msg = (f"Uygunsuzluk içe aktarma: {res['read']} satır okundu, {res['valid']} geçerli "
+                       f"({len(res['instructors'])} hoca), {res['rejected']} satır reddedildi, "
+                       f"{len(res['new_instructors'])} yeni hoca.")
+                (st.warning if res["rejected"] else st.success)(msg)
+                if len(res["report"]):
+                    st.dataframe(res["report"], use_container_width=True, hide_index=True, height=200)
+
+@st.fragment
+def course_section():
+    """Ders listesi (sayfalı) ve ders düzenleyici."""
+    with st.expander("Dersler", expanded=True):
+        # Sayfalı tablo: yalnızca görünen sayfa gönderilir; DataFrame state_rev'e bağlı önbellekte
+        df = derived("courses_df", lambda: pd.DataFrame(st.session_state.courses, columns=COURSE_COLS))
+        q = st.text_input("Ara (ID / ad / hoca)", key="course_search").strip()
+        if q:
+            df = df[df["id"].str.contains(q, case=False, regex=False) | df["ad"].str.contains(q, case=False, regex=False)
+                    | df["hoca"].str.contains(q, case=False, regex=False)]
+        pc1, pc2 = st.columns(2)
+        size = pc1.selectbox("Sayfa başına", [25, 50, 100, 250], index=1, key="course_page_size")
+        n_pages = max(1, -(-len(df) // size))
+        page = pc2.number_input(f"Sayfa (1–{n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+        st.dataframe(df.iloc[(page-1)*size:page*size], use_container_width=True, hide_index=True)
+        st.caption(f"{len(df)} / {len(st.session_state.courses)} ders")
+        st.markdown("---")
+        ids = ["(yeni)"] + [c["id"] for c in st.session_state.courses]
+        choose = st.selectbox("Ders seç (düzenle)", options=ids)
+        editing = next((c for c in st.session_state.courses if c["id"] == choose), None)
+        if not editing:
+            editing = {"id":"", "ad":"", "hoca": (st.session_state.instructors[0] if st.session_state.instructors else ""),
+                       "sinif":1,"sure":1,"ardisik":False,"online":False,"enrollment":0,"features":[]}
+        c1, c2 = st.columns(2)
+        with c1:
+            cid = st.text_input("Ders ID", value=editing["id"])
+            cad = st.text_input("Ders Adı", value=editing["ad"])
+            choca = st.selectbox("Hoca", options=st.session_state.instructors or [""],
+                                 index=(st.session_state.instructors.index(editing["hoca"]) if editing["hoca"] in st.session_state.instructors else 0))
+        with c2:
+            csinif = st.number_input("Sınıf (1-4)", min_value=1, max_value=4, value=int(editing["sinif"]), step=1)
+            csure  = st.number_input("Süre (slot)", min_value=1, max_value=10, value=int(editing["sure"]), step=1)
+            cenr   = st.number_input("Öğrenci sayısı (0 = bilinmiyor)", min_value=0,
+                                     value=int(editing.get("enrollment") or 0), step=5)
+            cfeat  = st.text_input("İstenen oda özellikleri (virgülle)", value=", ".join(editing.get("features") or []))
+        card = st.toggle("Ardışık mı? (sure>1 ise)", value=bool(editing["ardisik"]))
+        conline = st.toggle("Online mı?", value=bool(editing["online"]))
+        b1, b2, b3 = st.columns(3)
+        with b1:
+            if st.button("Kaydet/Güncelle"):
+                if not cid: st.error("ID boş olamaz.")
+                else:
+                    fields = {"id":cid,"ad":cad,"hoca":choca,"sinif":int(csinif),"sure":int(csure),
+                              "ardisik":bool(card),"online":bool(conline),
+                              "enrollment":int(cenr),"features":_to_features(cfeat)}
+                    if choose != "(yeni)":
+                        editing.update(fields)
+                    else:
+                        st.session_state.courses.append(fields)
+                touch_state()
+                st.rerun()
+        with b2:
+            if choose != "(yeni)" and st.button("Seçileni Sil"):
+                st.session_state.courses = [c for c in st.session_state.courses if c["id"] != choose]
+                touch_state()
+                st.rerun()
+        with b3:
+            if st.button("Tüm Listeyi Temizle"):
+                st.session_state.courses = []
+                touch_state()
+                st.rerun()
+
+@st.fragment
+def pin_section():
+    """Belirli slotlara sabitlenen dersler."""
+    with st.expander("📌 Pinler (Belirli slotlara sabitle)", expanded=True):
+        if not st.session_state.courses:
+            st.info("Önce ders ekleyin.")
+        else:
+            colp1, colp2 = st.columns(2)
+            with colp1:
+                pin_course = st.selectbox("Ders (ID)", options=[c["id"] for c in st.session_state.courses])
+                pin_day = st.selectbox("Gün", options=list(range(len(st.session_state.days))),
+                                       format_func=lambda i: st.session_state.days[i])
+                pin_start = st.number_input("Başlangıç slotu", min_value=0,
+                                            max_value=st.session_state.slots_per_day-1, value=0, step=1)
+            with colp2:
+                pin_channel = st.selectbox("Kanal", options=["FaceToFace","Online"])
+                pin_room = ""
+                if pin_channel == "FaceToFace":
+                    pin_room = st.selectbox("Oda", options=[r["id"] for r in st.session_state.rooms])
+                if st.button("Pin Ekle"):
+                    new_pin = {"id": pin_course, "day": int(pin_day), "start": int(pin_start), "channel": pin_channel}
+                    if pin_channel == "FaceToFace":
+                        new_pin["room"] = pin_room
+                    st.session_state.pins.append(new_pin)
+                    st.success("Pin eklendi.")
+                    touch_state()
+                    st.rerun()
+
+            st.markdown("**Mevcut Pinler**")
+            if not st.session_state.pins:
+                st.caption("Henüz pin yok.")
+            else:
+                pin_df = pd.DataFrame(st.session_state.pins)
+                st.table(pin_df)
+                del_idx = st.number_input("Silinecek pin indexi (0-based)", min_value=0,
+                                          max_value=max(0, len(st.session_state.pins)-1),
+                                          value=0, step=1)
+                if st.button("Seçili pini sil"):
+                    if st.session_state.pins:
+                        st.session_state.pins.pop(int(del_idx))
+                        st.success("Pin silindi.")
+                        touch_state()
+                        st.rerun()
+                if st.button("Tüm pinleri temizle"):
+                    st.session_state.pins = []
+                    st.success("Tüm pinler temizlendi.")
+                    touch_state()
+                    st.rerun()
+
+# ====================== Uygulama UI ======================
+
+ensure_session_defaults()
+
+left, right = st.columns([0.48, 0.52])
+
+with left:
+    st.header("Veri Girişi")
+    json_section()
+    scenario_section()
+    course_io_section()
+    calendar_section()
+    instructor_section()
+    course_section()
+    pin_section()
+
+with right:
+    st.header("Gün Gün Greedy Planlama")
+
+    with st.expander("⚙️ Kısıt Ayarları ve Strateji", expanded=True):
+        cs = st.session_state.constraint_settings
+        col1, col2 = st.columns(2)
+        with col1:
+            online_cap = st.number_input("Slot başına MAKS. ONLINE", min_value=0, max_value=50,
+                                         value=int(cs["online_cap"]), step=1)
+            max_per_room = st.number_input("Slot/ODA başına MAKS. yüz yüze", min_value=1, max_value=5,
+                                           value=int(cs["max_per_room"]), step=1)
+        with col2:
+            enf_inst = st.checkbox("Hoca aynı anda tek derste olsun", value=bool(cs["enf_instructor_no_overlap"]))
+            enf_class = st.checkbox("Sınıf (1–4) aynı anda tek derste olsun", value=bool(cs["enf_class_no_overlap"]))
+            split_on = st.checkbox("Ardışık olmayan dersleri gerekirse oturumlara böl",
+                                   value=bool(cs.get("split_sessions", True)),
+                                   help="Tek blok sığmazsa ör. 3 saat => 2+1 ya da 1+1+1.")
+            one_per_day = st.checkbox("Bölünen dersin günde en fazla bir oturumu olsun",
+                                      value=bool(cs.get("split_one_per_day", True)), disabled=not split_on)
+        strategy = st.selectbox(
+            "Sıralama stratejisi",
+            STRATEGIES,
+            index=STRATEGIES.index(st.session_state.strategy) if st.session_state.strategy in STRATEGIES else 0
+        )
+        if strategy != st.session_state.strategy:
+            st.session_state.strategy = strategy
+            touch_state()
+        if st.session_state.strategy.startswith("Tam"):
+            col3, col4 = st.columns(2)
+            with col3:
+                st.session_state.exact_node_limit = st.number_input(
+                    "Tam arama: düğüm sınırı", min_value=1000, max_value=50_000_000,
+                    value=int(st.session_state.exact_node_limit), step=10000)
+            with col4:
+                st.session_state.exact_time_limit = st.number_input(
+                    "Tam arama: süre sınırı (sn)", min_value=1.0, max_value=600.0,
+                    value=float(st.session_state.exact_time_limit), step=1.0)
+            st.caption("Çözüm bulunamaz veya sınıra takılırsa Kıtlık-önce greedy sonucu gösterilir.")
+        st.session_state.repair_budget = st.number_input(
+            "Onarım süresi (sn, 0 = kapalı)", min_value=0.0, max_value=120.0,
+            value=float(st.session_state.repair_budget), step=0.5,
+            help="Greedy sonrası yerleşemeyen dersler için, PIN'siz dersleri kaydırarak yer açmayı dener."
+        )
+        st.session_state.incremental = st.checkbox(
+            "Artımlı planla (yalnızca değişikliklerden etkilenen dersleri yeniden yerleştir)",
+            value=bool(st.session_state.incremental),
+            help="Önceki plan korunur; takvim, oda, gün penceresi veya kısıt değişirse tam planlama yapılır.")
+        col5, col6 = st.columns(2)
+        with col5:
+            st.session_state.n_starts = st.number_input(
+                "Çoklu başlangıç (deneme sayısı)", min_value=1, max_value=256,
+                value=int(st.session_state.n_starts), step=1,
+                help="1'den büyükse greedy, karıştırılmış eşitlik/gün/oda sıralarıyla paralel denenir; "
+                     "en az yerleşemeyen ders bırakan sonuç seçilir.")
+        with col6:
+            st.session_state.multistart_seed = st.number_input(
+                "Tohum", min_value=0, max_value=2**31-1,
+                value=int(st.session_state.multistart_seed), step=1,
+                help="Aynı tohum ve deneme sayısı, onarım bütçesi 0 iken aynı programı üretir; "
+                     "onarım ve tam arama süre sınırı duvar saatine bağlıdır.")
+        st.session_state.profile_plan = st.checkbox(
+            "Sonraki planlamada cProfile kaydı al",
+            value=bool(st.session_state.profile_plan),
+            help="Tek bir planlama çalıştırmasını profiller; sonuç Performans panelinden indirilebilir.")
+        if st.button("Kısıtları Kaydet"):
+            st.session_state.constraint_settings = {
+                "online_cap": int(online_cap),
+                "max_per_room": int(max_per_room),
+                "enf_instructor_no_overlap": bool(enf_inst),
+                "enf_class_no_overlap": bool(enf_class),
+                "split_sessions": bool(split_on),
+                "split_one_per_day": bool(one_per_day),
+            }
+            touch_state()
+            st.success("Kaydedildi.")
+
+    with st.expander("🎯 Yumuşak kısıt ağırlıkları (kalite puanı)", expanded=False):
+        st.caption("Yerleşimi değiştirmez; programın kalite puanını (düşük = iyi) ve taramalardaki "
+                   "'Yumuşak puan' sütununu belirler. 0 = terimi yok say.")
+        soft = st.session_state.soft_settings
+        with st.form("soft_weights"):
+            wcols = st.columns(2)
+            weights = {t: wcols[i % 2].number_input(SOFT_LABELS[t], min_value=0.0, max_value=100.0, step=0.5,
+                                                     value=float(soft["weights"].get(t, 0.0)), key=f"w_{t}")
+                       for i, t in enumerate(SOFT_TERMS)}
+            late_from = st.number_input("Geç slot başlangıcı (slot no, 1'den)", min_value=1,
+                                        max_value=max(1, st.session_state.slots_per_day),
+                                        value=min(int(soft["late_from"]) + 1, max(1, st.session_state.slots_per_day)),
+                                        step=1)
+            if st.form_submit_button("Ağırlıkları Kaydet"):
+                st.session_state.soft_settings = {"weights": weights, "late_from": int(late_from) - 1}
+                touch_state()
+                st.success("Kaydedildi.")
+
+    # Ön kontrol: çözmeden, yalnızca sayımla kesin yerleşemeyecekleri göster
+    findings, lower_bound, check_secs = derived("check", lambda: check_state(current_state()))
+    if findings:
+        st.warning(f"Ön kontrol: en az **{lower_bound}** ders her durumda yerleşemez "
+                   f"({len(findings)} bulgu, {check_secs*1000:.0f} ms).")
+        with st.expander("Ön kontrol bulguları", expanded=False):
+            st.dataframe(pd.DataFrame([
+                {"Tür": f["tur"], "Kapsam": f["kapsam"], "Talep (saat)": f["talep"],
+                 "Kapasite (slot)": f["kapasite"], "En az yerleşemeyen": f["en_az_yerlesemeyen"],
+                 "Açıklama": f["mesaj"], "Dersler": ", ".join(f["dersler"][:20]) + (" …" if len(f["dersler"]) > 20 else "")}
+                for f in findings]), use_container_width=True, hide_index=True)
+    else:
+        st.caption(f"Ön kontrol: kapasite sorunu bulunamadı ({check_secs*1000:.0f} ms).")
+
+    if st.button("📅 GÜN GÜN PLANLA (Greedy)"):
+        courses = st.session_state.courses
+
+        solve_stats = {}
+        solve_options = dict(
+            repair_budget=st.session_state.repair_budget,
+            stats=solve_stats,
+            exact_node_limit=st.session_state.exact_node_limit,
+            exact_time_limit=st.session_state.exact_time_limit,
+        )
+        def run_plan():
+            if st.session_state.n_starts > 1:
+                result, runs = multistart_schedule(
+                    current_state(), n_starts=int(st.session_state.n_starts),
+                    seed=int(st.session_state.multistart_seed), **solve_options
+                )
+                return result, runs, None
+            result, inc_info = incremental_schedule(
+                current_state(), st.session_state.last_plan if st.session_state.incremental else None,
+                **solve_options
+            )
+            return result, None, inc_info
+
+        t0 = time.perf_counter()
+        profile = None
+        if st.session_state.profile_plan:
+            (result, runs, inc_info), prof_bytes, prof_text = profile_call(run_plan)
+            profile = {"bytes": prof_bytes, "text": prof_text}
+            st.session_state.profile_plan = False  # yalnızca tek çalıştırma
+        else:
+            result, runs, inc_info = run_plan()
+        total_seconds = time.perf_counter() - t0
+        timetable_df, diag_df, placed, unplaced, grid = result
+        log_event("plan", seconds=total_seconds, courses=len(courses),
+                  starts=int(st.session_state.n_starts), profiled=profile is not None)
+        st.session_state.last_plan = snapshot_plan(current_state(), placed)
+
+        notes = []
+        if inc_info and inc_info["mode"] == "incremental":
+            notes.append(f"Artımlı planlama: {inc_info['changed']} değişen ders, "
+                         f"{inc_info['replanned']} ders yeniden yerleştirildi, {inc_info['kept']} ders yerinde kaldı")
+        if runs:
+            best = min(runs, key=lambda r: (r[0], r[1]))
+            notes.append(f"Çoklu başlangıç: {len(runs)} deneme; yerleşemeyen en az {best[0]}, "
+                         f"en çok {max(r[0] for r in runs)} (tohum {st.session_state.multistart_seed})")
+        if "exact" in solve_stats:
+            ex = solve_stats["exact"]
+            msg = {"found": "tam atama bulundu",
+                   "infeasible": "tüm kısıtları sağlayan atama YOK (arama tükendi); greedy sonucu gösteriliyor",
+                   "infeasible_unsplit": "tek blokluk atama yok (bölünebilen dersler bölünmeden arandı, kanıt "
+                                         "değil); greedy sonucu gösteriliyor",
+                   "limit": "düğüm/süre sınırına takıldı; greedy sonucu gösteriliyor"}[ex["status"]]
+            notes.append(f"Tam arama: {msg} — {ex['nodes']} düğüm, {ex['seconds']:.2f} sn")
+        if "repair" in solve_stats:
+            rs = solve_stats["repair"]
+            notes.append(f"Onarım: {rs['recovered']}/{rs['attempted']} deneme kurtarıldı, "
+                         f"{rs['seconds']:.2f} sn ({rs['recovered_per_sec']:.2f} ders / bütçe sn)")
+
+        st.session_state.last_result = make_result(
+            timetable_df, diag_df, grid, placed, courses, notes,
+            {"total": total_seconds, "phases": solve_stats.get("phases", []),
+             "counters": solve_stats.get("counters", {}), "exports": {}, "profile": profile})
+
+    res = st.session_state.last_result
+    if res is not None:
+        layout = res["layout"]
+        st.success(res["summary"])
+        for note in res["notes"]:
+            st.caption(note)
+
+        rows = score_breakdown(res["placed"], res["courses"], len(layout["days"]), res["spd"],
+                               st.session_state.soft_settings)
+        with st.expander(f"Kalite puanı (yumuşak kısıtlar): {rows[-1]['Katkı']:.1f}", expanded=False):
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+            st.caption("Düşük = iyi. Ağırlıklar '🎯 Yumuşak kısıt ağırlıkları' bölümünden değiştirilir.")
+
+        st.subheader("Haftalık Tablo (Gün Gün)")
+        render_day_tables(res["grid"], **layout)
+
+        # Hoca / sınıf / oda haftalık görünümleri tek ters dizinden (sonuç başına bir kez kurulur)
+        st.subheader("Hoca / Sınıf Haftalık Görünümü")
+        if "weekly" not in res:
+            res["weekly"] = weekly_index(res["placed"], res["courses"])
+        wv1, wv2 = st.columns([0.35, 0.65])
+        view = wv1.radio("Görünüm", ["Hoca", "Sınıf", "Oda"], horizontal=True, key="weekly_view")
+        keys = [r["id"] for r in layout["rooms"]] if view == "Oda" else sorted(res["weekly"][view])
+        who = wv2.selectbox(view, keys, key=f"weekly_{view}")
+        if who is not None:
+            week_df = weekly_table(res["weekly"][view].get(who, {}), layout["days"], layout["time_labels"])
+            st.table(week_df.style.set_properties(**{"white-space": "pre-wrap"}))
+
+        # İndirmeler istenince üretilir; içerik özetine göre sunucu genelinde önbelleklenir
+        st.markdown("**İndir**")
+        st.multiselect("PDF'e eklenecek haftalık sayfalar", WEEKLY_VIEWS, key="pdf_views",
+                       help="Varsayılan: yalnızca gün sayfaları. Excel her zaman oda, hoca ve sınıf başına "
+                            "haftalık sayfaları içerir.")
+        ex_cols = st.columns(len(EXPORT_FORMATS))
+        for col, (fmt, (label, file_name, mime)) in zip(ex_cols, EXPORT_FORMATS.items()):
+            with col:
+                ready = (res["key"], fmt) in st.session_state.export_requested
+                if not ready and st.button(f"{label} hazırla", key=f"prep_{fmt}"):
+                    st.session_state.export_requested.add((res["key"], fmt))
+                    ready = True
+                if ready:
+                    t0 = time.perf_counter()
+                    data = cached_export(fmt, res["key"], res,
+                                         tuple(st.session_state.pdf_views) if fmt == "pdf" else ())
+                    if fmt not in res["perf"]["exports"]:
+                        res["perf"]["exports"][fmt] = {"seconds": time.perf_counter() - t0, "bytes": len(data)}
+                        log_event("export", format=fmt, key=res["key"][:12], **res["perf"]["exports"][fmt])
+                    st.download_button(f"{label} indir", data=data, file_name=file_name, mime=mime,
+                                       key=f"dl_{fmt}")
+
+        render_perf_panel(res["perf"])
+
+        # Yerleşemeyenler
+        diag_df = res["diag_df"]
+        st.subheader("Yerleşemeyen Dersler")
+        if diag_df.empty:
+            st.info("Tüm dersler yerleşti. 🎉")
+        else:
+            st.caption("aday: denenen (gün, başlangıç) sayısı; ret_*: o kısıta takılan aday sayısı "
+                       "(bir aday birden fazla kısıta takılabilir); engelleyenler: en az kısıta takılan "
+                       "adaylarda yer tutan dersler.")
+            st.dataframe(diag_df, use_container_width=True)
+            st.download_button("Yerleşemeyenler (CSV)", data=timetable_to_csv(diag_df),
+                               file_name="unscheduled_diagnostics.csv", mime="text/csv")
+
+    # ---- Çok bölümlü planlama (ortak odalar) ----
+    with st.expander("🏛️ Çok bölümlü planlama (ortak odalar)", expanded=False):
+        st.caption("Her bölüm kendi JSON dosyasıyla yüklenir; aynı oda ID'si birden fazla bölümde geçiyorsa "
+                   "oda ortaktır ve hiçbir slotta iki bölüme birden verilmez. Takvimler aynı olmalıdır.")
+        dept_files = st.file_uploader("Bölüm JSON dosyaları", type=["json"], accept_multiple_files=True,
+                                      key="faculty_upload")
+        include_current = st.checkbox("Geçerli veriyi de bölüm olarak ekle", value=True, key="faculty_current")
+        if st.button("🏛️ Bölümleri birlikte planla"):
+            try:
+                departments = [("Bu bölüm", current_state())] if include_current else []
+                for f in dept_files or []:
+                    departments.append((f.name.rsplit(".", 1)[0], normalize_state(json.load(f))))
+                if len(departments) < 2:
+                    st.warning("En az iki bölüm gerekli.")
+                else:
+                    t0 = time.perf_counter()
+                    results, info = solve_departments(departments)
+                    st.session_state.faculty_result = {
+                        "departments": departments, "results": results, "info": info,
+                        "seconds": time.perf_counter() - t0}
+            except Exception as e:
+                st.error(f"Çok bölümlü planlama başarısız: {e}")
+        fac = st.session_state.faculty_result
+        if fac:
+            info = fac["info"]
+            st.dataframe(pd.DataFrame([
+                {"Bölüm": name, "Yerleşen": len({p[0] for p in fac["results"][name][2]}),
+                 "Ders": len(state["courses"]), "1. aşama odaları": ", ".join(info["paylar"][name]),
+                 "Uzlaştırmada kurtarılan": info["uzlastirilan"].get(name, 0)}
+                for name, state in fac["departments"]]), use_container_width=True, hide_index=True)
+            st.caption(f"Toplam süre: {fac['seconds']:.2f} sn")
+            util = room_utilization(fac["departments"], fac["results"])
+            st.dataframe(util, use_container_width=True, hide_index=True)
+            c1, c2 = st.columns(2)
+            c1.download_button("Oda doluluğu (CSV)", data=timetable_to_csv(util),
+                               file_name="oda_doluluk.csv", mime="text/csv")
+            c2.download_button("Oda kullanımı (CSV)",
+                               data=timetable_to_csv(room_usage_frame(fac["departments"], fac["results"])),
+                               file_name="oda_kullanimi.csv", mime="text/csv")
+            pick = st.selectbox("Bölüm programı", [name for name, _ in fac["departments"]], key="faculty_pick")
+            st.download_button(f"{pick} programı (CSV)", data=timetable_to_csv(fac["results"][pick][0]),
+                               file_name=f"{pick}.csv", mime="text/csv")
+
+    # ---- Ne olur? parametre taraması ----
+    with st.expander("🔀 Ne olur? Parametre taraması", expanded=False):
+        st.caption("Her satır 'parametre = değerler'; tüm kombinasyonlar çözülür (çoksa süreç havuzunda), aynı etkin "
+                   "durumu veren kombinasyonlar bir kez çözülür. Parametreler: kısıt anahtarları (online_cap, "
+                   "max_per_room, enf_instructor_no_overlap, ...), day_use_slots:<gün>, day_start_slot:<gün> "
+                   "(gün 0'dan), drop_rooms (Oda-1+Oda-2; '-' = hiçbiri), strategy. Aralık: 6..10.")
+        spec_text = st.text_area("Tarama tanımı", key="sweep_spec", height=110,
+                                 value="online_cap = 2, 3, 5\nday_use_slots:4 = 6, 8, 10")
+        if st.button("🔀 Taramayı çalıştır"):
+            try:
+                base = copy.deepcopy(current_state())
+                spec = parse_spec(spec_text, base)
+                t0 = time.perf_counter()
+                table, runs = sweep_schedule(base, spec, exact_node_limit=st.session_state.exact_node_limit,
+                                             exact_time_limit=st.session_state.exact_time_limit)
+                st.session_state.sweep_result = {"state": base, "table": table, "runs": runs,
+                                                 "seconds": time.perf_counter() - t0}
+            except ValueError as e:
+                st.error(f"Tarama tanımı hatalı: {e}")
+        sw = st.session_state.sweep_result
+        if sw:
+            table = sw["table"]
+            st.caption(f"{len(table)} kombinasyon, {int((~table['Önbellek']).sum())} çözüm, "
+                       f"{sw['seconds']:.2f} sn. Sütun başlığına tıklayarak sıralayın.")
+            st.dataframe(table, use_container_width=True, hide_index=True)
+            st.download_button("Karşılaştırma (CSV)", data=timetable_to_csv(table),
+                               file_name="tarama.csv", mime="text/csv")
+            row = st.selectbox("Satır (#)", options=list(table["#"]), key="sweep_row")
+            if st.button("Bu satırı etkin program yap", key="sweep_open"):
+                run = sw["runs"][int(row)]
+                state = apply_variant(sw["state"], run["variant"])
+                for k in STATE_KEYS:
+                    st.session_state[k] = copy.deepcopy(state[k])
+                touch_state()
+                grid = build_grid(run["placed"], state["courses"], len(state["days"]),
+                                  state["slots_per_day"], state["rooms"])
+                st.session_state.last_plan = snapshot_plan(current_state(), run["placed"])
+                st.session_state.last_result = make_result(
+                    grid_to_frame(grid, state["days"], state["rooms"], state["time_labels"]),
+                    run["diag_df"], grid, run["placed"], state["courses"],
+                    [f"Taramadan açıldı (#{row}): " + ", ".join(f"{k}={v}" for k, v in
+                                                              table.iloc[int(row)][list(run["variant"])].items())])
+                st.rerun()
+
+    st.markdown("---")
+    st.caption("Streamlit Cloud'da kalıcı depolama olmadığı için 'JSON indir / JSON yükle' akışı ile verileri saklayın.")
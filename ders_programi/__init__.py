@@ -0,0 +1,28 @@
+# ders_programi/__init__.py
+"""Ders programı planlayıcısının Streamlit'ten bağımsız çekirdeği."""
+from .model import (
+    APP_STATE_VERSION, COURSE_COLS, DEFAULT_DAYS, DEFAULT_STRATEGY, STRATEGIES,
+    REQUIRED_COURSE_COLS, STATE_KEYS,
+    default_constraint_settings, default_soft_settings, normalize_state, state_to_payload,
+    export_courses_csv, export_courses_xlsx,
+)
+from .availability import (
+    availability_frame, block_slots, copy_pattern, grid_to_unavailability, import_availability, unavailability_grid,
+)
+from .bench import compare_results, run_benchmark
+from .diagnostics import diagnose_unplaced
+from .exact import exact_search
+from .faculty import partition_rooms, room_usage_frame, room_utilization, solve_departments
+from .feasibility import check_feasibility, check_state
+from .grid import WEEKLY_VIEWS, build_grid, day_rows, day_table, grid_to_frame, weekly_index, weekly_table
+from .importer import import_courses, upsert_courses, validate_chunk
+from .incremental import incremental_schedule, plan_diff, snapshot_plan
+from .multistart import multistart_schedule, variant_seeds
+from .occupancy import ENGINES, BitsetOccupancy, ListOccupancy, make_occupancy
+from .repair import repair_schedule
+from .store import ScenarioStore, default_db_path
+from .scoring import SOFT_TERMS, SoftScorer, quality_score, score_breakdown, soft_score
+from .synthetic import generate_state
+from .sweep import apply_variant, expand, parse_spec, sweep_schedule
+from .solver import count_feasible_starts_for_course, greedy_schedule, solve_state
+from .exporters import export_key, weekly_pages, timetable_to_csv, timetable_to_excel_bytes, timetable_to_pdf
@@ -0,0 +1,135 @@
+# ders_programi/availability.py
+"""Hoca uygunsuzlukları: tablo düzenleyici dönüşümleri, toplu işlemler, içe/dışa aktarma.
+
+Uygunsuzluk hoca başına {(gün, slot)} kümesidir (ikisi de 0'dan). Arayüz
+hoca başına tek bir tablo düzenleyici kullanır (satır: slot, sütun: gün,
+True = uygun değil); tablo tek seferde kümeye çevrilir.
+Dosya biçimi uzun tablodur, satır başına bir uygunsuz slot:
+    hoca, gun, slot
+gun gün adı ya da 1'den numara, slot saat etiketi ya da 1'den numara;
+slot boşsa günün tamamı, gun boşsa o slot her gün engellenir.
+"""
+import numpy as np
+import pandas as pd
+
+from .importer import _text
+
+AVAILABILITY_COLS = ["hoca", "gun", "slot"]
+REPORT_COLS = ["Satır", "Düzey", "Hoca", "Kolon", "Değer", "Hata"]
+
+def _slot_labels(time_labels, spd):
+    return [str(time_labels.get(s, f"{s+1}")) for s in range(spd)]
+
+# ====================== Tablo Düzenleyici ======================
+
+def unavailability_grid(slots, days, time_labels, spd):
+    """{(gün, slot)} => "Saat" + gün sütunlu bool tablo (satır başına bir slot)."""
+    arr = np.zeros((spd, len(days)), dtype=bool)
+    for d, s in slots:
+        if d < len(days) and s < spd:
+            arr[s, d] = True
+    df = pd.DataFrame(arr, columns=list(days))
+    df.insert(0, "Saat", _slot_labels(time_labels, spd))
+    return df
+
+def grid_to_unavailability(df):
+    """Düzenlenmiş tablo => {(gün, slot)} ("Saat" sütunu yok sayılır)."""
+    arr = df.drop(columns="Saat", errors="ignore").fillna(False).to_numpy(dtype=bool)
+    s, d = np.nonzero(arr)
+    return set(zip(d.tolist(), s.tolist()))
+
+# ====================== Toplu İşlemler ======================
+
+def copy_pattern(unav, source, targets):
+    """source hocanın kümesini targets'a kopyala (yeni dict döner)."""
+    pattern = unav.get(source, set())
+    return {**unav, **{h: set(pattern) for h in targets if h != source}}
+
+def block_slots(unav, instructors, days, slots, n_days, spd, block=True):
+    """Seçili hocalarda gün × slot kesişimini engelle (block=False: aç).
+
+    days boş => tüm günler, slots boş => tüm slotlar; yeni dict döner.
+    """
+    cells = {(d, s) for d in (days or range(n_days)) for s in (slots or range(spd))}
+    out = dict(unav)
+    for h in instructors:
+        cur = out.get(h, set())
+        out[h] = (cur | cells) if block else (cur - cells)
+    return out
+
+# ====================== İçe / Dışa Aktarma ======================
+
+def availability_frame(unav, instructors, days, time_labels, spd):
+    """Uygunsuzlukları dosya biçiminde (hoca, gun, slot) uzun tabloya çevir."""
+    labels = _slot_labels(time_labels, spd)
+    rows = [(h, days[d], labels[s]) for h in instructors for d, s in sorted(unav.get(h, ()))
+            if d < len(days) and s < spd]
+    return pd.DataFrame(rows, columns=AVAILABILITY_COLS)
+
+def _position(values, names):
+    """Ad ya da 1'den numara => 0'dan konum; boş => -1 (tümü), tanınmayan => NaN. Ad önceliklidir."""
+    by_name = values.str.lower().map({str(v).strip().lower(): i for i, v in enumerate(names)})
+    num = pd.to_numeric(values, errors="coerce")
+    by_num = (num - 1).where((num % 1 == 0) & (num >= 1) & (num <= len(names)))
+    return by_name.fillna(by_num).mask(values == "", -1)
+
+def import_availability(source, name, unav, instructors, days, time_labels, spd,
+                        replace=True, allow_new_instructors=True):
+    """Dosyayı oku, sütun bazlı doğrula ve uygunsuzluklara uygula.
+
+    replace: dosyada geçen hocaların mevcut kümeleri dosyadakilerle değiştirilir
+    (False: eklenir). {"unavailable", "new_instructors", "report" (DataFrame),
+    "read", "valid", "rejected", "instructors"} döndürür; "instructors" dosyada
+    geçerli satırı olan hocalardır. Zorunlu kolon eksikse ValueError.
+    """
+    if str(name).lower().endswith(".csv"):
+        df = pd.read_csv(source, dtype=str, keep_default_na=False)
+    else:
+        df = pd.read_excel(source, sheet_name=0, dtype=str)
+    df = df.rename(columns=lambda c: str(c).strip().lower()).reset_index(drop=True)
+    missing = set(AVAILABILITY_COLS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Eksik kolon(lar): {', '.join(sorted(missing))}")
+
+    hoca, gun, slot = (_text(df, c) for c in AVAILABILITY_COLS)
+    lines = pd.Series(range(2, len(df) + 2))
+    d, s = _position(gun, days), _position(slot, _slot_labels(time_labels, spd))
+    report = []
+    bad = pd.Series(False, index=df.index)
+
+    def flag(mask, kolon, values, hata, duzey="hata"):
+        nonlocal bad
+        if mask.any():
+            report.append(pd.DataFrame({"Satır": lines[mask], "Düzey": duzey, "Hoca": hoca[mask],
+                                        "Kolon": kolon, "Değer": values[mask], "Hata": hata}))
+            if duzey == "hata":
+                bad |= mask
+
+    flag(hoca == "", "hoca", hoca, "hoca boş")
+    flag(d.isna(), "gun", gun, "gün tanınmadı (gün adı ya da 1'den numara)")
+    flag(s.isna(), "slot", slot, "slot tanınmadı (saat etiketi ya da 1'den numara)")
+    unknown = ~bad & ~hoca.isin(set(instructors))
+    new_instructors = []
+    if unknown.any():
+        if allow_new_instructors:
+            firsts = unknown & ~hoca.where(unknown).duplicated()
+            flag(firsts, "hoca", hoca, "yeni hoca, listeye eklendi", duzey="uyarı")
+            new_instructors = hoca[firsts].tolist()
+        else:
+            flag(unknown, "hoca", hoca, "bilinmeyen hoca")
+
+    ok = ~bad
+    cells = pd.DataFrame({
+        "hoca": hoca[ok],
+        "d": [range(len(days)) if x < 0 else [int(x)] for x in d[ok]],
+        "s": [range(spd) if x < 0 else [int(x)] for x in s[ok]],
+    }).explode("d").explode("s")
+    out = dict(unav)
+    for h, g in cells.groupby("hoca", sort=False):
+        got = set(zip(g["d"].astype(int).tolist(), g["s"].astype(int).tolist()))
+        out[h] = got if replace else out.get(h, set()) | got
+    report = (pd.concat(report, ignore_index=True).sort_values(["Satır", "Düzey"], kind="stable")
+              .reset_index(drop=True) if report else pd.DataFrame(columns=REPORT_COLS))
+    return {"unavailable": out, "new_instructors": new_instructors, "report": report,
+            "read": len(df), "valid": int(ok.sum()), "rejected": int(bad.sum()),
+            "instructors": list(dict.fromkeys(hoca[ok]))}
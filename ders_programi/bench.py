@@ -0,0 +1,124 @@
+# ders_programi/bench.py
+"""Kıyaslama (benchmark) koşucusu: çözücü ve dışa aktarıcıların ölçeklenmesi.
+
+Her (örnek, strateji) ikilisi temiz bir alt süreçte (spawn) çalışır; böylece
+tepe bellek (ru_maxrss) ölçümü önceki çalışmalardan etkilenmez. Aşamalar:
+kıtlık (count_feasible_starts_for_course, tüm dersler), çöz (solve_state),
+ve yalnızca ilk strateji için gün tabloları (render_day_tables verisi),
+Excel ve PDF. Bir aşamanın tepe belleği o ana kadarki süreç tepesidir.
+
+Sonuçlar `{"_version", "meta", "results"}` biçiminde JSON olarak kaydedilir;
+compare_results iki dosyayı (örnek, aşama, strateji) üzerinden eşleştirir.
+"""
+import json, os, platform, resource, sys, time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from .exporters import timetable_to_excel_bytes, timetable_to_pdf
+from .grid import day_table
+from .model import STRATEGIES, normalize_state
+from .solver import count_feasible_starts_for_course, solve_state
+
+BENCH_VERSION = 1
+DEFAULT_COURSES = [100, 1000, 5000]
+
+def _rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024*1024) if sys.platform == "darwin" else rss / 1024  # macOS: bayt, Linux: KiB
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+def _run_case(case, payload, strategy, exports, options):
+    """Alt süreçte tek bir (örnek, strateji) çalışması; aşama kayıtlarını döndür."""
+    state = normalize_state(payload)
+    n = len(state["courses"])
+    base = {"case": case, "strategy": strategy, "courses": n, "rooms": len(state["rooms"]),
+            "instructors": len(state["instructors"])}
+    records = []
+    def record(stage, seconds, **extra):
+        records.append({**base, "stage": stage, "seconds": round(seconds, 4),
+                        "peak_rss_mb": round(_rss_mb(), 1), **extra})
+
+    record("başlangıç", 0.0)
+    spd, n_days = state["slots_per_day"], len(state["days"])
+    _, secs = _timed(lambda: [count_feasible_starts_for_course(
+        c, state["day_start_slot"], state["day_use_slots"], spd, state["instructor_unavailable"], n_days)
+        for c in state["courses"]])
+    record("kıtlık", secs)
+
+    (timetable_df, diag_df, placed, unplaced, grid), secs = _timed(
+        lambda: solve_state(state, strategy=strategy, **options))
+    n_placed = len({p[0] for p in placed})
+    record("çöz", secs, placed=n_placed, rate=round(n_placed / max(1, n), 4))
+
+    if exports:
+        layout = {k: state[k] for k in ("days", "rooms", "time_labels")}
+        _, secs = _timed(lambda: [day_table(grid, di, state["rooms"], state["time_labels"])
+                                  for di in range(n_days)])
+        record("gün tabloları", secs)
+        bio, secs = _timed(lambda: timetable_to_excel_bytes(grid, placed=placed, courses=state["courses"], **layout))
+        record("excel", secs, bytes=len(bio.getvalue()))
+        data, secs = _timed(lambda: timetable_to_pdf(grid, workers=1, **layout))
+        record("pdf", secs, bytes=len(data))
+    return records
+
+def run_benchmark(cases, strategies=None, exports=True, **options):
+    """cases: [(ad, payload)]. Her (örnek, strateji) için aşama kayıtları döndür."""
+    strategies = strategies or STRATEGIES
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for case, payload in cases:
+        for i, strategy in enumerate(strategies):
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+                results.extend(ex.submit(_run_case, case, payload, strategy,
+                                         exports and i == 0, options).result())
+    return results
+
+def bench_meta():
+    import matplotlib, openpyxl, pandas
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pandas": pandas.__version__,
+        "openpyxl": openpyxl.__version__,
+        "matplotlib": matplotlib.__version__,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def save_results(path, results, meta=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"_version": BENCH_VERSION, "meta": meta or bench_meta(), "results": results},
+                  f, ensure_ascii=False, indent=2)
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+def compare_results(old, new, tolerance=0.25, min_seconds=0.05):
+    """Eşleşen kayıtları karşılaştır; (satırlar, gerilemeler) döndür.
+
+    Gerileme: süre (tolerance) oranından fazla arttıysa (min_seconds altındaki
+    ölçümler gürültü sayılır) ya da yerleşim oranı düştüyse.
+    """
+    key = lambda r: (r["case"], r["stage"], r["strategy"])
+    old_by_key = {key(r): r for r in old}
+    rows, regressions = [], []
+    for r in new:
+        o = old_by_key.get(key(r))
+        if o is None:
+            continue
+        ratio = r["seconds"] / o["seconds"] if o["seconds"] > 0 else 1.0
+        row = {"case": r["case"], "stage": r["stage"], "strategy": r["strategy"],
+               "seconds_old": o["seconds"], "seconds_new": r["seconds"], "ratio": round(ratio, 2),
+               "rss_old": o["peak_rss_mb"], "rss_new": r["peak_rss_mb"],
+               "rate_old": o.get("rate"), "rate_new": r.get("rate")}
+        slower = ratio > 1 + tolerance and max(r["seconds"], o["seconds"]) >= min_seconds
+        worse = r.get("rate") is not None and o.get("rate") is not None and r["rate"] < o["rate"]
+        if slower or worse:
+            regressions.append(row)
+        rows.append(row)
+    return rows, regressions
@@ -0,0 +1,394 @@
+# ders_programi/cli.py
+"""Komut satırı.
+
+    python -m ders_programi plan state.json ... -o cikti/
+    python -m ders_programi check state.json
+    python -m ders_programi import state.json dersler.csv -o yeni_state.json --report hatalar.csv
+    python -m ders_programi scenario save guz state.json --solve   (list / export / diff / delete)
+    python -m ders_programi sweep state.json -p "online_cap = 2, 3, 5" -p "day_use_slots:4 = 6..10" -o tarama.csv
+    python -m ders_programi faculty bolum_a.json bolum_b.json -o cikti/
+    python -m ders_programi generate --courses 100 1000 20000 -o ornekler/
+    python -m ders_programi bench --courses 100 1000 --save sonuc.json --compare onceki.json
+"""
+import argparse, json, os, sys, time
+
+from .model import STRATEGIES, normalize_state, state_to_payload
+from .multistart import multistart_schedule
+from .occupancy import ENGINES
+from .solver import solve_state
+from .exporters import WEEKLY_VIEWS, timetable_to_csv, timetable_to_excel_bytes, timetable_to_pdf
+from .bench import DEFAULT_COURSES, compare_results, load_results, run_benchmark, save_results
+from .faculty import room_usage_frame, room_utilization, solve_departments
+from .feasibility import check_state
+from .importer import import_courses
+from .store import ScenarioStore
+from .sweep import METRIC_COLS, parse_spec, sweep_schedule
+from .perf import enable_perf_logging, log_event, profile_call
+from .synthetic import case_name, generate_state
+
+FORMATS = ["csv", "xlsx", "pdf"]
+
+def plan_file(path, out_dir, formats, strategy=None, n_starts=1, seed=0, workers=None, pdf_views=(), **options):
+    """Tek bir `timetable_state.json` dosyasını planla ve çıktıları yaz."""
+    with open(path, encoding="utf-8") as f:
+        state = normalize_state(json.load(f))
+    findings, lower_bound, _ = check_state(state)
+    if findings:
+        print(f"{path}: Ön kontrol: en az {lower_bound} ders yerleşemez ({len(findings)} bulgu)", file=sys.stderr)
+    if n_starts > 1:
+        (timetable_df, diag_df, placed, unplaced, grid), _ = multistart_schedule(
+            state, n_starts=n_starts, seed=seed, workers=workers, strategy=strategy, **options)
+    else:
+        timetable_df, diag_df, placed, unplaced, grid = solve_state(state, strategy=strategy, **options)
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    base = os.path.join(out_dir, stem)
+
+    def export(fmt, fn):
+        t0 = time.perf_counter()
+        data = fn()
+        log_event("export", format=fmt, seconds=time.perf_counter() - t0, bytes=len(data), file=stem)
+        return data
+
+    if "csv" in formats:
+        with open(base + ".csv", "w", encoding="utf-8", newline="") as f:
+            f.write(export("csv", lambda: timetable_to_csv(timetable_df)))
+        with open(base + "_yerlesemeyen.csv", "w", encoding="utf-8", newline="") as f:
+            f.write(timetable_to_csv(diag_df))
+    if "xlsx" in formats:
+        data = export("xlsx", lambda: timetable_to_excel_bytes(
+            grid, state["days"], state["rooms"], state["time_labels"],
+            placed=placed, courses=state["courses"]).getvalue())
+        with open(base + ".xlsx", "wb") as f:
+            f.write(data)
+    if "pdf" in formats:
+        data = export("pdf", lambda: timetable_to_pdf(grid, state["days"], state["rooms"], state["time_labels"],
+                                                      placed=placed, courses=state["courses"], views=pdf_views))
+        with open(base + ".pdf", "wb") as f:
+            f.write(data)
+
+    placed_courses = len(set(p[0] for p in placed))
+    return placed_courses, len(state["courses"])
+
+def cmd_plan(args):
+    os.makedirs(args.out, exist_ok=True)
+    formats = set(args.format or FORMATS)
+    if args.log_perf:
+        enable_perf_logging()
+    failed = 0
+    for path in args.states:
+        options = dict(strategy=args.strategy, engine=args.engine, repair_budget=args.repair_budget,
+                       exact_node_limit=args.node_limit, exact_time_limit=args.time_limit,
+                       n_starts=args.starts, seed=args.seed, workers=args.workers,
+                       pdf_views=args.pdf_view or ())
+        if args.log_perf:
+            options["stats"] = {}
+        try:
+            if args.profile:
+                (n_placed, n_total), prof_bytes, _ = profile_call(plan_file, path, args.out, formats, **options)
+                prof_path = os.path.join(args.out, os.path.splitext(os.path.basename(path))[0] + ".prof")
+                with open(prof_path, "wb") as f:
+                    f.write(prof_bytes)
+            else:
+                n_placed, n_total = plan_file(path, args.out, formats, **options)
+        except Exception as e:
+            failed += 1
+            print(f"{path}: HATA {e}", file=sys.stderr)
+            continue
+        print(f"{path}: Yerleşen ders: {n_placed}/{n_total}")
+    return 1 if failed else 0
+
+def cmd_check(args):
+    problems = 0
+    for path in args.states:
+        with open(path, encoding="utf-8") as f:
+            state = normalize_state(json.load(f))
+        findings, lower_bound, secs = check_state(state)
+        print(f"{path}: {len(findings)} bulgu, en az {lower_bound} ders yerleşemez ({secs*1000:.1f} ms)")
+        for fd in findings[:args.limit] if args.limit else findings:
+            print(f"  [{fd['tur']}] {fd['mesaj']}")
+        problems += bool(findings)
+    return 1 if problems else 0
+
+def cmd_import(args):
+    with open(args.state, encoding="utf-8") as f:
+        state = normalize_state(json.load(f))
+    t0 = time.perf_counter()
+    try:
+        res = import_courses(args.file, args.file, state["courses"], state["instructors"],
+                             replace_all=args.replace, update_existing=not args.no_update,
+                             allow_new_instructors=not args.no_new_instructors)
+    except ValueError as e:
+        print(f"HATA {e}", file=sys.stderr)
+        return 1
+    for h in res["new_instructors"]:
+        state["instructors"].append(h)
+        state["instructor_unavailable"][h] = set()
+    state["courses"] = res["courses"]
+    with open(args.out or args.state, "w", encoding="utf-8") as f:
+        json.dump(state_to_payload(state), f, ensure_ascii=False)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8", newline="") as f:
+            f.write(res["report"].to_csv(index=False))
+    print(f"{args.file}: {res['read']} satır, {res['valid']} geçerli (eklenen {res['added']}, "
+          f"güncellenen {res['updated']}, atlanan {res['skipped']}), {res['rejected']} reddedildi, "
+          f"{len(res['new_instructors'])} yeni hoca ({time.perf_counter() - t0:.2f} sn)")
+    for row in res["report"].head(args.limit if args.limit else None).itertuples(index=False):
+        print(f"  satır {row[0]} [{row[1]}] {row[2] or '-'} {row[3]}: {row[5]} ({row[4]!r})")
+    return 1 if res["rejected"] else 0
+
+def cmd_scenario(args):
+    with ScenarioStore(args.db) as store:
+        try:
+            if args.action == "list":
+                print(store.list_scenarios().to_string(index=False))
+            elif args.action == "save":
+                with open(args.state, encoding="utf-8") as f:
+                    state = normalize_state(json.load(f))
+                res = solve_state(state, strategy=args.strategy) if args.solve else None
+                store.save(args.name, state, res and res[2], res and res[1])
+                print(f"{args.name}: kaydedildi" + (f" (yerleşen {len({p[0] for p in res[2]})}/"
+                                                    f"{len(state['courses'])})" if res else ""))
+            elif args.action == "export":
+                with open(args.out, "w", encoding="utf-8") as f:
+                    json.dump(store.export_payload(args.name), f, ensure_ascii=False, indent=2)
+            elif args.action == "diff":
+                diff = store.diff(args.a, args.b)
+                print(diff.to_string(index=False) if len(diff) else "Senaryolar aynı.")
+            elif args.action == "delete":
+                store.delete(args.name)
+        except KeyError as e:
+            print(f"HATA {e.args[0]}", file=sys.stderr)
+            return 1
+    return 0
+
+def cmd_sweep(args):
+    with open(args.state, encoding="utf-8") as f:
+        state = normalize_state(json.load(f))
+    try:
+        spec = parse_spec("\n".join(args.param or []), state)
+    except ValueError as e:
+        print(f"HATA {e}", file=sys.stderr)
+        return 1
+    t0 = time.perf_counter()
+    table, _ = sweep_schedule(state, spec, workers=args.workers, engine=args.engine,
+                              exact_node_limit=args.node_limit, exact_time_limit=args.time_limit)
+    if args.sort:
+        table = table.sort_values(args.sort, ascending=args.sort not in ("Yerleşen", "Yerleşme (%)"), kind="stable")
+    print(table.to_string(index=False))
+    print(f"{len(table)} kombinasyon, {int((~table['Önbellek']).sum())} çözüm, {time.perf_counter() - t0:.2f} sn")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            f.write(timetable_to_csv(table))
+    return 0
+
+def cmd_faculty(args):
+    os.makedirs(args.out, exist_ok=True)
+    departments, used = [], set()
+    for path in args.states:
+        with open(path, encoding="utf-8") as f:
+            state = normalize_state(json.load(f))
+        # Bölüm adı dosya adından gelir; aynı adlı dosyalar (farklı klasörler) -2, -3 ... alır
+        stem = name = os.path.splitext(os.path.basename(path))[0]
+        k = 1
+        while name in used:
+            k += 1
+            name = f"{stem}-{k}"
+        used.add(name)
+        departments.append((name, state))
+    try:
+        results, info = solve_departments(departments, workers=args.workers, strategy=args.strategy,
+                                          engine=args.engine, repair_budget=args.repair_budget)
+    except ValueError as e:
+        print(f"HATA {e}", file=sys.stderr)
+        return 1
+    for name, state in departments:
+        timetable_df, diag_df, placed, _, grid = results[name]
+        base = os.path.join(args.out, name)
+        with open(base + ".csv", "w", encoding="utf-8", newline="") as f:
+            f.write(timetable_to_csv(timetable_df))
+        with open(base + "_yerlesemeyen.csv", "w", encoding="utf-8", newline="") as f:
+            f.write(timetable_to_csv(diag_df))
+        if "xlsx" in (args.format or FORMATS):
+            with open(base + ".xlsx", "wb") as f:
+                f.write(timetable_to_excel_bytes(grid, state["days"], state["rooms"], state["time_labels"],
+                                                 placed=placed, courses=state["courses"]).getvalue())
+        n_placed = len(set(p[0] for p in placed))
+        print(f"{name}: Yerleşen ders: {n_placed}/{len(state['courses'])} "
+              f"(odalar: {', '.join(info['paylar'][name]) or '-'}; "
+              f"uzlaştırmada +{info['uzlastirilan'].get(name, 0)})")
+    with open(os.path.join(args.out, "oda_kullanimi.csv"), "w", encoding="utf-8", newline="") as f:
+        f.write(timetable_to_csv(room_usage_frame(departments, results)))
+    with open(os.path.join(args.out, "oda_doluluk.csv"), "w", encoding="utf-8", newline="") as f:
+        f.write(timetable_to_csv(room_utilization(departments, results)))
+    return 0
+
+def _generate_options(args):
+    return dict(n_rooms=args.rooms, n_instructors=args.instructors, n_departments=args.departments,
+                n_days=args.days, slots_per_day=args.slots, availability=args.availability,
+                online_share=args.online_share, n_pins=args.pins, max_per_room=args.max_per_room,
+                capacities=args.capacities)
+
+def cmd_generate(args):
+    os.makedirs(args.out, exist_ok=True)
+    for n in args.courses or DEFAULT_COURSES:
+        payload = generate_state(n, seed=args.seed, **_generate_options(args))
+        name = case_name(n, len(payload["rooms"]), len(payload["instructors"]), args.seed)
+        path = os.path.join(args.out, f"{name}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        print(f"{path}: {n} ders, {len(payload['rooms'])} oda, {len(payload['instructors'])} hoca, "
+              f"{len(payload['pins'])} PIN")
+    return 0
+
+def cmd_bench(args):
+    cases = []
+    for path in args.states:
+        with open(path, encoding="utf-8") as f:
+            cases.append((os.path.splitext(os.path.basename(path))[0], json.load(f)))
+    if not args.states:
+        for n in args.courses or DEFAULT_COURSES:
+            payload = generate_state(n, seed=args.seed, **_generate_options(args))
+            cases.append((case_name(n, len(payload["rooms"]), len(payload["instructors"]), args.seed), payload))
+
+    results = run_benchmark(cases, strategies=args.strategy, exports=not args.no_exports,
+                            exact_node_limit=args.node_limit, exact_time_limit=args.time_limit)
+    print(f"{'örnek':<28} {'aşama':<14} {'strateji':<24} {'sn':>8} {'tepe MB':>8} {'oran':>6}")
+    for r in results:
+        rate = f"{r['rate']:.3f}" if "rate" in r else ""
+        print(f"{r['case']:<28} {r['stage']:<14} {r['strategy'][:24]:<24} "
+              f"{r['seconds']:>8.3f} {r['peak_rss_mb']:>8.1f} {rate:>6}")
+    if args.save:
+        save_results(args.save, results)
+        print(f"Kaydedildi: {args.save}")
+    if args.compare:
+        rows, regressions = compare_results(load_results(args.compare), results, tolerance=args.tolerance)
+        print(f"Karşılaştırma ({args.compare}): {len(rows)} eşleşen ölçüm, {len(regressions)} gerileme")
+        for r in regressions:
+            print(f"  GERİLEME {r['case']} / {r['stage']} / {r['strategy']}: "
+                  f"{r['seconds_old']:.3f} → {r['seconds_new']:.3f} sn (x{r['ratio']}), "
+                  f"oran {r['rate_old']} → {r['rate_new']}")
+        return 1 if regressions else 0
+    return 0
+
+def _add_generate_args(p):
+    p.add_argument("--courses", type=int, nargs="+", default=None,
+                   help=f"ders sayıları (varsayılan: {' '.join(map(str, DEFAULT_COURSES))})")
+    p.add_argument("--rooms", type=int, default=None, help="oda sayısı (varsayılan: ders/15)")
+    p.add_argument("--instructors", type=int, default=None, help="hoca sayısı (varsayılan: ders/6)")
+    p.add_argument("--departments", type=int, default=None,
+                   help="bölüm sayısı; her bölümün 4 sınıfı (varsayılan: sınıf yükü pencereye sığacak kadar)")
+    p.add_argument("--days", type=int, default=5, help="gün sayısı")
+    p.add_argument("--slots", type=int, default=10, help="günlük slot sayısı")
+    p.add_argument("--availability", type=float, default=0.8, help="hoca uygunluk oranı (0–1)")
+    p.add_argument("--online-share", type=float, default=0.2, help="online ders oranı (0–1)")
+    p.add_argument("--pins", type=int, default=0, help="PIN sayısı")
+    p.add_argument("--max-per-room", type=int, default=1, help="oda başına eşzamanlı ders")
+    p.add_argument("--capacities", action="store_true", help="oda kapasitesi/özelliği ve ders öğrenci sayısı üret")
+    p.add_argument("--seed", type=int, default=0, help="üretici tohumu")
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="ders_programi", description="Ders programı planlayıcı (Streamlit'siz).")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    pp = sub.add_parser("plan", help="timetable_state.json dosyalarını planla ve CSV/Excel/PDF yaz")
+    pp.add_argument("states", nargs="+", help="build_state_payload ile üretilmiş JSON dosyaları")
+    pp.add_argument("-o", "--out", default=".", help="çıktı klasörü (varsayılan: .)")
+    pp.add_argument("-f", "--format", action="append", choices=FORMATS,
+                    help="yazılacak biçim (tekrarlanabilir; varsayılan: hepsi)")
+    pp.add_argument("--pdf-view", action="append", choices=WEEKLY_VIEWS,
+                    help="PDF'e bu görünümün haftalık sayfalarını ekle (tekrarlanabilir: Hoca, Sınıf, Oda)")
+    pp.add_argument("--strategy", default=None, choices=STRATEGIES, help="JSON'daki stratejiyi geçersiz kıl")
+    pp.add_argument("--engine", default="bitset", choices=ENGINES, help="doluluk motoru (varsayılan: bitset)")
+    pp.add_argument("--repair-budget", type=float, default=0.0,
+                    help="greedy sonrası onarım için saniye cinsinden süre (0 = kapalı)")
+    pp.add_argument("--node-limit", type=int, default=200000, help="tam arama düğüm sınırı")
+    pp.add_argument("--time-limit", type=float, default=10.0, help="tam arama süre sınırı (sn)")
+    pp.add_argument("--starts", type=int, default=1, help="çoklu başlangıç deneme sayısı (varsayılan: 1)")
+    pp.add_argument("--seed", type=int, default=0, help="çoklu başlangıç tohumu (--repair-budget 0 iken tekrarlanabilir)")
+    pp.add_argument("--workers", type=int, default=None, help="süreç sayısı (varsayılan: çekirdek sayısı)")
+    pp.add_argument("--log-perf", action="store_true",
+                    help="aşama süreleri/sayaçlar ve dışa aktarım boyutları için 'perf event=...' log satırları yaz")
+    pp.add_argument("--profile", action="store_true", help="her dosya için cProfile kaydını <ad>.prof olarak yaz")
+    pp.set_defaults(func=cmd_plan)
+
+    pc = sub.add_parser("check", help="çözmeden kapasite/olabilirlik kontrolü yap (bulgu varsa çıkış kodu 1)")
+    pc.add_argument("states", nargs="+", help="timetable_state.json dosyaları")
+    pc.add_argument("--limit", type=int, default=20, help="dosya başına gösterilecek bulgu (0 = hepsi)")
+    pc.set_defaults(func=cmd_check)
+
+    pi = sub.add_parser("import", help="ders listesini (CSV/Excel) doğrulayarak bir duruma içe aktar")
+    pi.add_argument("state", help="hedef timetable_state.json")
+    pi.add_argument("file", help="dersler (.csv ya da .xlsx)")
+    pi.add_argument("-o", "--out", default=None, help="yazılacak JSON (varsayılan: state dosyasının üzerine)")
+    pi.add_argument("--replace", action="store_true", help="mevcut ders listesini tamamen değiştir")
+    pi.add_argument("--no-update", action="store_true", help="aynı ID'li mevcut dersleri güncelleme")
+    pi.add_argument("--no-new-instructors", action="store_true", help="bilinmeyen hocalı satırları reddet")
+    pi.add_argument("--report", default=None, help="satır bazlı hata raporunu bu CSV'ye yaz")
+    pi.add_argument("--limit", type=int, default=20, help="gösterilecek rapor satırı (0 = hepsi)")
+    pi.set_defaults(func=cmd_import)
+
+    ps = sub.add_parser("scenario", help="SQLite senaryo deposu: kaydet, listele, dışa aktar, karşılaştır, sil")
+    ps.add_argument("--db", default=None, help="veritabanı (varsayılan: $DERS_PROGRAMI_DB ya da senaryolar.db)")
+    ss = ps.add_subparsers(dest="action", required=True)
+    ss.add_parser("list", help="senaryoları listele")
+    p_save = ss.add_parser("save", help="JSON durumunu senaryo olarak kaydet (aynı ad varsa üzerine)")
+    p_save.add_argument("name")
+    p_save.add_argument("state", help="timetable_state.json")
+    p_save.add_argument("--solve", action="store_true", help="çözüp yerleşimi de kaydet")
+    p_save.add_argument("--strategy", default=None, choices=STRATEGIES, help="JSON'daki stratejiyi geçersiz kıl")
+    p_exp = ss.add_parser("export", help="senaryoyu timetable_state.json olarak yaz")
+    p_exp.add_argument("name")
+    p_exp.add_argument("-o", "--out", required=True, help="yazılacak JSON")
+    p_diff = ss.add_parser("diff", help="iki senaryonun farkı")
+    p_diff.add_argument("a")
+    p_diff.add_argument("b")
+    ss.add_parser("delete", help="senaryoyu sil").add_argument("name")
+    ps.set_defaults(func=cmd_scenario)
+
+    pw = sub.add_parser("sweep", help="parametre kombinasyonlarını çöz ve karşılaştır (ne olur? taraması)")
+    pw.add_argument("state", help="timetable_state.json")
+    pw.add_argument("-p", "--param", action="append",
+                    help="'parametre = değerler' (tekrarlanabilir): online_cap = 2, 3, 5; day_use_slots:4 = 6..10; "
+                         "drop_rooms = -, Oda-1; strategy = Klasik")
+    pw.add_argument("-o", "--out", default=None, help="karşılaştırma tablosunu bu CSV'ye yaz")
+    pw.add_argument("--sort", default=None, choices=METRIC_COLS, help="tabloyu bu ölçüte göre sırala")
+    pw.add_argument("--engine", default="bitset", choices=ENGINES, help="doluluk motoru (varsayılan: bitset)")
+    pw.add_argument("--node-limit", type=int, default=200000, help="tam arama düğüm sınırı")
+    pw.add_argument("--time-limit", type=float, default=10.0, help="tam arama süre sınırı (sn)")
+    pw.add_argument("--workers", type=int, default=None, help="süreç sayısı (varsayılan: az çalıştırmada seri, çoksa çekirdek sayısı)")
+    pw.set_defaults(func=cmd_sweep)
+
+    pf = sub.add_parser("faculty", help="ortak odaları paylaşan bölümleri birlikte planla")
+    pf.add_argument("states", nargs="+", help="bölüm başına bir timetable_state.json (dosya adı = bölüm adı)")
+    pf.add_argument("-o", "--out", default=".", help="çıktı klasörü (varsayılan: .)")
+    pf.add_argument("-f", "--format", action="append", choices=["csv", "xlsx"],
+                    help="bölüm çıktıları (CSV her zaman yazılır)")
+    pf.add_argument("--strategy", default=None, choices=STRATEGIES, help="JSON'daki stratejiyi geçersiz kıl")
+    pf.add_argument("--engine", default="bitset", choices=ENGINES, help="doluluk motoru (varsayılan: bitset)")
+    pf.add_argument("--repair-budget", type=float, default=0.0, help="1. aşamada bölüm başına onarım süresi (sn)")
+    pf.add_argument("--workers", type=int, default=None, help="süreç sayısı (varsayılan: çekirdek sayısı)")
+    pf.set_defaults(func=cmd_faculty)
+
+    pg = sub.add_parser("generate", help="tohumlu sentetik timetable_state.json örnekleri üret")
+    _add_generate_args(pg)
+    pg.add_argument("-o", "--out", default=".", help="çıktı klasörü (varsayılan: .)")
+    pg.set_defaults(func=cmd_generate)
+
+    pb = sub.add_parser("bench", help="çözücü ve dışa aktarıcıları ölç (süre, tepe bellek, yerleşim oranı)")
+    pb.add_argument("states", nargs="*", help="ölçülecek JSON dosyaları (verilmezse sentetik örnek üretilir)")
+    _add_generate_args(pb)
+    pb.add_argument("--strategy", action="append", choices=STRATEGIES,
+                    help="ölçülecek strateji (tekrarlanabilir; varsayılan: hepsi)")
+    pb.add_argument("--no-exports", action="store_true", help="gün tablosu/Excel/PDF aşamalarını atla")
+    pb.add_argument("--node-limit", type=int, default=200000, help="tam arama düğüm sınırı")
+    pb.add_argument("--time-limit", type=float, default=10.0, help="tam arama süre sınırı (sn)")
+    pb.add_argument("--save", default=None, help="sonuçları bu JSON dosyasına kaydet")
+    pb.add_argument("--compare", default=None, help="önceki sonuç dosyasıyla karşılaştır (gerilemede çıkış kodu 1)")
+    pb.add_argument("--tolerance", type=float, default=0.25, help="süre gerileme toleransı (varsayılan: 0.25)")
+    pb.set_defaults(func=cmd_bench)
+    return p
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
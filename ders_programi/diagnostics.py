@@ -0,0 +1,166 @@
+# ders_programi/diagnostics.py
+"""Yerleşemeyen dersler için engelleyen-kısıt analizi.
+
+Her ders için tüm (gün, başlangıç) adayları son doluluk durumuna karşı
+sınanır. Gün penceresi dışındaki adaylar "gün penceresi" olarak sayılır;
+pencere içindeki her aday için ihlal edilen her kısıt ayrı sayılır (bir aday
+birden fazla kısıta takılabilir). Kısıt başına ret sayıları, bloke edilen
+slot maskesinin L-slot kaydırmalarının OR'u ile gün başına tek işlemde
+hesaplanır; "boş oda yok" maskesi doluluk motorunun boş-oda maskelerinden
+(gün, süre) başına bir kez çıkarılır ve tüm derslerce paylaşılır.
+
+En az kısıta takılan (en iyi) adaylarda hoca/sınıf çakışmasına, oda ya da
+online kapasitesine yol açan yerleşmiş dersler "engelleyen" olarak adlandırılır.
+"""
+from .occupancy import BitsetOccupancy, window_mask
+
+CONSTRAINTS = ["pencere", "uygunsuz", "hoca", "sinif", "oda", "online"]
+CONSTRAINT_LABELS = {
+    "pencere": "gün penceresi",
+    "uygunsuz": "hoca uygunsuz",
+    "hoca": "hoca çakışması",
+    "sinif": "sınıf çakışması",
+    "oda": "boş oda yok",
+    "online": "online kapasite dolu",
+}
+FIXABLE = ["hoca", "sinif", "oda", "online"]  # başka dersler taşınarak çözülebilenler
+MAX_BLOCKERS = 5
+MAX_BEST = 3
+
+def _hits(blocked, L, valid):
+    """Penceresi (L slot) blocked maskesine değen başlangıçların maskesi."""
+    if not blocked:
+        return 0
+    m = blocked
+    for k in range(1, L):
+        m |= blocked >> k
+    return m & valid
+
+def build_occupancy(placed, courses, n_days, spd, rooms, inst_unav, cs, reserved=()):
+    """Son yerleşimden (ve oda rezervasyonlarından) bir BitsetOccupancy kur (tek geçiş)."""
+    occ = BitsetOccupancy(n_days, spd, len(rooms), inst_unav, int(cs["online_cap"]), int(cs["max_per_room"]))
+    col = {r["id"]: ri for ri, r in enumerate(rooms)}
+    for rm, d, start, L in reserved:
+        if rm in col:
+            occ.block_room(col[rm], d, start, L)
+    for ci, d, start, ch, rm, L in placed:
+        c = courses[ci]
+        occ.add(c["hoca"], c["sinif"], d, start, L, None if ch == "Online" else col[rm])
+    return occ
+
+def diagnose_unplaced(targets, placed, courses, days, spd, avail, occ, cs, time_labels=None, allowed=None):
+    """targets: analiz edilecek ders indeksleri. {ci: bilgi} döndürür.
+
+    allowed: ders başına uygun oda maskesi (None => tüm odalar); occ ile aynı oda sırasında.
+
+    bilgi: {"aday": toplam aday, "ret": {kısıt: adet}, "en_iyi": ["Gün saat"],
+    "engelleyenler": [ders id], "neden": metin}
+    """
+    n_days = len(days)
+    enf_inst = bool(cs["enf_instructor_no_overlap"])
+    enf_class = bool(cs["enf_class_no_overlap"])
+    time_labels = time_labels or {}
+
+    # Slot sahipleri: (gün, slot) -> yerleşmiş dersler (engelleyenleri adlandırmak için)
+    owners = [[[] for _ in range(spd)] for __ in range(n_days)]
+    for ci, d, start, ch, rm, L in placed:
+        for s in range(start, min(spd, start + L)):
+            owners[d][s].append((ci, ch))
+
+    room_cache = {}
+    def no_room(d, L, rooms_ok):
+        """d gününde L slotluk penceresinde hiç (uygun) boş oda olmayan başlangıçlar."""
+        v = room_cache.get((d, L, rooms_ok))
+        if v is None:
+            v = 0
+            for s in range(spd - L + 1):
+                if occ.free_room(d, s, L, rooms_ok) is None:
+                    v |= 1 << s
+            room_cache[(d, L, rooms_ok)] = v
+        return v
+
+    out, memo = {}, {}
+    for ci in targets:
+        c = courses[ci]; L = int(c["sure"]); online = bool(c["online"])
+        rooms_ok = None if online or allowed is None else allowed[ci]
+        # Aynı hoca/sınıf/süre/kanal/uygun odalar aynı analizi verir
+        key = (c["hoca"], c["sinif"], L, online, rooms_ok)
+        if key in memo:
+            out[ci] = memo[key]
+            continue
+        ret = dict.fromkeys(CONSTRAINTS, 0)
+        total = 0
+        best, best_n = [], None
+        if L <= 0 or L > spd:
+            out[ci] = memo[key] = {"aday": 0, "ret": ret, "en_iyi": [], "engelleyenler": [],
+                                   "neden": f"Süre ({L}) gün uzunluğuna ({spd} slot) sığmıyor"}
+            continue
+        valid = window_mask(0, spd - L + 1)
+        unav = avail.unav_masks(c["hoca"])
+        inst_m = occ.inst_mask.get(c["hoca"]) if enf_inst else None
+        class_m = occ.class_mask.get(c["sinif"]) if enf_class else None
+        for d in range(n_days):
+            total += spd - L + 1
+            w = avail.window_masks[d]
+            in_win = w
+            for k in range(1, L):
+                in_win &= w >> k
+            in_win &= valid
+            ret["pencere"] += (valid & ~in_win).bit_count()
+            if not in_win:
+                continue
+            masks = {
+                "uygunsuz": _hits(unav[d], L, in_win),
+                "hoca": _hits(inst_m[d], L, in_win) if inst_m else 0,
+                "sinif": _hits(class_m[d], L, in_win) if class_m else 0,
+                "online": _hits(occ.online_mask[d], L, in_win) if online else 0,
+            }
+            if not online:
+                masks["oda"] = no_room(d, L, rooms_ok) & in_win
+            for k, m in masks.items():
+                ret[k] += m.bit_count()
+
+            # En az (çözülebilir) kısıta takılan adaylar; uygunsuzluk kalıcı sayılır.
+            # Aday başına ihlal sayısı bit dilimli toplayıcıyla (b0, b1, b2) bulunur.
+            cand = in_win & ~masks["uygunsuz"]
+            if not cand:
+                continue
+            b0 = b1 = b2 = 0
+            for k in FIXABLE:
+                m = masks.get(k, 0)
+                c0 = b0 & m; b0 ^= m
+                c1 = b1 & c0; b1 ^= c0
+                b2 |= c1
+            for n in range(len(FIXABLE) + 1):
+                if best_n is not None and n > best_n:
+                    break
+                eq = cand & (b0 if n & 1 else ~b0) & (b1 if n & 2 else ~b1) & (b2 if n & 4 else ~b2)
+                if not eq:
+                    continue
+                if best_n is None or n < best_n:
+                    best, best_n = [], n
+                while eq and len(best) < MAX_BEST:
+                    low = eq & -eq
+                    eq ^= low
+                    best.append((d, low.bit_length() - 1, [k for k in FIXABLE if masks.get(k, 0) & low]))
+                break
+
+        blockers = {}
+        for d, s, viol in best:
+            channel = "oda" in viol or "online" in viol
+            for t in range(s, s+L):
+                for oj, ch in owners[d][t]:
+                    o = courses[oj]
+                    if ("hoca" in viol and o["hoca"] == c["hoca"]) or ("sinif" in viol and o["sinif"] == c["sinif"]) \
+                            or (channel and (ch == "Online") == online):
+                        blockers[oj] = blockers.get(oj, 0) + 1
+        blocker_ids = [courses[oj]["id"] for oj, _ in
+                       sorted(blockers.items(), key=lambda kv: (-kv[1], kv[0]))[:MAX_BLOCKERS]]
+
+        top = sorted(((n, k) for k, n in ret.items() if n), reverse=True)[:3]
+        neden = "; ".join(f"{CONSTRAINT_LABELS[k]}: {n}/{total} aday" for n, k in top) or "aday yok"
+        if rooms_ok == 0:
+            neden = f"Uygun oda yok (kapasite/özellik); {neden}"
+        out[ci] = memo[key] = {"aday": total, "ret": ret, "engelleyenler": blocker_ids, "neden": neden,
+                   "en_iyi": [f"{days[d]} {time_labels.get(s, f'{s+1}. Slot')}" for d, s, _ in best]}
+    return out
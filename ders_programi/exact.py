@@ -0,0 +1,270 @@
+# ders_programi/exact.py
+"""Tam arama: ileri denetimli (forward checking) kısıt yayılımı + MRV.
+
+Her dersin alanı (domain), gün başına bir başlangıç maskesidir; bir bit,
+o başlangıçta hoca/sınıf/uygunluk/gün penceresi ve en az bir boş oda (ya da
+online kapasite) bulunduğu anlamına gelir. Bir atama yalnızca etkilenen
+dersleri budar: aynı hoca, aynı sınıf ve aynı kanalda (oda/online) çakışan
+başlangıçlar. Budamalar bir iz (trail) üzerinde tutulur ve geri izlemede
+geri alınır. Her adımda en az seçeneği kalan ders seçilir (MRV).
+
+Odalar, o gündeki doluluğu, kapasitesi ve özellikleri aynı olan odalar
+birbirinin yerine geçebildiği için değer üretiminde tek temsilciye indirgenir
+(simetri kırma); böylece "çözüm yok" kanıtı oda sayısıyla patlamaz. Her ders
+yalnızca kendisine yeten odalara (kapasite/özellik) bakar; odalar en küçük
+yeten odadan başlayarak denenir.
+
+Dersler tek blok olarak aranır (ardisik=False dersler bölünmez); tam atama
+bulunamazsa greedy'ye düşülür ve bölme orada yapılır.
+
+Sonuç durumları: "found" (tam atama), "infeasible" (arama tükendi, çözüm
+yok), "infeasible_unsplit" (arama tükendi ama bölünebilen ders var: yalnızca
+tek blokluk atama yok, kanıt değil) veya "limit" (düğüm/süre sınırına takıldı).
+"""
+import time
+
+from .occupancy import AvailabilityIndex, room_capacity, room_masks, window_mask
+
+def _bits(m):
+    while m:
+        low = m & -m
+        yield low.bit_length() - 1
+        m ^= low
+
+def exact_search(days, spd, rooms, courses, inst_unav, cs, day_start_slot, day_use_slots,
+                 fixed, free_ci, node_limit=200000, time_limit=10.0):
+    """fixed: PIN'lerden gelen yerleşimler; free_ci: aranacak dersler.
+
+    (status, placements, info) döndürür. placements yalnızca status
+    "found" iken doludur ve free_ci derslerinin yerleşimlerini içerir.
+    time_limit=None süre sınırını kapatır; arama yalnızca node_limit ile
+    sınırlanır ve sonuç makine hızından bağımsızdır.
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + float(time_limit) if time_limit is not None else float("inf")
+    n_days, n_rooms = len(days), len(rooms)
+    online_col = n_rooms
+    online_cap = int(cs["online_cap"])
+    max_per_room = int(cs["max_per_room"])
+    enf_inst = bool(cs["enf_instructor_no_overlap"])
+    enf_class = bool(cs["enf_class_no_overlap"])
+    room_col = {r["id"]: ri for ri, r in enumerate(rooms)}
+    fits = room_masks(rooms, courses)
+    room_sig = [(room_capacity(r), tuple(sorted(r.get("features") or ()))) for r in rooms]
+    # En küçük yeten oda önce (kapasitesizler sonda); kapasite yoksa oda sırası korunur
+    order = sorted(range(n_rooms), key=lambda ri: (room_capacity(rooms[ri]) or float("inf"), ri))
+    rank = {ri: i for i, ri in enumerate(order)}
+    by_fit = any(room_capacity(r) for r in rooms)
+
+    # ---- Kanal kapasitesi (oda sayaçları + boş oda maskeleri, online yük) ----
+    all_rooms = (1 << n_rooms) - 1 if max_per_room > 0 else 0
+    room_cnt = [[[0]*spd for _ in range(n_rooms)] for __ in range(n_days)]
+    free_rooms = [[all_rooms]*spd for _ in range(n_days)]
+    online_load = [[0]*spd for _ in range(n_days)]
+
+    def cap_change(d, start, L, col, delta):
+        """Kapasiteyi güncelle; bir odanın dolu/boş durumu değiştiyse True."""
+        flipped = False
+        for s in range(start, start+L):
+            if col == online_col:
+                online_load[d][s] += delta
+                continue
+            cnt = room_cnt[d][col]
+            before = cnt[s] >= max_per_room
+            cnt[s] += delta
+            if (cnt[s] >= max_per_room) != before:
+                flipped = True
+                if delta > 0:
+                    free_rooms[d][s] &= ~(1 << col)
+                else:
+                    free_rooms[d][s] |= 1 << col
+        return flipped or col == online_col
+
+    def channel_ok(online, d, start, L, rooms_ok=-1):
+        if online:
+            return all(online_load[d][s] < online_cap for s in range(start, start+L))
+        m = all_rooms & rooms_ok
+        for s in range(start, start+L):
+            m &= free_rooms[d][s]
+            if not m:
+                return False
+        return True
+
+    inst_busy, class_busy = {}, {}
+    def mark_busy(table, key, d, start, L):
+        table.setdefault(key, [0]*n_days)[d] |= window_mask(start, L)
+
+    for ci, d, start, ch, rm, L in fixed:
+        c = courses[ci]
+        cap_change(d, start, L, online_col if ch == "Online" else room_col[rm], +1)
+        mark_busy(inst_busy, c["hoca"], d, start, L)
+        mark_busy(class_busy, c["sinif"], d, start, L)
+
+    # ---- Başlangıç alanları ----
+    avail = AvailabilityIndex(n_days, spd, inst_unav, day_start_slot, day_use_slots)
+    dom, cnt = {}, {}
+    by_inst, by_class, by_channel = {}, {}, {True: [], False: []}
+    for ci in free_ci:
+        c = courses[ci]; L = int(c["sure"]); online = bool(c["online"])
+        masks = avail.start_masks(c["hoca"], L) if L > 0 else [0]*n_days
+        dm = []
+        for d in range(n_days):
+            m = masks[d]
+            for s in _bits(masks[d]):
+                w = window_mask(s, L)
+                if (enf_inst and inst_busy.get(c["hoca"], [0]*n_days)[d] & w) or \
+                   (enf_class and class_busy.get(c["sinif"], [0]*n_days)[d] & w) or \
+                   not channel_ok(online, d, s, L, fits[ci]):
+                    m &= ~(1 << s)
+            dm.append(m)
+        dom[ci] = dm
+        cnt[ci] = sum(m.bit_count() for m in dm)
+        by_inst.setdefault(c["hoca"], []).append(ci)
+        by_class.setdefault(c["sinif"], []).append(ci)
+        by_channel[online].append(ci)
+
+    # Bölünebilen ders varsa tükenen arama yalnızca tek blokluk atama olmadığını gösterir
+    split_ci = [ci for ci in free_ci if cs.get("split_sessions", True)
+                and not courses[ci]["ardisik"] and int(courses[ci]["sure"]) > 1]
+    no_solution = "infeasible_unsplit" if split_ci else "infeasible"
+    info = {"nodes": 0, "seconds": 0.0, "courses": len(free_ci), "split_courses": len(split_ci)}
+    if any(cnt[ci] == 0 for ci in free_ci):
+        info["seconds"] = time.perf_counter() - t0
+        info["empty_domain"] = [courses[ci]["id"] for ci in free_ci if cnt[ci] == 0]
+        return no_solution, [], info
+
+    unassigned = set(free_ci)
+    assigned = {}
+    trail = []
+
+    def prune(ci, d, m):
+        """ci'nin d günündeki alanından m bitlerini sil; alan boşaldıysa False."""
+        old = dom[ci][d]
+        new = old & ~m
+        if new == old:
+            return True
+        trail.append((ci, d, old))
+        dom[ci][d] = new
+        cnt[ci] -= (old ^ new).bit_count()
+        return cnt[ci] > 0
+
+    def assign(ci, d, start, col):
+        c = courses[ci]; L = int(c["sure"])
+        assigned[ci] = (d, start, col)
+        unassigned.discard(ci)
+        trail.append(("cap", ci, d, start, L, col))
+        changed = cap_change(d, start, L, col, +1)
+        ok = True
+        peers = []
+        if enf_inst:
+            peers.append(by_inst[c["hoca"]])
+        if enf_class:
+            peers.append(by_class[c["sinif"]])
+        for group in peers:
+            for cj in group:
+                if cj in unassigned:
+                    Lj = int(courses[cj]["sure"])
+                    lo = max(0, start - Lj + 1)
+                    if not prune(cj, d, window_mask(lo, start + L - lo)):
+                        ok = False
+        if ok and changed:
+            for cj in by_channel[col == online_col]:
+                if cj not in unassigned:
+                    continue
+                Lj = int(courses[cj]["sure"])
+                lo = max(0, start - Lj + 1)
+                hit = dom[cj][d] & window_mask(lo, start + L - lo)
+                bad = 0
+                for s in _bits(hit):
+                    if not channel_ok(col == online_col, d, s, Lj, fits[cj]):
+                        bad |= 1 << s
+                if bad and not prune(cj, d, bad):
+                    ok = False
+                    break
+        return ok
+
+    def undo(mark):
+        while len(trail) > mark:
+            e = trail.pop()
+            if e[0] == "cap":
+                _, ci, d, start, L, col = e
+                cap_change(d, start, L, col, -1)
+                del assigned[ci]
+                unassigned.add(ci)
+            else:
+                ci, d, old = e
+                cnt[ci] += (old ^ dom[ci][d]).bit_count()
+                dom[ci][d] = old
+
+    def select():
+        best, best_key = None, None
+        for ci in unassigned:
+            c = courses[ci]
+            key = (cnt[ci], -int(c.get("sinif", 1) == 4), -int(c["sure"]), ci)
+            if best_key is None or key < best_key:
+                best, best_key = ci, key
+        return best
+
+    def values(ci):
+        c = courses[ci]; L = int(c["sure"])
+        for d in range(n_days):
+            for s in _bits(dom[ci][d]):
+                if c["online"]:
+                    yield (d, s, online_col)
+                    continue
+                m = all_rooms & fits[ci]
+                for t in range(s, s+L):
+                    m &= free_rooms[d][t]
+                seen = set()
+                for ri in (sorted(_bits(m), key=rank.__getitem__) if by_fit else _bits(m)):
+                    sig = (tuple(room_cnt[d][ri]), room_sig[ri])
+                    if sig in seen:
+                        continue
+                    seen.add(sig)
+                    yield (d, s, ri)
+
+    # ---- Yinelemeli DFS ----
+    stack = []
+    status = None
+    ci = select()
+    if ci is not None:
+        stack.append((ci, values(ci), len(trail)))
+    while status is None:
+        if not stack:
+            status = "found" if not unassigned else no_solution
+            break
+        ci, it, mark = stack[-1]
+        undo(mark)
+        moved = False
+        for d, s, col in it:
+            info["nodes"] += 1
+            if info["nodes"] > node_limit or time.perf_counter() > deadline:
+                status = "limit"
+                break
+            if assign(ci, d, s, col):
+                moved = True
+                break
+            undo(mark)
+        if status is not None:
+            break
+        if not moved:
+            stack.pop()
+            continue
+        nxt = select()
+        if nxt is None:
+            status = "found"
+            break
+        stack.append((nxt, values(nxt), len(trail)))
+
+    info["seconds"] = time.perf_counter() - t0
+    if status != "found":
+        return status, [], info
+    placements = []
+    for ci in free_ci:
+        d, s, col = assigned[ci]
+        L = int(courses[ci]["sure"])
+        if col == online_col:
+            placements.append((ci, d, s, "Online", "ONLINE", L))
+        else:
+            placements.append((ci, d, s, "FaceToFace", rooms[col]["id"], L))
+    return status, placements, info
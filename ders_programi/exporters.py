@@ -0,0 +1,302 @@
+# ders_programi/exporters.py
+"""Program çıktıları: CSV, Excel (gün başına sayfa) ve PDF.
+
+Excel ve PDF, gün sayfalarına ek olarak hoca/sınıf/oda başına haftalık
+sayfalar içerebilir; hepsi grid.weekly_index ters dizininden tek geçişte üretilir.
+"""
+import hashlib, io, json, os, textwrap
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.transforms import Bbox, TransformedBbox
+
+from .grid import EMPTY, WEEKLY_VIEWS, course_label, day_rows, weekly_index, weekly_rows
+
+def export_key(placed, courses, days, rooms, time_labels):
+    """Yerleşim + yerleşim girdilerinin (gün, oda, saat etiketi) içerik özeti.
+
+    Aynı anahtar aynı CSV/Excel/PDF çıktısı demektir; önbellek anahtarı olarak
+    kullanılır.
+    """
+    payload = [
+        list(days), [r["id"] for r in rooms], sorted((int(k), str(v)) for k, v in time_labels.items()),
+        [(d, start, ch, rm, L, course_label(courses[ci])) for ci, d, start, ch, rm, L in placed],
+    ]
+    return hashlib.sha1(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def timetable_to_csv(timetable_df):
+    out = io.StringIO()
+    timetable_df.to_csv(out, index=False)
+    return out.getvalue()
+
+# ====================== PDF Üretimi (wrap + dinamik satır) ======================
+
+def _wrap_cell(text, max_chars):
+    if text is None: return ""
+    t = str(text).strip()
+    if t == "-" or t == "": return ""
+    t = t.replace(" / ", "\n")
+    lines = []
+    for part in t.split("\n"):
+        if not part.strip():
+            lines.append("")
+            continue
+        wrapped = textwrap.wrap(part, width=max_chars, break_long_words=True, break_on_hyphens=True)
+        lines.extend(wrapped if wrapped else [part])
+    return "\n".join(lines)
+
+FAST_PDF_ROOMS = 12  # bu oda sayısından itibaren Table yerine doğrudan ızgara çizilir
+FAST_PDF_PAGES = 20  # haftalık (hoca/sınıf/oda) sayfa sayısı bunu aşınca ızgara çizimi
+PARALLEL_PDF_PAGES = 60  # workers verilmezse süreç havuzu ancak bu sayfa sayısından itibaren açılır
+PAGE_SIZE = (11.69, 8.27)  # A4 yatay
+
+def _wrap_rows(rows, char_limits):
+    """Hücreleri sar; (sarılmış satırlar, satır başına en çok satır sayısı)."""
+    wrapped, row_lines = [], []
+    for row in rows:
+        wr_row = [_wrap_cell(raw, char_limits[c_i]) for c_i, raw in enumerate(row)]
+        wrapped.append(wr_row)
+        row_lines.append(max(w.count("\n")+1 if w else 1 for w in wr_row))
+    return wrapped, row_lines
+
+def _table_page(title, cols, rows):
+    """Klasik sayfa: matplotlib Table (hücre başına nesne)."""
+    n_content = len(cols) - 1
+    saat_w = 0.12
+    rest_w = (1.0 - saat_w) / n_content
+    col_widths = [saat_w] + [rest_w]*(n_content)
+    wrapped, row_max_lines = _wrap_rows(rows, [8] + [max(16, int(rest_w*100))]*n_content)
+
+    fig = plt.figure(figsize=PAGE_SIZE)
+    ax = plt.gca()
+    ax.axis('off')
+    ax.set_title(title, pad=12)
+
+    tbl = ax.table(cellText=wrapped, colLabels=cols, loc='center', cellLoc='left')
+    tbl.auto_set_font_size(False)
+    tbl.set_fontsize(7)
+
+    for (r, c), cell in tbl.get_celld().items():
+        w = col_widths[c] if c < len(col_widths) else rest_w
+        cell.set_width(w)
+
+    base_h = 0.04
+    for r in range(1, len(rows)+1):  # 1..n, 0 header
+        lines = row_max_lines[r-1]
+        h = base_h * max(1.0, lines*0.9)
+        for c in range(len(cols)):
+            tbl[(r, c)].set_height(h)
+
+    for c in range(len(cols)):
+        hdr = tbl[(0, c)]
+        hdr.set_height(0.05)
+        hdr.set_fontsize(8)
+    return fig, {"bbox_inches": "tight"}
+
+def _grid_page(title, cols, rows, fig=None):
+    """Hızlı sayfa: çizgiler tek seferde (hlines/vlines), yalnızca dolu hücrelere metin.
+
+    fig verilirse (önceki hızlı sayfa) figür ve eksen yeniden kullanılır;
+    yalnızca çizimler silinir — çok sayfalı PDF'te sayfa başına kurulum maliyeti kalkar.
+    """
+    left, right, bottom, top = 0.02, 0.98, 0.03, 0.92
+    page_w, page_h = PAGE_SIZE
+    n_content = len(cols) - 1
+    saat_w = 0.08 if n_content > 1 else 0.12
+    col_w = [saat_w] + [(1.0 - saat_w) / n_content]*n_content
+    xs = [left]
+    for w in col_w:
+        xs.append(xs[-1] + w*(right-left))
+
+    # Yazı boyutu: en dar sütuna ~12 karakter, satırlar sayfaya sığacak şekilde
+    narrow_pt = (xs[2]-xs[1]) * page_w * 72 if n_content else 72
+    fs = max(2.5, min(7.0, narrow_pt / (0.55*12)))
+    saat_pt = (xs[1]-xs[0]) * page_w * 72
+    limits = [max(1, int(saat_pt / (0.6*fs)))] + [max(1, int(narrow_pt / (0.6*fs)))]*n_content
+    wrapped, row_lines = _wrap_rows(rows, limits)
+    units = 1.2 + sum(row_lines)  # başlık satırı + içerik satırları
+    line_h = (top - bottom) / units
+    fs = max(2.0, min(fs, line_h * page_h * 72 / 1.25))
+
+    if fig is None:
+        fig = plt.figure(figsize=PAGE_SIZE)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_xlim(0, 1); ax.set_ylim(0, 1)
+        ax.axis('off')
+    else:
+        ax = fig.axes[0]
+        for artist in [*fig.texts, *ax.texts, *ax.collections]:
+            artist.remove()
+    fig.text(0.5, 0.96, title, ha="center", va="center", fontsize=12)
+
+    ys = [top, top - 1.2*line_h]
+    for n in row_lines:
+        ys.append(ys[-1] - n*line_h)
+    ax.fill_between([xs[0], xs[-1]], ys[1], ys[0], color="#e8e8e8", lw=0)
+    ax.hlines(ys, xs[0], xs[-1], colors="black", linewidth=0.4)
+    ax.vlines(xs, ys[-1], ys[0], colors="black", linewidth=0.4)
+
+    # Sarma karakter tahminidir; her metin kendi hücre kutusuna kırpılır, komşu hücreye taşmaz
+    def cell_text(c, r, y, text, **kw):
+        t = ax.text(xs[c]+pad, y, text, ha="left", clip_on=True, **kw)
+        t.set_clip_box(TransformedBbox(Bbox([[xs[c], ys[r+1]], [xs[c+1], ys[r]]]), ax.transData))
+
+    pad = 0.003
+    for c, label in enumerate(cols):
+        cell_text(c, 0, (ys[0]+ys[1])/2, label, va="center", fontsize=fs+1, fontweight="bold")
+    for r, row in enumerate(wrapped):
+        y = ys[r+1] - line_h*0.1
+        for c, text in enumerate(row):
+            if text:
+                cell_text(c, r+1, y, text, va="top", fontsize=fs, linespacing=1.1)
+    return fig, {}
+
+def _render_page(job):
+    """Tek günü tek sayfalık PDF olarak üret (süreç havuzunda da çalışır)."""
+    title, cols, rows, fast = job
+    fig, opts = (_grid_page if fast else _table_page)(title, cols, rows)
+    bio = BytesIO()
+    fig.savefig(bio, format="pdf", **opts)
+    plt.close(fig)
+    return bio.getvalue()
+
+def _merge_pages(pages):
+    from pypdf import PdfWriter, PdfReader
+    writer = PdfWriter()
+    for page in pages:
+        writer.append(PdfReader(BytesIO(page)))
+    bio = BytesIO()
+    writer.write(bio)
+    return bio.getvalue()
+
+def weekly_pages(placed, courses, days, rooms, time_labels, views=WEEKLY_VIEWS):
+    """Haftalık görünüm sayfaları: [(görünüm, anahtar, satırlar)]; tek ters dizinden.
+
+    Oda görünümü rooms sırasıyla, hoca ve sınıf görünümleri ada göre sıralanır.
+    """
+    index = weekly_index(placed, courses)
+    order = {"Oda": [r["id"] for r in rooms]}
+    return [(view, key, weekly_rows(index[view].get(key, {}), len(days), time_labels))
+            for view in views for key in order.get(view) or sorted(index[view])]
+
+def timetable_to_pdf(grid, days, rooms, time_labels, pdf_path=None, fast=None, workers=None,
+                     placed=None, courses=None, views=()):
+    """Gün başına bir sayfa; PDF'i bellekte üretir ve bayt olarak döndürür.
+
+    pdf_path verilirse ayrıca dosyaya yazar. fast=None iken oda sayısı
+    FAST_PDF_ROOMS ve üzeriyse hızlı ızgara çizimi kullanılır. workers > 1
+    iken sayfalar süreç havuzunda paralel çizilir ve sırasıyla birleştirilir;
+    workers=None iken çizim seri yapılır, sayfa sayısı PARALLEL_PDF_PAGES ve
+    üzeriyse çekirdek sayısı kadar süreç kullanılır (havuz açılışı küçük
+    PDF'lerde çizimden pahalıdır).
+    placed/courses ile views (ör. ["Hoca", "Sınıf"]) verilirse gün
+    sayfalarından sonra her hoca/sınıf/oda için haftalık sayfa eklenir.
+    """
+    if fast is None:
+        fast = len(rooms) >= FAST_PDF_ROOMS
+    cols = ["Saat"] + [r["id"] for r in rooms] + ["ONLINE"]
+    jobs = [(f"{d} - Ders Programı", cols,
+             [[saat] + list(cells) for saat, cells in day_rows(grid, di, time_labels)], fast)
+            for di, d in enumerate(days)]
+    if views and placed is not None and courses is not None:
+        pages = weekly_pages(placed, courses, days, rooms, time_labels, views)
+        fast_weekly = fast or len(pages) >= FAST_PDF_PAGES
+        jobs += [(f"{view}: {key} - Haftalık Program", ["Saat"] + list(days),
+                  [[saat] + list(cells) for saat, cells in rows], fast_weekly)
+                 for view, key, rows in pages]
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(jobs) >= PARALLEL_PDF_PAGES else 1
+    workers = min(len(jobs), workers)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            data = _merge_pages(ex.map(_render_page, jobs))
+    else:
+        bio = BytesIO()
+        reuse = None
+        with PdfPages(bio) as pdf:
+            for job in jobs:
+                if job[3]:
+                    reuse, opts = _grid_page(*job[:3], fig=reuse)
+                    pdf.savefig(reuse, **opts)
+                else:
+                    fig, opts = _table_page(*job[:3])
+                    pdf.savefig(fig, **opts)
+                    plt.close(fig)
+            if reuse is not None:
+                plt.close(reuse)
+        data = bio.getvalue()
+
+    if pdf_path:
+        with open(pdf_path, "wb") as f:
+            f.write(data)
+    return data
+
+# ====================== Excel Üretimi (gün başına ayrı sayfa) ======================
+
+_SHEET_BAD = str.maketrans({ch: "-" for ch in "[]:*?/\\"})
+
+def _sheet_title(name, used):
+    """Excel'e uygun, benzersiz sayfa adı (en fazla 31 karakter)."""
+    base = str(name).translate(_SHEET_BAD)[:31] or "-"
+    title, n = base, 1
+    while title.lower() in used:
+        n += 1
+        suffix = f"~{n}"
+        title = base[:31-len(suffix)] + suffix
+    used.add(title.lower())
+    return title
+
+def timetable_to_excel_bytes(grid, days, rooms, time_labels, placed=None, courses=None, views=WEEKLY_VIEWS):
+    """Gün başına bir sayfa; placed/courses verilirse oda, hoca ve sınıf
+    başına haftalık sayfalar da eklenir.
+
+    Yalnızca-yazma (write_only) çalışma kitabı kullanılır: satırlar bir kez,
+    paylaşılan adlandırılmış stillerle yazılır; sütun genişlikleri ve satır
+    yükseklikleri satırlardan önce ayarlanır.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, NamedStyle
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    wb.add_named_style(NamedStyle("ders_baslik", font=Font(bold=True)))
+    wb.add_named_style(NamedStyle("ders_hucre", alignment=Alignment(wrap_text=True, vertical="top")))
+    used = set()
+
+    def write_sheet(title, headers, rows, width):
+        ws = wb.create_sheet(title=_sheet_title(title, used))
+        ws.column_dimensions["A"].width = 10
+        for idx in range(2, len(headers)+1):
+            ws.column_dimensions[get_column_letter(idx)].width = width
+        ws.freeze_panes = "B2"
+
+        def styled(v, style):
+            cell = WriteOnlyCell(ws, value=v)
+            cell.style = style
+            return cell
+
+        ws.append([styled(h, "ders_baslik") for h in headers])
+        for rr, (saat, cells) in enumerate(rows, start=2):
+            texts = ["" if v.strip() == EMPTY else v.replace(" / ", "\n") for v in cells]
+            lines = max([t.count("\n")+1 for t in texts if t] or [1])
+            ws.row_dimensions[rr].height = max(30, 13*lines)
+            ws.append([styled(saat, "ders_hucre")] + [styled(t, "ders_hucre") if t else None for t in texts])
+
+    room_ids = [r["id"] for r in rooms]
+    for di, d in enumerate(days):
+        write_sheet(d, ["Saat"] + room_ids + ["ONLINE"], day_rows(grid, di, time_labels), 45)
+
+    if placed is not None and courses is not None:
+        for view, key, rows in weekly_pages(placed, courses, days, rooms, time_labels, views):
+            write_sheet(f"{view}-{key}", ["Saat"] + list(days), rows, 40)
+
+    bio = BytesIO()
+    wb.save(bio)
+    bio.seek(0)
+    return bio
@@ -0,0 +1,204 @@
+# ders_programi/faculty.py
+"""Çok bölümlü planlama: ortak odaları paylaşan bölüm durumları.
+
+Her bölüm kendi durumuyla (hocalar, sınıflar, kısıtlar) planlanır; aynı oda
+ID'si birden fazla bölümde geçiyorsa o oda ortaktır. İki aşama:
+
+1) Bölümleme + paralel çözüm: her ortak oda, o odayı listeleyen bölümlerden
+   yüz yüze talebi (saat) ile şimdiye kadar verilen oda kapasitesi arasındaki
+   açığı en büyük olana verilir. Her bölüm yalnızca kendi odaları + payına
+   düşen ortak odalarla süreç havuzunda çözülür; bölümler ayrık oda
+   kümeleri kullandığından çakışma olmaz (tam arama/onarım da kullanılabilir).
+   PIN'li yüz yüze dersler önceden ayrılır: bölüm PIN'lediği odayı payı
+   dışında olsa da alır (odanın PIN dışı slotları ona kapalıdır), diğer
+   bölümlere o PIN slotları rezervasyon olarak verilir.
+2) Uzlaştırma: yerleşemeyen dersi ya da geçersiz PIN'i olan bölümler (en çok
+   yerleşemeyenden başlayarak) sırayla, tüm odalarıyla yeniden çözülür.
+   Mevcut yerleşimler korunur (keep=...; PIN'ler her zaman önce uygulanır) ve
+   diğer bölümlerin o anki oda kullanımları rezervasyon olarak verilir
+   (reserved=...); böylece boş kalan ortak oda slotları çakışmasız kullanılır.
+
+Bütün bölümlerin takvimi (gün listesi ve günlük slot sayısı) aynı olmalıdır.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .grid import build_grid, course_label, grid_to_frame
+from .model import DEFAULT_STRATEGY
+from .solver import solve_state
+
+def _solve_department(args):
+    state, options = args
+    return solve_state(state, **options)
+
+def _window_slots(state):
+    """Gün pencereleri içindeki slot sayısı (tüm günler)."""
+    spd = state["slots_per_day"]
+    total = 0
+    for d in range(len(state["days"])):
+        start = int(state["day_start_slot"].get(d, 0))
+        total += max(0, min(spd, start + int(state["day_use_slots"].get(d, spd))) - start)
+    return total
+
+def _check_names(departments):
+    """Bölüm adları sonuç anahtarıdır; tekrar eden ad sonuçları ezer."""
+    seen = set()
+    for name, _ in departments:
+        if name in seen:
+            raise ValueError(f"{name}: bölüm adı birden fazla kez geçiyor")
+        seen.add(name)
+
+def partition_rooms(departments):
+    """{bölüm: [oda id]} — her bölümün 1. aşamada kullanacağı odalar."""
+    _check_names(departments)
+    owners = {}
+    for name, state in departments:
+        for r in state["rooms"]:
+            owners.setdefault(r["id"], []).append(name)
+    states = dict(departments)
+    window = {name: _window_slots(s) for name, s in departments}
+    demand = {name: sum(int(c["sure"]) for c in s["courses"] if not c["online"]) for name, s in departments}
+    given = {name: 0 for name in states}
+    share = {name: [] for name in states}
+    # Önce özel odalar, sonra ortak odalar (en az paylaşılandan başlayarak)
+    for rid, names in sorted(owners.items(), key=lambda kv: len(kv[1])):
+        name = max(names, key=lambda n: (demand[n] - given[n], -names.index(n)))
+        share[name].append(rid)
+        given[name] += window[name] * int(states[name]["constraint_settings"]["max_per_room"])
+    return share
+
+def _pin_cells(state):
+    """Bölümün yüz yüze PIN'leri: [(oda, gün, başlangıç, süre)]."""
+    by_id = {c["id"]: c for c in state["courses"]}
+    out = []
+    for p in state["pins"]:
+        c = by_id.get(str(p.get("id", "")).strip())
+        if c is None or c["online"] or p.get("channel", "FaceToFace") == "Online" or not p.get("room"):
+            continue
+        out.append((p["room"], int(p.get("day", 0)), int(p.get("start", 0)), int(c["sure"])))
+    return out
+
+def _pin_reservations(name, state, share, pins_by_dept):
+    """1. aşama: diğer bölümlerin PIN slotları + payı dışındaki PIN odalarının PIN dışı slotları."""
+    out = [cell for other, cells in pins_by_dept.items() if other != name for cell in cells]
+    own = pins_by_dept[name]
+    cap = int(state["constraint_settings"]["max_per_room"])
+    for rm in {cell[0] for cell in own} - set(share):
+        mine = {(d, s) for r, d, start, L in own if r == rm for s in range(start, start + L)}
+        out += [(rm, d, s, 1) for d in range(len(state["days"])) for s in range(state["slots_per_day"])
+                if (d, s) not in mine] * cap
+    return out
+
+def _room_reservations(name, placed_by_dept, departments):
+    """Diğer bölümlerin oda kullanımları: [(oda, gün, başlangıç, süre)]."""
+    out = []
+    for other, state in departments:
+        if other == name:
+            continue
+        for ci, d, start, ch, rm, L in placed_by_dept[other]:
+            if ch != "Online":
+                out.append((rm, d, start, L))
+    return out
+
+def solve_departments(departments, workers=None, **options):
+    """departments: [(ad, normalize edilmiş durum)].
+
+    {ad: solve_state sonucu} ve bilgi dict'i döndürür. options her bölümün
+    1. aşama çözümüne aynen geçer.
+    """
+    if not departments:
+        return {}, {}
+    days, spd = departments[0][1]["days"], departments[0][1]["slots_per_day"]
+    for name, state in departments:
+        if state["days"] != days or state["slots_per_day"] != spd:
+            raise ValueError(f"{name}: gün listesi/slot sayısı diğer bölümlerle aynı değil")
+
+    share = partition_rooms(departments)
+    pins_by_dept = {name: _pin_cells(state) for name, state in departments}
+    jobs = []
+    for name, state in departments:
+        mine = set(share[name]) | {cell[0] for cell in pins_by_dept[name]}
+        reserved = _pin_reservations(name, state, share[name], pins_by_dept)
+        jobs.append((dict(state, rooms=[r for r in state["rooms"] if r["id"] in mine]),
+                     dict(options, reserved=reserved) if reserved else options))
+    workers = min(len(jobs), workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            phase1 = list(ex.map(_solve_department, jobs))
+    else:
+        phase1 = [_solve_department(j) for j in jobs]
+
+    results = {name: res for (name, _), res in zip(departments, phase1)}
+    placed_by_dept = {name: res[2] for name, res in results.items()}
+    n_unplaced = lambda res: len({ci for ci, _ in res[3]} - {p[0] for p in res[2]})
+    bad_pins = lambda res: sum(reason.startswith("PIN") for _, reason in res[3])
+    info = {"paylar": share, "ilk_asama": {name: n_unplaced(res) for name, res in results.items()},
+            "uzlastirilan": {}}
+
+    # Uzlaştırma: sırayla, tüm odalar + diğer bölümlerin rezervasyonları
+    states = dict(departments)
+    order = sorted((name for name, _ in departments), key=lambda n: -info["ilk_asama"][n])
+    for name in order:
+        if info["ilk_asama"][name] == 0 and not bad_pins(results[name]):
+            continue
+        state = states[name]
+        strategy = state["strategy"] if not state["strategy"].startswith("Tam") else DEFAULT_STRATEGY
+        res = solve_state(state, strategy=strategy, keep=placed_by_dept[name],
+                          reserved=_room_reservations(name, placed_by_dept, departments),
+                          engine=options.get("engine", "bitset"))
+        info["uzlastirilan"][name] = info["ilk_asama"][name] - n_unplaced(res)
+        results[name] = res
+        placed_by_dept[name] = res[2]
+
+    # 1. aşamada kalan sonuçların tablolarını bölümün tüm odalarıyla yeniden kur
+    for name, state in departments:
+        if name not in info["uzlastirilan"]:
+            timetable_df, diag_df, placed, unplaced, _ = results[name]
+            grid = build_grid(placed, state["courses"], len(days), spd, state["rooms"])
+            results[name] = (grid_to_frame(grid, days, state["rooms"], state["time_labels"]),
+                             diag_df, placed, unplaced, grid)
+    return results, info
+
+def room_usage_frame(departments, results):
+    """Birleşik oda kullanımı (uzun biçim): Gün, Saat, Oda, Bölüm, Ders."""
+    rows = []
+    for name, state in departments:
+        courses, labels = state["courses"], state["time_labels"]
+        for ci, d, start, ch, rm, L in results[name][2]:
+            if ch == "Online":
+                continue
+            c = courses[ci]
+            for s in range(start, start + L):
+                rows.append([state["days"][d], d, s, labels.get(s, str(s+1)), rm, name, course_label(c)])
+    df = pd.DataFrame(rows, columns=["Gün", "_d", "_s", "Saat", "Oda", "Bölüm", "Ders"])
+    return df.sort_values(["Oda", "_d", "_s", "Bölüm"]).drop(columns=["_d", "_s"]).reset_index(drop=True)
+
+def room_utilization(departments, results):
+    """Oda başına doluluk özeti: bölümlere göre dolu slot ve pencere içi oran.
+
+    Toplam slot, odayı listeleyen bölümlerin en geniş gün penceresi × max_per_room'dur.
+    """
+    usage = {}
+    for name, state in departments:
+        for ci, d, start, ch, rm, L in results[name][2]:
+            if ch != "Online":
+                per = usage.setdefault(rm, {})
+                per[name] = per.get(name, 0) + L
+    owners = {}
+    for name, state in departments:
+        for r in state["rooms"]:
+            owners.setdefault(r["id"], []).append(name)
+    states = dict(departments)
+    rows = []
+    for rid, names in owners.items():
+        n_slots = max(_window_slots(states[n]) * int(states[n]["constraint_settings"]["max_per_room"])
+                      for n in names)
+        per = usage.get(rid, {})
+        used = sum(per.values())
+        rows.append({"Oda": rid, "Bölümler": ", ".join(names), "Ortak": len(names) > 1,
+                     "Dolu slot": used, "Toplam slot": n_slots,
+                     "Doluluk (%)": round(100 * used / n_slots, 1) if n_slots else 0.0,
+                     **{f"{name} (slot)": per.get(name, 0) for name, _ in departments}})
+    return pd.DataFrame(rows)
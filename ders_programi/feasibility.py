@@ -0,0 +1,131 @@
+# ders_programi/feasibility.py
+"""Çözüm öncesi hızlı olabilirlik kontrolleri ve alt sınır.
+
+Yalnızca sayım yapılır (ders başına O(1), hoca başına bir maske); büyük
+kataloglarda milisaniyeler sürer. Kontroller:
+- ders: süresi hiçbir gün penceresine sığmayan, hocasının uygun
+  slotlarında hiç başlangıcı olmayan ya da öğrenci sayısına/istediği
+  özelliklere uyan odası olmayan yüz yüze dersler (kesin yerleşemez);
+  bölünebilen (ardisik=False) dersler için tek blok yerine hocanın gün
+  başına boş slotları (günde tek oturum kuralında en uzun boş aralığı)
+  toplamına bakılır;
+- hoca: toplam ders saati > gün pencereleri içindeki uygun slot sayısı;
+- sınıf: sınıf (1–4) toplam saati > pencere kapasitesi;
+- yüz yüze: toplam saat > oda × pencere slotu × max_per_room;
+- online: toplam saat > online_cap × pencere slotu.
+Bir grupta E saat fazlalık varsa en az, en uzun derslerden toplamı E'ye
+ulaşan sayıda ders yerleşemez. Hoca grupları (ve sınıf grupları) kendi
+aralarında ayrık olduğundan toplanabilir; alt sınır kesin yerleşemeyenler +
+kalan dersler için grup türlerinin en büyüğüdür.
+"""
+import time
+
+from .occupancy import AvailabilityIndex, room_masks
+
+def _min_drops(durations, excess):
+    """Toplam süresi excess'e ulaşan en az ders sayısı."""
+    n = total = 0
+    for L in sorted(durations, reverse=True):
+        if total >= excess:
+            break
+        total += L
+        n += 1
+    return n
+
+def _longest_run(m):
+    n = 0
+    while m:
+        m &= m >> 1
+        n += 1
+    return n
+
+def check_feasibility(days, spd, rooms, courses, inst_unav, cs, day_start_slot, day_use_slots):
+    """(bulgular, alt_sınır, saniye) döndür.
+
+    bulgular: [{"tur", "kapsam", "talep", "kapasite", "en_az_yerlesemeyen", "mesaj", "dersler"}]
+    alt_sınır: her durumda yerleşemeyecek en az ders sayısı.
+    """
+    t0 = time.perf_counter()
+    n_days = len(days)
+    avail = AvailabilityIndex(n_days, spd, inst_unav, day_start_slot, day_use_slots)
+    win_lens = [m.bit_count() for m in avail.window_masks]
+    win_total, win_max = sum(win_lens), max(win_lens, default=0)
+    findings = []
+
+    def add(tur, kapsam, talep, kapasite, drops, mesaj, ids):
+        findings.append({"tur": tur, "kapsam": kapsam, "talep": talep, "kapasite": kapasite,
+                         "en_az_yerlesemeyen": drops, "mesaj": mesaj, "dersler": ids})
+
+    # ---- Ders bazında kesin imkânsızlar ----
+    impossible = set()
+    fits = room_masks(rooms, courses)
+    split_on = bool(cs.get("split_sessions", True))
+    one_per_day = bool(cs.get("split_one_per_day", True))
+    for ci, c in enumerate(courses):
+        L = int(c["sure"])
+        if split_on and not c["ardisik"] and L > 1:
+            free = avail.free_masks(c["hoca"])
+            cap = sum(_longest_run(m) if one_per_day else m.bit_count() for m in free)
+            if cap < L:
+                impossible.add(ci)
+                add("ders", c["id"], L, cap, 1,
+                    f"{c['id']}: bölünse de {c['hoca']} için {L} saatlik boş slot yok ({cap})", [c["id"]])
+                continue
+        elif L <= 0 or L > win_max:
+            impossible.add(ci)
+            add("ders", c["id"], L, win_max, 1,
+                f"{c['id']}: süre {L} saat, en uzun gün penceresi {win_max} slot", [c["id"]])
+            continue
+        elif avail.count_feasible_starts(c["hoca"], L) == 0:
+            impossible.add(ci)
+            add("ders", c["id"], L, 0, 1,
+                f"{c['id']}: {c['hoca']} için {L} saatlik boş pencere yok", [c["id"]])
+            continue
+        if not c["online"] and rooms and not fits[ci]:
+            impossible.add(ci)
+            need = ", ".join(c.get("features") or []) or "-"
+            add("ders", c["id"], int(c.get("enrollment") or 0), 0, 1,
+                f"{c['id']}: {c.get('enrollment') or 0} öğrenci / özellik ({need}) için uygun oda yok", [c["id"]])
+
+    # ---- Grup kapasiteleri (kalan dersler) ----
+    by_inst, by_class, f2f, online = {}, {}, [], []
+    for ci, c in enumerate(courses):
+        if ci in impossible:
+            continue
+        by_inst.setdefault(c["hoca"], []).append(ci)
+        by_class.setdefault(c["sinif"], []).append(ci)
+        (online if c["online"] else f2f).append(ci)
+
+    def group(tur, kapsam, members, capacity, mesaj):
+        durations = [int(courses[ci]["sure"]) for ci in members]
+        demand = sum(durations)
+        if demand <= capacity:
+            return 0
+        drops = _min_drops(durations, demand - capacity)
+        add(tur, kapsam, demand, capacity, drops,
+            f"{mesaj}: {demand} saat talep, {capacity} slot kapasite (en az {drops} ders yerleşemez)",
+            [courses[ci]["id"] for ci in members])
+        return drops
+
+    lb_inst = lb_class = lb_f2f = lb_online = 0
+    if cs["enf_instructor_no_overlap"]:
+        for h, members in by_inst.items():
+            cap = sum(m.bit_count() for m in avail.free_masks(h))
+            lb_inst += group("hoca", h, members, cap, f"Hoca {h}")
+    if cs["enf_class_no_overlap"]:
+        for sinif, members in sorted(by_class.items()):
+            lb_class += group("sınıf", f"S{sinif}", members, win_total, f"Sınıf {sinif}")
+    lb_f2f = group("yüz yüze", "Odalar", f2f, len(rooms) * win_total * int(cs["max_per_room"]),
+                   f"Yüz yüze ({len(rooms)} oda × {win_total} slot × {int(cs['max_per_room'])})")
+    lb_online = group("online", "ONLINE", online, int(cs["online_cap"]) * win_total,
+                      f"Online ({int(cs['online_cap'])} × {win_total} slot)")
+
+    lower_bound = len(impossible) + max(lb_inst, lb_class, lb_f2f, lb_online)
+    return findings, lower_bound, time.perf_counter() - t0
+
+def check_state(state):
+    """Normalize edilmiş bir durum için check_feasibility."""
+    return check_feasibility(
+        state["days"], state["slots_per_day"], state["rooms"], state["courses"],
+        state["instructor_unavailable"], state["constraint_settings"],
+        state["day_start_slot"], state["day_use_slots"])
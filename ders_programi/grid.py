@@ -0,0 +1,97 @@
+# ders_programi/grid.py
+"""(gün, slot, kolon) dizinli program ızgarası.
+
+grid[d][s] bir listedir: ilk len(rooms) eleman odalar (rooms sırasıyla),
+son eleman ONLINE kanalıdır. Boş hücre "-" ile gösterilir. Görüntüleyici
+ve dışa aktarıcılar hücreleri doğrudan buradan okur; timetable_df de
+bu ızgaradan üretilir.
+"""
+import pandas as pd
+
+EMPTY = "-"
+
+def course_label(c):
+    return f"{c['id']} | {c['ad']} | {c['hoca']} | S{c['sinif']}"
+
+def build_grid(placed, courses, n_days, spd, rooms):
+    n_rooms = len(rooms)
+    col_of = {r["id"]: ri for ri, r in enumerate(rooms)}
+    cells = [[[None]*(n_rooms+1) for _ in range(spd)] for __ in range(n_days)]
+    for ci, d, start, ch, rm, L in placed:
+        col = n_rooms if ch == "Online" else col_of[rm]
+        label = course_label(courses[ci])
+        for s in range(start, start+L):
+            cur = cells[d][s][col]
+            if cur is None:
+                cells[d][s][col] = [label]
+            else:
+                cur.append(label)
+    return [[[EMPTY if v is None else " / ".join(v) for v in row] for row in day] for day in cells]
+
+def _display_cell(cell):
+    if not isinstance(cell, str) or cell.strip() == EMPTY or cell.strip() == "":
+        return ""
+    parts = [p.strip() for p in cell.split("/") if p.strip()]
+    return "\n".join(parts)
+
+def day_table(grid, d, rooms, time_labels):
+    """Bir günün ekranda gösterilen tablosu (Saat + odalar + ONLINE)."""
+    cols = ["Saat"] + [r["id"] for r in rooms] + ["ONLINE"]
+    rows = [[saat] + [_display_cell(v) for v in cells] for saat, cells in day_rows(grid, d, time_labels)]
+    return pd.DataFrame(rows, columns=cols)
+
+WEEKLY_VIEWS = ["Oda", "Hoca", "Sınıf"]
+
+def weekly_index(placed, courses):
+    """Tek geçişte ters dizin: görünüm -> anahtar -> {(gün, slot): [hücre metni]}.
+
+    Oda görünümünde yalnızca yüz yüze dersler bulunur; hoca ve sınıf
+    görünümlerinde hücre metnine oda (ya da ONLINE) eklenir.
+    """
+    index = {v: {} for v in WEEKLY_VIEWS}
+    for ci, d, start, ch, rm, L in placed:
+        c = courses[ci]
+        label = course_label(c)
+        where = f"{label} @ {rm}"
+        targets = [(index["Hoca"].setdefault(c["hoca"], {}), where),
+                   (index["Sınıf"].setdefault(f"S{c['sinif']}", {}), where)]
+        if ch != "Online":
+            targets.append((index["Oda"].setdefault(rm, {}), label))
+        for s in range(start, start+L):
+            for cells, text in targets:
+                cells.setdefault((d, s), []).append(text)
+    return index
+
+def weekly_rows(cells, n_days, time_labels):
+    """Haftalık görünümün satırları: (saat etiketi, gün başına hücreler)."""
+    max_slot_index = max(time_labels.keys()) if time_labels else 0
+    return [(time_labels.get(s, f"{s+1}. Slot"),
+             [" / ".join(cells[(d, s)]) if (d, s) in cells else EMPTY for d in range(n_days)])
+            for s in range(max_slot_index + 1)]
+
+def weekly_table(cells, days, time_labels):
+    """Bir hoca/sınıf/odanın ekranda gösterilen haftalık tablosu (Saat + günler)."""
+    rows = [[saat] + [_display_cell(v) for v in row] for saat, row in weekly_rows(cells, len(days), time_labels)]
+    return pd.DataFrame(rows, columns=["Saat"] + list(days))
+
+def grid_to_frame(grid, days, rooms, time_labels):
+    """Uzun biçimli timetable_df (Day, Slot, Channel, Room, Courses)."""
+    cols = [("FaceToFace", r["id"]) for r in rooms] + [("Online", "ONLINE")]
+    rows = []
+    for d, day in enumerate(grid):
+        for s, row in enumerate(day):
+            saat = time_labels.get(s, str(s+1))
+            for (ch, rm), txt in zip(cols, row):
+                rows.append([days[d], saat, ch, rm, txt])
+    return pd.DataFrame(rows, columns=["Day","Slot","Channel","Room","Courses"])
+
+def day_rows(grid, d, time_labels):
+    """Bir günün satırları: (saat etiketi, hücreler). Slot sayısı etiketlerden gelir."""
+    max_slot_index = max(time_labels.keys()) if time_labels else 0
+    day = grid[d]
+    n_cols = len(day[0]) if day else 0
+    out = []
+    for s in range(max_slot_index + 1):
+        saat = time_labels.get(s, f"{s+1}. Slot")
+        out.append((saat, day[s] if s < len(day) else [EMPTY]*n_cols))
+    return out
@@ -0,0 +1,159 @@
+# ders_programi/importer.py
+"""Ders içe aktarma: sütun bazlı doğrulama, parça parça okuma, tek geçişte upsert.
+
+CSV dosyaları CHUNK_ROWS satırlık parçalar halinde okunur (Excel tek
+seferde okunup aynı boyutta parçalara bölünür). Her parça satır satır değil
+sütun sütun doğrulanır ve dönüştürülür; hatalı satırlar içe aktarmayı
+durdurmaz, hata raporuna (satır numarası, kolon, değer, açıklama) yazılır
+ve atlanır. Kontroller:
+- ID / hoca boş olmamalı;
+- sinif 1–4 arası, sure pozitif tam sayı; enrollment (varsa) negatif olmayan
+  tam sayı;
+- yinelenen ID (dosyada ilk geçen kalır);
+- bilinmeyen hoca (geçerli satırlarda): allow_new_instructors ise hoca
+  listesine eklenir (hoca başına bir uyarı), değilse satır reddedilir.
+Geçerli dersler mevcut listeye ID -> konum dizini üzerinden tek geçişte
+eklenir / güncellenir.
+"""
+import pandas as pd
+
+from .model import REQUIRED_COURSE_COLS, TRUE_STRINGS, _to_features
+
+CHUNK_ROWS = 5000
+SINIF_MIN, SINIF_MAX = 1, 4
+REPORT_COLS = ["Satır", "Düzey", "ID", "Kolon", "Değer", "Hata"]
+
+def read_course_chunks(source, name, chunksize=CHUNK_ROWS):
+    """Dosyayı (yol ya da dosya nesnesi) metin sütunlu DataFrame parçaları olarak oku."""
+    if str(name).lower().endswith(".csv"):
+        yield from pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunksize)
+    else:
+        df = pd.read_excel(source, sheet_name=0, dtype=str)
+        for i in range(0, max(len(df), 1), chunksize):
+            yield df.iloc[i:i+chunksize]
+
+def _text(df, col):
+    if col not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[col].fillna("").astype(str).str.strip()
+
+def _whole(values, lo, hi=None):
+    """Sayıya çevrilebilen, tam ve [lo, hi] aralığındaki değerler (maske, sayılar)."""
+    num = pd.to_numeric(values, errors="coerce")
+    ok = num.notna() & (num % 1 == 0) & (num >= lo)
+    if hi is not None:
+        ok &= num <= hi
+    return ok, num
+
+def validate_chunk(df, first_line, seen, known, allow_new_instructors=True):
+    """Bir parçayı doğrula ve dönüştür: (dersler, hata raporu parçaları, yeni hocalar).
+
+    first_line: parçanın ilk satırının dosyadaki satır numarası (başlık 1. satır).
+    seen: {ID: ilk satır} — parçalar arasında yinelenenleri bulmak için güncellenir.
+    known: bilinen hocalar kümesi — yeni eklenen hocalarla güncellenir.
+    """
+    df = df.rename(columns=lambda c: str(c).strip().lower()).reset_index(drop=True)
+    lines = pd.Series(range(first_line, first_line + len(df)))
+    ids, hoca = _text(df, "id"), _text(df, "hoca")
+    report = []
+    bad = pd.Series(False, index=df.index)
+
+    def flag(mask, kolon, values, hata, duzey="hata"):
+        nonlocal bad
+        if mask.any():
+            report.append(pd.DataFrame({"Satır": lines[mask], "Düzey": duzey, "ID": ids[mask],
+                                        "Kolon": kolon, "Değer": values[mask], "Hata": hata}))
+            if duzey == "hata":
+                bad |= mask
+
+    flag(ids == "", "id", ids, "ID boş")
+    flag(hoca == "", "hoca", hoca, "hoca boş")
+    sinif_raw, sure_raw = _text(df, "sinif"), _text(df, "sure")
+    sinif_ok, sinif = _whole(sinif_raw, SINIF_MIN, SINIF_MAX)
+    flag(~sinif_ok, "sinif", sinif_raw, f"sınıf {SINIF_MIN}–{SINIF_MAX} arası tam sayı olmalı")
+    sure_ok, sure = _whole(sure_raw, 1)
+    flag(~sure_ok, "sure", sure_raw, "süre pozitif tam sayı olmalı")
+    enr_raw = _text(df, "enrollment")
+    enr_ok, enrollment = _whole(enr_raw, 0)
+    flag(~enr_ok & (enr_raw != ""), "enrollment", enr_raw, "öğrenci sayısı negatif olmayan tam sayı olmalı")
+
+    # Yinelenen ID: dosyada (önceki parçalar dahil) ilk geçen satır kalır
+    named = ids != ""
+    first = ids.map(seen).astype("Int64")
+    first = first.fillna(lines.groupby(ids).transform("first").astype("Int64"))
+    dup = named & (first != lines)
+    if dup.any():
+        report.append(pd.DataFrame({"Satır": lines[dup], "Düzey": "hata", "ID": ids[dup], "Kolon": "id",
+                                    "Değer": ids[dup], "Hata": "yinelenen ID (ilk: satır " + first[dup].astype(str) + ")"}))
+        bad |= dup
+    seen.update(zip(ids[named & ~dup], lines[named & ~dup]))
+
+    # Bilinmeyen hocalar
+    unknown = (hoca != "") & ~bad & ~hoca.isin(known)
+    new_instructors = []
+    if unknown.any():
+        if allow_new_instructors:
+            firsts = unknown & ~hoca.where(unknown).duplicated()
+            flag(firsts, "hoca", hoca, "yeni hoca, listeye eklendi", duzey="uyarı")
+            new_instructors = hoca[firsts].tolist()
+            known.update(new_instructors)
+        else:
+            flag(unknown, "hoca", hoca, "bilinmeyen hoca")
+
+    ok = ~bad
+    flags = {k: _text(df, k).str.lower().isin(TRUE_STRINGS) for k in ("ardisik", "online")}
+    features = df["features"][ok].map(_to_features) if "features" in df.columns else [[] for _ in range(int(ok.sum()))]
+    courses = [{"id": i, "ad": a, "hoca": h, "sinif": int(sn), "sure": int(su), "ardisik": bool(ar),
+                "online": bool(on), "enrollment": int(en) if en == en else 0, "features": fe}
+               for i, a, h, sn, su, ar, on, en, fe in zip(
+                   ids[ok], _text(df, "ad")[ok], hoca[ok], sinif[ok], sure[ok],
+                   flags["ardisik"][ok], flags["online"][ok], enrollment[ok], features)]
+    return courses, report, new_instructors
+
+def upsert_courses(existing, new, replace_all=False, update_existing=True):
+    """ID -> konum dizini ile tek geçişte ekle/güncelle: (dersler, eklenen, güncellenen, atlanan)."""
+    if replace_all:
+        return list(new), len(new), 0, 0
+    out = list(existing)
+    index = {c["id"]: i for i, c in enumerate(out)}
+    added = updated = skipped = 0
+    for c in new:
+        i = index.get(c["id"])
+        if i is None:
+            index[c["id"]] = len(out)
+            out.append(c)
+            added += 1
+        elif update_existing:
+            out[i] = {**out[i], **c}
+            updated += 1
+        else:
+            skipped += 1
+    return out, added, updated, skipped
+
+def import_courses(source, name, existing, instructors, replace_all=False, update_existing=True,
+                   allow_new_instructors=True, chunksize=CHUNK_ROWS):
+    """Dosyayı oku, doğrula ve mevcut derslerle birleştir.
+
+    {"courses", "new_instructors", "report" (DataFrame), "read", "valid",
+    "rejected", "added", "updated", "skipped"} döndürür. Zorunlu kolon eksikse
+    ValueError.
+    """
+    known = set(instructors)
+    seen, new, reports, new_instructors = {}, [], [], []
+    read = 0
+    for chunk in read_course_chunks(source, name, chunksize):
+        if not read:
+            missing = set(REQUIRED_COURSE_COLS) - {str(c).strip().lower() for c in chunk.columns}
+            if missing:
+                raise ValueError(f"Eksik kolon(lar): {', '.join(sorted(missing))}")
+        courses, report, added_inst = validate_chunk(chunk, read + 2, seen, known, allow_new_instructors)
+        read += len(chunk)
+        new.extend(courses)
+        reports.extend(report)
+        new_instructors.extend(added_inst)
+    report = (pd.concat(reports, ignore_index=True).sort_values(["Satır", "Düzey"], kind="stable")
+              .reset_index(drop=True) if reports else pd.DataFrame(columns=REPORT_COLS))
+    courses, added, updated, skipped = upsert_courses(existing, new, replace_all, update_existing)
+    return {"courses": courses, "new_instructors": new_instructors, "report": report,
+            "read": read, "valid": len(new), "rejected": read - len(new),
+            "added": added, "updated": updated, "skipped": skipped}
@@ -0,0 +1,118 @@
+# ders_programi/incremental.py
+"""Artımlı planlama: küçük düzenlemelerden sonra yalnızca etkilenenleri yerleştir.
+
+Önceki planın durumu ve yerleşimleri (ders ID'si ile) saklanır. Yeni durumla
+karşılaştırıldığında:
+- takvim, odalar, gün penceresi, kısıt ayarları ya da strateji değiştiyse
+  tam planlama yapılır;
+- aksi halde değişen dersler (eklenen/silinen/düzenlenen, PIN'i değişen,
+  hocasının uygunluğu değişen) hâlâ geçerliyse önceki yerinde kalır, değilse
+  yeniden yerleşir; önceki planda bunlarla etkin bir kısıt üzerinden (hoca,
+  sınıf, oda) gerçekten çakışan dersler yeniden yerleştirilir. Önceden
+  yerleşemeyenler de yeniden denenir; diğer her ders önceki yerinde kalır
+  (greedy_schedule(keep=...)).
+"""
+import copy
+
+from .solver import solve_state
+
+STRUCTURAL_KEYS = ["days", "slots_per_day", "rooms", "constraint_settings",
+                   "day_start_slot", "day_use_slots", "strategy"]
+
+def snapshot_plan(state, placed):
+    """Oturumda saklanacak plan: durum kopyası + ID'li yerleşimler."""
+    courses = state["courses"]
+    return {
+        "state": copy.deepcopy(dict(state)),
+        "placed": [(courses[ci]["id"], d, start, ch, rm, L) for ci, d, start, ch, rm, L in placed],
+    }
+
+def _pins_by_id(pins):
+    out = {}
+    for p in pins:
+        out.setdefault(str(p.get("id", "")).strip(), []).append(p)
+    return out
+
+def plan_diff(prev_state, state):
+    """(yapısal_değişiklik, değişen ders ID'leri) döndür."""
+    if any(prev_state.get(k) != state.get(k) for k in STRUCTURAL_KEYS):
+        return True, set()
+    old = {c["id"]: c for c in prev_state["courses"]}
+    new = {c["id"]: c for c in state["courses"]}
+    changed = {cid for cid in old.keys() | new.keys() if old.get(cid) != new.get(cid)}
+
+    old_pins, new_pins = _pins_by_id(prev_state["pins"]), _pins_by_id(state["pins"])
+    changed |= {cid for cid in old_pins.keys() | new_pins.keys() if old_pins.get(cid) != new_pins.get(cid)}
+
+    old_iu, new_iu = prev_state["instructor_unavailable"], state["instructor_unavailable"]
+    moved_inst = {h for h in old_iu.keys() | new_iu.keys() if set(old_iu.get(h, ())) != set(new_iu.get(h, ()))}
+    if moved_inst:
+        changed |= {cid for cid, c in (*old.items(), *new.items()) if c["hoca"] in moved_inst}
+    return False, changed
+
+def affected_ids(prev, state, changed):
+    """Değişen dersler + önceki planda onlarla gerçekten çakışanlar.
+
+    Değişen dersin önceki slotu (yeni süresiyle) boyunca aynı gündeki
+    yerleşimlere bakılır; yalnızca etkin kısıtlar sayılır: aynı hoca
+    (enf_instructor_no_overlap), aynı sınıf (enf_class_no_overlap), aynı oda
+    (max_per_room = 1). Çakışmayan aynı sınıf/hoca dersleri yerinde kalır.
+    """
+    cs = state["constraint_settings"]
+    enf_inst = bool(cs["enf_instructor_no_overlap"])
+    enf_class = bool(cs["enf_class_no_overlap"])
+    room_clash = int(cs["max_per_room"]) <= 1
+    old = {c["id"]: c for c in prev["state"]["courses"]}
+    new = {c["id"]: c for c in state["courses"]}
+    by_day = {}
+    for cid, d, start, ch, rm, L in prev["placed"]:
+        if cid in old:
+            by_day.setdefault(d, []).append((cid, start, start + L, ch, rm))
+
+    out = set(changed)
+    for cid, d, start, ch, rm, L in prev["placed"]:
+        if cid not in changed or cid not in old:
+            continue
+        versions = [c for c in (old.get(cid), new.get(cid)) if c]
+        end = start + max(L, int(versions[-1]["sure"]))
+        insts = {c["hoca"] for c in versions} if enf_inst else set()
+        classes = {c["sinif"] for c in versions} if enf_class else set()
+        for oid, o_start, o_end, o_ch, o_rm in by_day.get(d, ()):
+            if oid == cid or o_start >= end or start >= o_end:
+                continue
+            o = new.get(oid) or old[oid]
+            if (room_clash and ch != "Online" and o_ch != "Online" and o_rm == rm) \
+                    or o["hoca"] in insts or o["sinif"] in classes:
+                out.add(oid)
+    return out
+
+def incremental_schedule(state, prev, **options):
+    """Önceki plana göre artımlı çöz; (sonuç, bilgi) döndür.
+
+    Değişen dersler de önceki yerlerinde tutulmaya çalışılır (keep listesinin
+    sonunda; geçersizse greedy yeniden yerleştirir). "kept" önceki yerinde
+    kalan (tüm oturumları aynı) ders sayısıdır.
+    """
+    if prev is None:
+        return solve_state(state, **options), {"mode": "full", "reason": "önceki plan yok"}
+    structural, changed = plan_diff(prev["state"], state)
+    if structural:
+        return solve_state(state, **options), {"mode": "full", "reason": "takvim/oda/kısıt değişti"}
+
+    affected = affected_ids(prev, state, changed) - changed
+    idx_by_id = {c["id"]: i for i, c in enumerate(state["courses"])}
+    keep = [(idx_by_id[cid], d, start, ch, rm, L) for cid, d, start, ch, rm, L in prev["placed"]
+            if cid in idx_by_id and cid not in affected and cid not in changed]
+    keep += [(idx_by_id[cid], d, start, ch, rm, L) for cid, d, start, ch, rm, L in prev["placed"]
+             if cid in idx_by_id and cid in changed]
+    result = solve_state(state, keep=keep, **options)
+    wanted, got = {}, {}
+    for p in keep:
+        wanted.setdefault(p[0], []).append(p)
+    for p in result[2]:
+        if p[0] in wanted:
+            got.setdefault(p[0], []).append(p)
+    n_kept = sum(sorted(got.get(ci, ())) == sorted(sess) for ci, sess in wanted.items())
+    info = {"mode": "incremental", "changed": len(changed), "affected": len(affected),
+            "replanned": len(state["courses"]) - n_kept, "kept": n_kept}
+    return result, info
@@ -0,0 +1,162 @@
+# ders_programi/model.py
+"""Veri modeli: günler, odalar, dersler, pinler ve kısıt ayarları.
+
+Durum (state) düz bir dict'tir; anahtarları Streamlit session_state ile
+ve `timetable_state.json` şemasıyla birebir aynıdır (JSON'da ek olarak
+`_version` bulunur).
+
+Odalar {"id", "capacity", "features"}, dersler ek olarak {"enrollment",
+"features"} taşır; bu alanlar isteğe bağlıdır (0 / boş liste => sınırsız,
+özellik istemiyor), eski JSON'lar aynen yüklenir.
+"""
+import io
+from io import BytesIO
+
+import pandas as pd
+
+APP_STATE_VERSION = 4  # JSON şemasına basit sürüm etiketi
+
+DEFAULT_DAYS = ["Pzt","Sal","Çar","Per","Cum"]
+DEFAULT_STRATEGY = "Kıtlık-önce (önerilir)"
+STRATEGIES = [DEFAULT_STRATEGY, "Klasik: uzunluk-önce", "Tam arama (CSP + MRV)"]
+COURSE_COLS = ["id","ad","hoca","sinif","sure","ardisik","online","enrollment","features"]
+REQUIRED_COURSE_COLS = COURSE_COLS[:7]  # enrollment/features içe aktarmada isteğe bağlı
+STATE_KEYS = ["days","slots_per_day","time_labels","rooms","instructors","instructor_unavailable",
+              "courses","constraint_settings","day_start_slot","day_use_slots","pins","strategy","soft_settings"]
+
+def default_constraint_settings():
+    return {
+        "online_cap": 3,
+        "max_per_room": 1,
+        "enf_instructor_no_overlap": True,
+        "enf_class_no_overlap": True,
+        "split_sessions": True,        # ardisik=False dersler sığmazsa oturumlara bölünür
+        "split_one_per_day": True,     # bölünen dersin günde en fazla bir oturumu
+    }
+
+TRUE_STRINGS = {"true","1","evet","yes","y","t","e","doğru","on"}
+
+def default_soft_settings():
+    """Yumuşak kısıt puanı ağırlıkları (scoring.SOFT_TERMS) ve geç slot eşiği (0'dan slot no)."""
+    return {
+        "weights": {"instructor_gaps": 1.0, "class_gaps": 1.0, "load_imbalance": 0.5,
+                    "late_slots": 0.5, "room_changes": 0.5, "channel_switches": 1.0},
+        "late_from": 8,
+    }
+
+def normalize_soft_settings(v) -> dict:
+    out = default_soft_settings()
+    v = v or {}
+    out["weights"].update({str(k): float(w) for k, w in (v.get("weights") or {}).items()})
+    out["late_from"] = _to_int(v.get("late_from"), out["late_from"])
+    return out
+
+def _to_bool(v):
+    if isinstance(v, bool): return v
+    if v is None: return False
+    s = str(v).strip().lower()
+    return s in TRUE_STRINGS
+
+def _to_int(v, default=0):
+    try:
+        return int(float(v))
+    except (TypeError, ValueError):
+        return default
+
+def _to_features(v):
+    """Liste ya da virgüllü metin => kırpılmış özellik listesi ("lab, projeksiyon")."""
+    if isinstance(v, (list, tuple, set)):
+        items = v
+    elif v is None or (isinstance(v, float) and v != v):  # None / NaN
+        items = []
+    else:
+        items = str(v).split(",")
+    return [str(x).strip() for x in items if str(x).strip()]
+
+def normalize_room(r) -> dict:
+    return {"id": str(r.get("id", "")).strip(), "capacity": max(0, _to_int(r.get("capacity"))),
+            "features": _to_features(r.get("features"))}
+
+def normalize_state(data: dict) -> dict:
+    """JSON'dan alınan dict'i tipleri düzeltilmiş bir duruma çevir."""
+    # Zorunlu alanlar için varsayılanlar
+    days = data.get("days", DEFAULT_DAYS)
+    spd = int(data.get("slots_per_day", 10))
+    state = {}
+    state["days"] = [str(d) for d in days]
+    state["slots_per_day"] = spd
+    state["time_labels"] = {int(k): str(v) for k, v in data.get("time_labels", {}).items()} or {
+        i: f"{9+i:02d}:00" for i in range(spd)
+    }
+    state["rooms"] = [normalize_room(r) for r in data.get("rooms", [{"id":"Oda-1"},{"id":"Oda-2"}])]
+    state["instructors"] = list(data.get("instructors", []))
+    # Hoca uygunlukları set(tuple) olarak geri yükle
+    iu = {}
+    for h, slots in data.get("instructor_unavailable", {}).items():
+        try:
+            iu[h] = set((int(d), int(s)) for d, s in slots)
+        except Exception:
+            iu[h] = set()
+    state["instructor_unavailable"] = iu
+    # Kurslar
+    state["courses"] = []
+    for c in data.get("courses", []):
+        state["courses"].append({
+            "id": str(c.get("id","")).strip(),
+            "ad": str(c.get("ad","")).strip(),
+            "hoca": str(c.get("hoca","")).strip(),
+            "sinif": int(c.get("sinif",1)),
+            "sure": int(c.get("sure",1)),
+            "ardisik": bool(c.get("ardisik", False)),
+            "online": bool(c.get("online", False)),
+            "enrollment": max(0, _to_int(c.get("enrollment"))),
+            "features": _to_features(c.get("features")),
+        })
+    # Kısıtlar & gün penceresi & pinler
+    state["constraint_settings"] = data.get("constraint_settings", default_constraint_settings())
+    dcount = len(state["days"])
+    state["day_start_slot"] = {int(k): int(v) for k, v in data.get("day_start_slot", {i:0 for i in range(dcount)}).items()}
+    state["day_use_slots"]  = {int(k): int(v) for k, v in data.get("day_use_slots",  {i:spd for i in range(dcount)}).items()}
+    state["pins"] = list(data.get("pins", []))
+    state["strategy"] = str(data.get("strategy", DEFAULT_STRATEGY))
+    state["soft_settings"] = normalize_soft_settings(data.get("soft_settings"))
+    return state
+
+def state_to_payload(state) -> dict:
+    """Durumu JSON'a uygun bir dict olarak çıkar (set'ler listeye döner)."""
+    return {
+        "_version": APP_STATE_VERSION,
+        "days": state["days"],
+        "slots_per_day": state["slots_per_day"],
+        "time_labels": state["time_labels"],
+        "rooms": state["rooms"],
+        "instructors": state["instructors"],
+        "instructor_unavailable": {
+            k: [[int(d), int(s)] for (d, s) in v]
+            for k, v in state["instructor_unavailable"].items()
+        },
+        "courses": state["courses"],
+        "constraint_settings": state["constraint_settings"],
+        "day_start_slot": state["day_start_slot"],
+        "day_use_slots": state["day_use_slots"],
+        "pins": state["pins"],
+        "strategy": state["strategy"],
+        "soft_settings": state["soft_settings"],
+    }
+
+def _course_rows(courses):
+    return [{k: ",".join(c.get(k) or []) if k == "features" else c.get(k, "") for k in COURSE_COLS}
+            for c in courses]
+
+def export_courses_csv(courses):
+    out = io.StringIO()
+    pd.DataFrame(_course_rows(courses), columns=COURSE_COLS).to_csv(out, index=False)
+    return out.getvalue()
+
+def export_courses_xlsx(courses):
+    df = pd.DataFrame(_course_rows(courses), columns=COURSE_COLS)
+    bio = BytesIO()
+    with pd.ExcelWriter(bio, engine="openpyxl") as w:
+        df.to_excel(w, sheet_name="dersler", index=False)
+    bio.seek(0)
+    return bio
@@ -0,0 +1,67 @@
+# ders_programi/multistart.py
+"""Çoklu başlangıç: tohumlu greedy varyantlarını süreç havuzunda çalıştır.
+
+Her varyant greedy_schedule(seed=...) ile eşit anahtarlı derslerin sırasını,
+gün sırasını ve oda tercih sırasını karıştırır. En az yerleşemeyen ders
+sayısına sahip varyant seçilir; eşitlikte durumun ağırlıklarıyla yumuşak puan
+(scoring.SoftScorer, tüm varyantlar tek score_many çağrısında), sonra varyant
+sırası belirleyicidir. İlk varyant tohumsuz (klasik
+deterministik) çalışmadır; böylece sonuç tek çalışmadan kötü olamaz.
+
+Her varyant tüm seçeneklerle (onarım ve tam arama dahil) bir kez çözülür ve
+kazananın sonucu işçiden aynen döner; kazanan yeniden çözülmez. Tohum,
+strateji, motor ve exact_node_limit belirleyicidir: repair_budget=0 ve
+exact_time_limit=None ile aynı tohum birebir aynı sonucu verir. Onarım ve
+exact_time_limit duvar saatine bağlıdır; açıkken sonuç makine yüküne göre
+değişebilir.
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from .scoring import SoftScorer
+from .solver import solve_state
+
+_STATE = None
+_OPTIONS = None
+
+def _init_worker(state, options):
+    global _STATE, _OPTIONS
+    _STATE, _OPTIONS = state, options
+
+def _run_variant(seed):
+    stats = {} if _OPTIONS.get("stats") is not None else None
+    result = solve_state(_STATE, seed=seed, **dict(_OPTIONS, stats=stats))
+    _, _, placed, unplaced, _ = result
+    return len({ci for ci, _ in unplaced} - {p[0] for p in placed}), result, stats
+
+def variant_seeds(n_starts, seed=0):
+    rng = random.Random(seed)
+    return [None] + [rng.randrange(2**31) for _ in range(max(0, n_starts - 1))]
+
+def multistart_schedule(state, n_starts=8, seed=0, workers=None, **options):
+    """En iyi varyantın tam sonucunu ve tüm varyantların özetini döndür.
+
+    (result, runs) — result solve_state çıktısıdır; runs her varyant için
+    (yerleşemeyen, yumuşak puan, tohum) listesidir.
+    """
+    # stats çağıranın dict'idir; işçiler kendi kopyasını doldurur, kazananınki aktarılır
+    stats = options.get("stats")
+    options = dict(options, stats={} if stats is not None else None)
+    seeds = variant_seeds(n_starts, seed)
+    workers = min(len(seeds), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        _init_worker(state, options)
+        outs = [_run_variant(s) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(state, options)) as ex:
+            outs = list(ex.map(_run_variant, seeds, chunksize=max(1, len(seeds) // (workers*4))))
+    scorer = SoftScorer(state["courses"], len(state["days"]), state["slots_per_day"], state.get("soft_settings"))
+    _, totals = scorer.score_many([result[2] for _, result, _ in outs])
+    runs = [(n_unplaced, float(total), s) for (n_unplaced, _, _), total, s in zip(outs, totals, seeds)]
+    best = min(range(len(outs)), key=lambda i: (runs[i][0], runs[i][1], i))
+    _, result, best_stats = outs[best]
+    if stats is not None:
+        stats.update(best_stats)
+    return result, runs
@@ -0,0 +1,242 @@
+# ders_programi/occupancy.py
+"""Doluluk motorları: greedy yerleştirmenin "bu pencere boş mu?" soruları.
+
+İki motor aynı arayüzü sunar ve aynı yerleşimi üretir:
+- ListOccupancy: slot başına sayaç listesi ve set'ler (ilk sürüm).
+- BitsetOccupancy: gün başına tek bir tamsayı maske; L-slotluk pencere
+  kontrolü tek bir AND işlemidir. Boş oda, slot başına tutulan
+  "boş odalar" maskelerinin kesişiminden en düşük bit ile bulunur.
+
+Oda kapasitesi/özellikleri: free_room(..., allowed) yalnızca allowed
+maskesindeki odalara bakar. Çözücü odaları kapasiteye göre artan sıraya
+dizer (best_fit_order); böylece en düşük boş bit, derse yeten en küçük odadır.
+"""
+
+ENGINES = ["bitset", "list"]
+
+def window_mask(start, L):
+    return ((1 << L) - 1) << start
+
+# ====================== Oda Uygunluğu (kapasite / özellik) ======================
+
+def room_capacity(room):
+    """Oda kapasitesi; 0 ya da boş => sınırsız (bilinmiyor)."""
+    return int(room.get("capacity") or 0)
+
+def best_fit_order(rooms):
+    """Odalar kapasiteye göre artan; kapasitesizler sonda (kararlı sıralama)."""
+    return sorted(rooms, key=lambda r: room_capacity(r) or float("inf"))
+
+def room_fits(room, course):
+    """Oda dersin öğrenci sayısına yetiyor ve istenen özelliklerin hepsine sahip mi?"""
+    cap = room_capacity(room)
+    if cap and int(course.get("enrollment") or 0) > cap:
+        return False
+    need = course.get("features")
+    return not need or set(need) <= set(room.get("features") or ())
+
+def room_masks(rooms, courses):
+    """Ders başına uygun oda maskesi (bit ri = rooms[ri]); (öğrenci, özellik) başına bir kez."""
+    cache, out = {}, []
+    for c in courses:
+        key = (int(c.get("enrollment") or 0), tuple(sorted(c.get("features") or ())))
+        m = cache.get(key)
+        if m is None:
+            m = cache[key] = sum(1 << ri for ri, r in enumerate(rooms) if room_fits(r, c))
+        out.append(m)
+    return out
+
+class ListOccupancy:
+    def __init__(self, n_days, spd, n_rooms, inst_unav, online_cap, max_per_room):
+        self.n_rooms = n_rooms
+        self.inst_unav = inst_unav
+        self.online_cap = online_cap
+        self.max_per_room = max_per_room
+        self.room_occ = [[[0]*spd for _ in range(n_rooms)] for __ in range(n_days)]
+        self.online_load = [[0]*spd for _ in range(n_days)]
+        self.busy_inst = [[set() for _ in range(spd)] for __ in range(n_days)]
+        self.busy_class = [[set() for _ in range(spd)] for __ in range(n_days)]
+
+    def inst_unavailable(self, h, d, start, L):
+        unav = self.inst_unav.get(h, set())
+        return any((d, s) in unav for s in range(start, start+L))
+
+    def inst_busy(self, h, d, start, L):
+        return any((h in self.busy_inst[d][s]) for s in range(start, start+L))
+
+    def class_busy(self, sinif, d, start, L):
+        return any((sinif in self.busy_class[d][s]) for s in range(start, start+L))
+
+    def online_full(self, d, start, L):
+        return any(self.online_load[d][s] >= self.online_cap for s in range(start, start+L))
+
+    def room_full(self, ri, d, start, L):
+        return any(self.room_occ[d][ri][s] >= self.max_per_room for s in range(start, start+L))
+
+    def free_room(self, d, start, L, allowed=None):
+        for ri in range(self.n_rooms):
+            if allowed is not None and not allowed >> ri & 1:
+                continue
+            if not self.room_full(ri, d, start, L):
+                return ri
+        return None
+
+    def add(self, h, sinif, d, start, L, ri=None):
+        """Dersi işaretle; ri None ise online kanala yazılır."""
+        for s in range(start, start+L):
+            if ri is None:
+                self.online_load[d][s] += 1
+            else:
+                self.room_occ[d][ri][s] += 1
+            self.busy_inst[d][s].add(h)
+            self.busy_class[d][s].add(sinif)
+
+    def block_room(self, ri, d, start, L, n=1):
+        """Odayı hoca/sınıf işaretlemeden doldur (dış rezervasyon)."""
+        for s in range(start, start+L):
+            self.room_occ[d][ri][s] += n
+
+class BitsetOccupancy:
+    def __init__(self, n_days, spd, n_rooms, inst_unav, online_cap, max_per_room):
+        self.n_days = n_days
+        self.online_cap = online_cap
+        self.max_per_room = max_per_room
+        all_rooms = (1 << n_rooms) - 1 if max_per_room > 0 else 0
+        # free_rooms[d][s]: bu slotta hâlâ yer olan odaların maskesi
+        self.free_rooms = [[all_rooms]*spd for _ in range(n_days)]
+        self.room_cnt = [[[0]*spd for _ in range(n_rooms)] for __ in range(n_days)]
+        self.online_load = [[0]*spd for _ in range(n_days)]
+        self.online_mask = [0 if online_cap > 0 else window_mask(0, spd) for _ in range(n_days)]
+        self.unav_mask = {}
+        for h, slots in inst_unav.items():
+            m = [0]*n_days
+            for d, s in slots:
+                if 0 <= d < n_days and s >= 0:
+                    m[d] |= 1 << s
+            self.unav_mask[h] = m
+        self.inst_mask = {}
+        self.class_mask = {}
+
+    def _day_masks(self, table, key):
+        m = table.get(key)
+        if m is None:
+            m = table[key] = [0]*self.n_days
+        return m
+
+    def inst_unavailable(self, h, d, start, L):
+        m = self.unav_mask.get(h)
+        return bool(m and m[d] & window_mask(start, L))
+
+    def inst_busy(self, h, d, start, L):
+        m = self.inst_mask.get(h)
+        return bool(m and m[d] & window_mask(start, L))
+
+    def class_busy(self, sinif, d, start, L):
+        m = self.class_mask.get(sinif)
+        return bool(m and m[d] & window_mask(start, L))
+
+    def online_full(self, d, start, L):
+        return bool(self.online_mask[d] & window_mask(start, L))
+
+    def room_full(self, ri, d, start, L):
+        bit = 1 << ri
+        return any(not (self.free_rooms[d][s] & bit) for s in range(start, start+L))
+
+    def free_room(self, d, start, L, allowed=None):
+        fr = self.free_rooms[d]
+        m = fr[start] if allowed is None else fr[start] & allowed
+        for s in range(start+1, start+L):
+            m &= fr[s]
+            if not m:
+                return None
+        if not m:
+            return None
+        return (m & -m).bit_length() - 1
+
+    def add(self, h, sinif, d, start, L, ri=None):
+        """Dersi işaretle; ri None ise online kanala yazılır."""
+        w = window_mask(start, L)
+        self._day_masks(self.inst_mask, h)[d] |= w
+        self._day_masks(self.class_mask, sinif)[d] |= w
+        if ri is None:
+            for s in range(start, start+L):
+                self.online_load[d][s] += 1
+                if self.online_load[d][s] >= self.online_cap:
+                    self.online_mask[d] |= 1 << s
+        else:
+            self.block_room(ri, d, start, L)
+
+    def block_room(self, ri, d, start, L, n=1):
+        """Odayı hoca/sınıf işaretlemeden doldur (dış rezervasyon)."""
+        cnt = self.room_cnt[d][ri]
+        for s in range(start, start+L):
+            cnt[s] += n
+            if cnt[s] >= self.max_per_room:
+                self.free_rooms[d][s] &= ~(1 << ri)
+
+def make_occupancy(engine, n_days, spd, n_rooms, inst_unav, online_cap, max_per_room):
+    if engine == "list":
+        cls = ListOccupancy
+    elif engine == "bitset":
+        cls = BitsetOccupancy
+    else:
+        raise ValueError(f"Bilinmeyen doluluk motoru: {engine}")
+    return cls(n_days, spd, n_rooms, inst_unav, online_cap, max_per_room)
+
+class AvailabilityIndex:
+    """Hoca × gün boş-slot maskeleri (gün penceresi ile kesişmiş).
+
+    Çözüm başına bir kez kurulur; (hoca, süre) için uygun başlangıç sayısı
+    önbelleğe alınır, böylece aynı hocanın aynı süreli dersleri tekrar
+    hesaplanmaz.
+    """
+    def __init__(self, n_days, spd, inst_unav, day_start_slot, day_use_slots):
+        self.n_days = n_days
+        self.windows = []
+        self.window_masks = []
+        for d in range(n_days):
+            start0 = int(day_start_slot.get(d, 0))
+            use0   = int(day_use_slots.get(d, spd))
+            end_allowed = min(spd, start0 + use0) - 1
+            self.windows.append((start0, end_allowed))
+            self.window_masks.append(window_mask(start0, end_allowed - start0 + 1) if end_allowed >= start0 else 0)
+        self.inst_unav = inst_unav
+        self._unav = {}
+        self._free = {}
+        self._counts = {}
+
+    def unav_masks(self, h):
+        """Gün başına hocanın uygunsuz slot maskesi."""
+        m = self._unav.get(h)
+        if m is None:
+            m = self._unav[h] = [0]*self.n_days
+            for d, s in self.inst_unav.get(h, ()):
+                if 0 <= d < self.n_days and s >= 0:
+                    m[d] |= 1 << s
+        return m
+
+    def free_masks(self, h):
+        m = self._free.get(h)
+        if m is None:
+            m = self._free[h] = [w & ~u for w, u in zip(self.window_masks, self.unav_masks(h))]
+        return m
+
+    def start_masks(self, h, L):
+        """Gün başına, L-slotluk pencerenin tamamen boş olduğu başlangıçlar."""
+        out = []
+        for f in self.free_masks(h):
+            m = f
+            for k in range(1, L):
+                if not m:
+                    break
+                m &= f >> k
+            out.append(m)
+        return out
+
+    def count_feasible_starts(self, h, L):
+        key = (h, L)
+        n = self._counts.get(key)
+        if n is None:
+            n = 0 if L <= 0 else sum(m.bit_count() for m in self.start_masks(h, L))
+            self._counts[key] = n
+        return n
@@ -0,0 +1,83 @@
+# ders_programi/perf.py
+"""Performans ölçümü: aşama süreleri, sayaçlar, yapılandırılmış log ve cProfile.
+
+greedy_schedule(stats=...) aşama sürelerini stats["phases"] = [(aşama, sn)]
+ve sayaçları stats["counters"] = {ad: adet} olarak doldurur. Log satırları
+`perf event=... anahtar=değer ...` biçimindedir; "ders_programi.perf"
+logger'ına INFO düzeyinde yazılır ve kolayca ayrıştırılabilir.
+"""
+import cProfile, io, logging, marshal, pstats, time
+
+logger = logging.getLogger("ders_programi.perf")
+
+PHASE_LABELS = {
+    "pins": "PIN'ler",
+    "ordering": "Sıralama",
+    "exact": "Tam arama",
+    "offline": "Yerleştirme (yüz yüze)",
+    "online": "Yerleştirme (online)",
+    "split": "Oturumlara bölme",
+    "repair": "Onarım",
+    "grid": "Izgara + tablo",
+    "diagnostics": "Tanılama",
+}
+COUNTER_LABELS = {
+    "candidates": "İncelenen aday başlangıç",
+    "room_probes": "Oda yoklaması",
+    "reject_window": "Ret: gün penceresi (süre sığmıyor)",
+    "reject_unavailable": "Ret: hoca uygunsuz",
+    "reject_instructor": "Ret: hoca çakışması",
+    "reject_class": "Ret: sınıf çakışması",
+    "reject_room": "Ret: boş oda yok",
+    "reject_online": "Ret: online kapasite dolu",
+    "split_courses": "Oturumlara bölünerek yerleşen ders",
+}
+
+class Laps:
+    """Ardışık aşama süreleri: her çağrı, bir önceki çağrıdan beri geçen süreyi kaydeder."""
+    def __init__(self, stats):
+        self.phases = stats.setdefault("phases", []) if stats is not None else None
+        self.t = time.perf_counter()
+
+    def __call__(self, name):
+        now = time.perf_counter()
+        if self.phases is not None:
+            self.phases.append((name, now - self.t))
+        self.t = now
+
+def _fmt(v):
+    if isinstance(v, float):
+        return f"{v:.6f}"
+    v = str(v)
+    return f'"{v}"' if (" " in v or not v) else v
+
+def log_event(event, **fields):
+    logger.info("perf event=%s %s", event, " ".join(f"{k}={_fmt(v)}" for k, v in fields.items()))
+
+def log_stats(stats, **context):
+    """Planlama istatistiklerini aşama başına ve sayaçlar için birer satır olarak logla."""
+    for name, seconds in stats.get("phases", ()):
+        log_event("phase", phase=name, seconds=seconds, **context)
+    if stats.get("counters"):
+        log_event("counters", **context, **stats["counters"])
+
+def enable_perf_logging(level=logging.INFO):
+    """perf satırlarını stderr'e yaz (başka işleyici kurulmamışsa)."""
+    logger.setLevel(level)
+    if not logger.handlers:
+        h = logging.StreamHandler()
+        h.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(h)
+
+def profile_call(fn, *args, top=30, **kwargs):
+    """fn'i cProfile altında çalıştır; (sonuç, .prof baytları, özet metni) döndür.
+
+    .prof baytları pstats.Stats / snakeviz ile açılabilir (dump_stats biçimi).
+    """
+    prof = cProfile.Profile()
+    result = prof.runcall(fn, *args, **kwargs)
+    out = io.StringIO()
+    ps = pstats.Stats(prof, stream=out)
+    data = marshal.dumps(ps.stats)  # Stats.dump_stats ile aynı biçim
+    ps.sort_stats("cumulative").print_stats(top)
+    return result, data, out.getvalue()
@@ -0,0 +1,210 @@
+# ders_programi/repair.py
+"""Onarım aşaması: greedy'nin yerleştiremediği dersler için ejeksiyon zinciri.
+
+Yerleşemeyen bir ders için her (gün, başlangıç, kolon) adayı, onu engelleyen
+yerleşik dersler (aynı hoca / aynı sınıf / dolu oda / dolu online kanal)
+üzerinden puanlanır. Engelsiz aday varsa doğrudan yerleştirilir; yoksa en az
+engelli adaylar denenir: engelleyenler çıkarılır, ders yerleştirilir ve
+çıkarılanlar (sınırlı derinlikte, aynı yöntemle) yeniden yerleştirilir.
+Zincir tamamlanamazsa tüm değişiklikler geri alınır. PIN'li dersler asla
+yerinden oynatılmaz; bölünmüş derslerin oturumları da (ders, gün, başlangıç)
+anahtarıyla tahtada durur ve PIN gibi sabittir. Kısıt ayarları greedy ile
+aynıdır. Yüz yüze dersler
+yalnızca kendilerine yeten odalarda (kapasite/özellik), en küçüğünden
+başlayarak denenir.
+"""
+import time
+
+from .occupancy import best_fit_order, room_fits
+
+def _ci(key):
+    """Tahta anahtarından ders indeksi (oturum anahtarı: (ders, gün, başlangıç))."""
+    return key if isinstance(key, int) else key[0]
+
+def _order(key):
+    return (key, -1, -1) if isinstance(key, int) else key
+
+class _Board:
+    """(gün, slot) -> yerleşik dersler; değişiklikler günlüğe yazılır."""
+    def __init__(self, n_days, spd, n_rooms):
+        self.n_rooms = n_rooms
+        self.at = [[set() for _ in range(spd)] for __ in range(n_days)]
+        self.pos = {}       # ci -> (d, start, L, col); col == n_rooms => ONLINE
+        self.journal = []
+
+    def add(self, ci, d, start, L, col, log=True):
+        for s in range(start, start+L):
+            self.at[d][s].add(ci)
+        self.pos[ci] = (d, start, L, col)
+        if log:
+            self.journal.append(("add", ci))
+
+    def remove(self, ci):
+        d, start, L, col = self.pos.pop(ci)
+        for s in range(start, start+L):
+            self.at[d][s].discard(ci)
+        self.journal.append(("remove", ci, d, start, L, col))
+
+    def rollback(self, mark):
+        while len(self.journal) > mark:
+            op = self.journal.pop()
+            if op[0] == "add":
+                d, start, L, col = self.pos.pop(op[1])
+                for s in range(start, start+L):
+                    self.at[d][s].discard(op[1])
+            else:
+                _, ci, d, start, L, col = op
+                self.add(ci, d, start, L, col, log=False)
+
+def repair_schedule(days, spd, rooms, courses, inst_unav, cs, day_start_slot, day_use_slots,
+                    placed, unplaced, pinned_ci, time_budget=2.0, max_depth=2, max_eject=2, max_branch=8):
+    """Yerleşemeyenleri zaman bütçesi içinde kurtarmaya çalış.
+
+    (placed, unplaced, stats) döndürür; stats içinde denenen/kurtarılan ders
+    sayısı, geçen süre, bütçe ve bütçe saniyesi başına kurtarılan ders
+    (recovered_per_sec = kurtarılan / bütçe; hızlı biten onarımda şişmez) bulunur.
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + float(time_budget)
+    n_days, n_rooms = len(days), len(rooms)
+    online_col = n_rooms
+    online_cap = int(cs["online_cap"])
+    max_per_room = int(cs["max_per_room"])
+    enf_inst = bool(cs["enf_instructor_no_overlap"])
+    enf_class = bool(cs["enf_class_no_overlap"])
+    room_col = {r["id"]: ri for ri, r in enumerate(rooms)}
+
+    windows = []
+    for d in range(n_days):
+        start0 = int(day_start_slot.get(d, 0))
+        use0   = int(day_use_slots.get(d, spd))
+        windows.append((start0, min(spd, start0 + use0) - 1))
+
+    fit_order = [room_col[r["id"]] for r in best_fit_order(rooms)]
+    col_rank = {ri: i for i, ri in enumerate(fit_order)}
+    cols_cache = {}
+    def room_cols(c):
+        key = (int(c.get("enrollment") or 0), tuple(sorted(c.get("features") or ())))
+        cols = cols_cache.get(key)
+        if cols is None:
+            cols = cols_cache[key] = [ri for ri in fit_order if room_fits(rooms[ri], c)]
+        return cols
+
+    board = _Board(n_days, spd, n_rooms)
+    fixed = set(pinned_ci)
+    for ci, d, start, ch, rm, L in placed:
+        col = online_col if ch == "Online" else room_col[rm]
+        if L == int(courses[ci]["sure"]):
+            board.add(ci, d, start, L, col, log=False)
+        else:
+            board.add((ci, d, start), d, start, L, col, log=False)
+            fixed.add((ci, d, start))
+
+    def blockers(ci, d, start, L, col):
+        """Adayı engelleyen dersler; PIN'e takılırsa None."""
+        c = courses[ci]
+        out = set()
+        cap = online_cap if col == online_col else max_per_room
+        if cap <= 0:
+            return None
+        for s in range(start, start+L):
+            same_col = []
+            for oj in board.at[d][s]:
+                o = courses[_ci(oj)]
+                if (enf_inst and o["hoca"] == c["hoca"]) or (enf_class and o["sinif"] == c["sinif"]):
+                    out.add(oj)
+                if board.pos[oj][3] == col:
+                    same_col.append(oj)
+            excess = len(same_col) - cap + 1
+            if excess > 0:
+                same_col.sort(key=lambda oj: (oj not in out, _order(oj)))
+                out.update(same_col[:excess])
+            if len(out) > max_eject or out & fixed:
+                return None
+        return out
+
+    def candidates(ci):
+        c = courses[ci]; L = int(c["sure"])
+        unav = inst_unav.get(c["hoca"], set())
+        cols = [online_col] if c["online"] else room_cols(c)
+        cands = []
+        for d in range(n_days):
+            start0, end_allowed = windows[d]
+            if end_allowed < start0 or L > (end_allowed - start0 + 1):
+                continue
+            for start in range(start0, end_allowed - L + 2):
+                if any((d, s) in unav for s in range(start, start+L)):
+                    continue
+                for col in cols:
+                    b = blockers(ci, d, start, L, col)
+                    if b is None:
+                        continue
+                    cands.append((len(b), d, start, col, b))
+                    if not b:
+                        return cands[-1:]
+        cands.sort(key=lambda x: (x[0], x[1], x[2], col_rank.get(x[3], 0)))
+        return cands
+
+    def try_place(ci, depth, chain):
+        if time.perf_counter() > deadline:
+            return False
+        L = int(courses[ci]["sure"])
+        cands = candidates(ci)
+        if cands and not cands[0][4]:
+            _, d, start, col, _ = cands[0]
+            board.add(ci, d, start, L, col)
+            return True
+        if depth <= 0:
+            return False
+        tried = 0
+        for _, d, start, col, b in cands:
+            if b & chain:
+                continue
+            if tried >= max_branch or time.perf_counter() > deadline:
+                break
+            tried += 1
+            mark = len(board.journal)
+            for oj in b:
+                board.remove(oj)
+            board.add(ci, d, start, L, col)
+            if all(try_place(oj, depth-1, chain | {ci}) for oj in sorted(b)):
+                return True
+            board.rollback(mark)
+        return False
+
+    # PIN'ler onarılmaz; zaten yerleşik olanlar (ör. PIN'i geçersiz olup
+    # greedy'nin yerleştirdiği dersler) yeniden denenmez
+    targets = []
+    for ci, _ in unplaced:
+        if ci not in pinned_ci and ci not in board.pos and ci not in targets:
+            targets.append(ci)
+    attempted = 0
+    recovered = set()
+    progress = True
+    while progress and targets and time.perf_counter() < deadline:
+        progress = False
+        still = []
+        for ci in targets:
+            attempted += 1
+            if try_place(ci, max_depth, frozenset()):
+                recovered.add(ci)
+                progress = True
+            else:
+                still.append(ci)
+        targets = still
+
+    placed_out = []
+    for key, (d, start, L, col) in board.pos.items():
+        if col == online_col:
+            placed_out.append((_ci(key), d, start, "Online", "ONLINE", L))
+        else:
+            placed_out.append((_ci(key), d, start, "FaceToFace", rooms[col]["id"], L))
+    elapsed = time.perf_counter() - t0
+    stats = {
+        "attempted": attempted,
+        "recovered": len(recovered),
+        "seconds": elapsed,
+        "budget": float(time_budget),
+        "recovered_per_sec": len(recovered) / float(time_budget) if time_budget > 0 else 0.0,
+    }
+    return placed_out, [(ci, r) for ci, r in unplaced if ci not in recovered], stats
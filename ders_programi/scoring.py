@@ -0,0 +1,152 @@
+# ders_programi/scoring.py
+"""Yerleşim kalite puanları (düşük = iyi).
+
+quality_score: hoca ve sınıf başına günlük boşluk toplamı (ağırlıksız, hızlı
+kontrol için).
+
+SoftScorer: yumuşak kısıt puanı. Yerleşimler slot düzeyine açılır ve
+(varlık × gün × slot) doluluk tensörüne NumPy ile yazılır; tüm terimler dizi
+işlemleridir. Terimler (ham değer × ağırlık):
+- instructor_gaps / class_gaps: hoca / sınıf (1–4) günlük boşlukları (saat);
+- load_imbalance: sınıf başına en yüklü ve en boş gün farkı (saat);
+- late_slots: late_from ve sonrasındaki slotlarda ders saati;
+- room_changes: sınıfın gün içinde ardışık yüz yüze oturumları arasında oda değişimi;
+- channel_switches: sınıfın gün içinde ardışık oturumları arasında online/yüz yüze geçişi.
+score_many birden çok yerleşimi tek tensörde (varlık indeksi yerleşim başına
+kaydırılarak) puanlar; aramalarda ve taramalarda binlerce aday hızlıca puanlanır.
+"""
+import numpy as np
+
+SOFT_TERMS = ["instructor_gaps", "class_gaps", "load_imbalance", "late_slots", "room_changes", "channel_switches"]
+SOFT_LABELS = {
+    "instructor_gaps": "Hoca boşluğu (saat)",
+    "class_gaps": "Sınıf boşluğu (saat)",
+    "load_imbalance": "Günlük yük dengesizliği (saat)",
+    "late_slots": "Geç slot kullanımı (saat)",
+    "room_changes": "Gün içi oda değişimi",
+    "channel_switches": "Online / yüz yüze geçişi",
+}
+
+def _gaps(mask):
+    """Gün maskesinde ilk ve son dolu slot arasındaki boş slot sayısı."""
+    if not mask:
+        return 0
+    lo = (mask & -mask).bit_length() - 1
+    hi = mask.bit_length() - 1
+    return (hi - lo + 1) - mask.bit_count()
+
+def quality_score(placed, courses, n_days):
+    """Hoca ve sınıf (1–4) başına günlük boşluk (pencere) toplamı."""
+    inst, cls = {}, {}
+    for ci, d, start, ch, rm, L in placed:
+        c = courses[ci]
+        w = ((1 << L) - 1) << start
+        inst.setdefault(c["hoca"], [0]*n_days)[d] |= w
+        cls.setdefault(c["sinif"], [0]*n_days)[d] |= w
+    return sum(_gaps(m) for days in (*inst.values(), *cls.values()) for m in days)
+
+# ====================== Yumuşak Kısıt Puanı (NumPy) ======================
+
+def _tensor_gaps(occ):
+    """occ: (varlık, gün, slot) bool => varlık başına boşluk toplamı."""
+    n_slots = occ.shape[-1]
+    cnt = occ.sum(-1)
+    first = occ.argmax(-1)
+    last = n_slots - 1 - occ[..., ::-1].argmax(-1)
+    return np.where(cnt > 0, last - first + 1 - cnt, 0).sum(-1)
+
+class SoftScorer:
+    """Ders listesi için bir kez kurulur; score / score_many her yerleşim listesini puanlar."""
+    def __init__(self, courses, n_days, spd, settings=None):
+        settings = settings or {}
+        weights = settings.get("weights") or {}
+        self.weights = np.array([float(weights.get(t, 0.0)) for t in SOFT_TERMS])
+        self.late_from = int(settings.get("late_from", spd))
+        self.n_days, self.spd = n_days, spd
+        self.inst_code, inst_names = _codes([c["hoca"] for c in courses])
+        self.class_code, class_names = _codes([c["sinif"] for c in courses])
+        self.n_inst, self.n_class = len(inst_names), len(class_names)
+
+    def _arrays(self, placed_lists):
+        """Yerleşim listelerini oturum dizilerine çevir: (yerleşim no, ders, gün, başlangıç, süre, kanal, oda)."""
+        rows, batch = [], []
+        for b, placed in enumerate(placed_lists):
+            rows.extend(placed)
+            batch.append(np.full(len(placed), b, dtype=np.int64))
+        if not rows:
+            z = np.zeros(0, dtype=np.int64)
+            return z, z, z, z, z, z, z
+        ci, d, start, ch, rm, L = zip(*rows)
+        online = np.array([x == "Online" for x in ch])
+        room, _ = _codes(rm)
+        return (np.concatenate(batch), np.array(ci, dtype=np.int64), np.array(d, dtype=np.int64),
+                np.array(start, dtype=np.int64), np.array(L, dtype=np.int64), online, room)
+
+    def score_many(self, placed_lists):
+        """(B, terim) ham değer matrisi ve (B,) ağırlıklı toplam."""
+        B = len(placed_lists)
+        raw = np.zeros((B, len(SOFT_TERMS)))
+        b, ci, d, start, L, online, room = self._arrays(placed_lists)
+        if not len(ci):
+            return raw, raw @ self.weights
+        D, S = self.n_days, self.spd
+        inst, cls = self.inst_code[ci], self.class_code[ci]
+
+        # Slot düzeyine aç: oturum i, start[i] .. start[i]+L[i]-1
+        idx = np.repeat(np.arange(len(ci)), L)
+        slot = start[idx] + np.arange(len(idx)) - np.repeat(np.cumsum(L) - L, L)
+        keep = slot < S
+        idx, slot = idx[keep], slot[keep]
+        sb, sd = b[idx], d[idx]
+
+        occ = np.zeros((B * self.n_inst, D, S), dtype=bool)
+        occ[sb * self.n_inst + inst[idx], sd, slot] = True
+        raw[:, 0] = _tensor_gaps(occ).reshape(B, self.n_inst).sum(1)
+
+        occ = np.zeros((B * self.n_class, D, S), dtype=bool)
+        occ[sb * self.n_class + cls[idx], sd, slot] = True
+        raw[:, 1] = _tensor_gaps(occ).reshape(B, self.n_class).sum(1)
+
+        load = np.zeros((B * self.n_class, D))
+        np.add.at(load, (sb * self.n_class + cls[idx], sd), 1)
+        load = load.reshape(B, self.n_class, D)
+        used = load.sum(-1) > 0
+        raw[:, 2] = np.where(used, load.max(-1) - load.min(-1), 0).sum(1)
+
+        raw[:, 3] = np.bincount(sb[slot >= self.late_from], minlength=B)
+
+        # Sınıf-gün başına oturumlar başlangıç sırasında; komşu çiftler karşılaştırılır
+        order = np.lexsort((start, d, cls, b))
+        same = ((b[order][1:] == b[order][:-1]) & (cls[order][1:] == cls[order][:-1])
+                & (d[order][1:] == d[order][:-1]))
+        ch = online[order]
+        pair_b = b[order][1:]
+        raw[:, 5] = np.bincount(pair_b[same & (ch[1:] != ch[:-1])], minlength=B)
+        f2f = order[~online[order]]
+        same = ((b[f2f][1:] == b[f2f][:-1]) & (cls[f2f][1:] == cls[f2f][:-1]) & (d[f2f][1:] == d[f2f][:-1]))
+        raw[:, 4] = np.bincount(b[f2f][1:][same & (room[f2f][1:] != room[f2f][:-1])], minlength=B)
+        return raw, raw @ self.weights
+
+    def score(self, placed):
+        """(ağırlıklı toplam, {terim: ham değer})."""
+        raw, total = self.score_many([placed])
+        return float(total[0]), {t: float(v) for t, v in zip(SOFT_TERMS, raw[0])}
+
+def _codes(values):
+    """Değerleri 0..k-1 kodlarına çevir (ilk görülme sırası): (kod dizisi, benzersiz değerler)."""
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int64, count=len(values))
+    return codes, list(index)
+
+def soft_score(placed, courses, n_days, spd, settings=None):
+    """Tek yerleşim için SoftScorer(...).score(placed)."""
+    return SoftScorer(courses, n_days, spd, settings).score(placed)
+
+def score_breakdown(placed, courses, n_days, spd, settings):
+    """Arayüz tablosu: terim, ham değer, ağırlık, katkı (son satır toplam)."""
+    total, raw = soft_score(placed, courses, n_days, spd, settings)
+    weights = settings.get("weights") or {}
+    rows = [{"Terim": SOFT_LABELS[t], "Değer": raw[t], "Ağırlık": float(weights.get(t, 0.0)),
+             "Katkı": raw[t] * float(weights.get(t, 0.0))} for t in SOFT_TERMS]
+    rows.append({"Terim": "Toplam", "Değer": None, "Ağırlık": None, "Katkı": total})
+    return rows
@@ -0,0 +1,447 @@
+# ders_programi/solver.py
+"""Gün-gün greedy planlayıcı (Streamlit'ten bağımsız).
+
+Yerleşimler (ders, gün, başlangıç, kanal, oda, süre) demetleridir. Ardışık
+olmayan (ardisik=False) dersler önce tek blok olarak denenir; sığmayanlar
+tüm bloklar yerleştikten sonra, artan boşluklara oturumlar hâlinde (ör.
+3 => 2+1, 1+1+1) yerleştirilir ve her oturum ayrı bir demet olur. Bölme
+böylece hiçbir blok dersin yerini almaz.
+"""
+import random
+from functools import lru_cache
+
+import pandas as pd
+
+from .exact import exact_search
+from .grid import build_grid, grid_to_frame
+from .diagnostics import CONSTRAINTS, build_occupancy, diagnose_unplaced
+from .occupancy import AvailabilityIndex, BitsetOccupancy, best_fit_order, make_occupancy, room_masks
+from .perf import Laps, log_stats
+from .repair import repair_schedule
+
+DIAG_COLS = (["id","ad","hoca","sinif","sure","online","neden","aday"]
+             + [f"ret_{k}" for k in CONSTRAINTS] + ["en_iyi_aday","engelleyenler"])
+
+# ====================== Kıtlık Hesabı ======================
+
+def count_feasible_starts_for_course(c, day_start_slot, day_use_slots, spd, inst_unav, days_len):
+    L = int(c["sure"])
+    h = c["hoca"]
+    if L <= 0: return 0
+    feas = 0
+    for d in range(days_len):
+        start0 = int(day_start_slot.get(d, 0))
+        use0   = int(day_use_slots.get(d, spd))
+        end_allowed = min(spd, start0 + use0) - 1
+        if end_allowed < start0 or L > (end_allowed - start0 + 1):
+            continue
+        for s in range(start0, end_allowed - L + 2):
+            if any((d, ss) in inst_unav.get(h, set()) for ss in range(s, s+L)):
+                continue
+            feas += 1
+    return feas
+
+# ====================== Oturumlara Bölme ======================
+
+SPLIT_NODE_LIMIT = 2000  # ders başına oturum araması düğüm sınırı
+
+@lru_cache(maxsize=None)
+def session_patterns(L, max_parts=None):
+    """L saatin en az iki oturuma bölünüşleri (azalan parçalar).
+
+    Önce az oturumlu, sonra ilk parçası büyük olanlar: 4 => (3,1), (2,2), (2,1,1), (1,1,1,1).
+    """
+    out = []
+    def rec(rem, mx, parts):
+        if rem == 0:
+            if len(parts) > 1:
+                out.append(tuple(parts))
+            return
+        for p in range(min(rem, mx), 0, -1):
+            rec(rem - p, p, parts + [p])
+    rec(int(L), int(L) - 1, [])
+    if max_parts:
+        out = [p for p in out if len(p) <= max_parts]
+    return tuple(sorted(out, key=lambda p: (len(p), [-x for x in p])))
+
+# ====================== Greedy Planlayıcı (Gün-Gün) + PIN ======================
+
+def greedy_schedule(days, spd, rooms, courses, inst_unav, cs, day_start_slot, day_use_slots, pins, strategy,
+                    time_labels=None, engine="bitset", repair_budget=0.0, stats=None,
+                    exact_node_limit=200000, exact_time_limit=10.0, seed=None, keep=None, reserved=None):
+    """reserved: [(oda_id, gün, başlangıç, süre)] — başka bölümlerin tuttuğu oda
+    slotları (çok bölümlü planlama). Rezervasyon varken tam arama ve onarım
+    atlanır; ikisi de yalnızca bu durumun kendi yerleşimlerini bilir.
+    """
+    n_days = len(days)
+    n_rooms = len(rooms)
+    online_cap = int(cs["online_cap"])
+    max_per_room = int(cs["max_per_room"])
+    enf_inst = bool(cs["enf_instructor_no_overlap"])
+    enf_class = bool(cs["enf_class_no_overlap"])
+    split_on = bool(cs.get("split_sessions", True))
+    one_per_day = bool(cs.get("split_one_per_day", True))
+
+    lap = Laps(stats)
+    occ_stale = False  # tam arama/onarım yerleşimi occ dışında değiştirdiyse True
+    occ = make_occupancy(engine, n_days, spd, n_rooms, inst_unav, online_cap, max_per_room)
+
+    # seed verilirse: eşit anahtarlı derslerin sırası karışır, gün sırası döner,
+    # oda tercih sırası karışır (çoklu başlangıç için). None => deterministik.
+    rng = random.Random(seed) if seed is not None else None
+    day_order = list(range(n_days))
+    search_rooms = list(rooms)
+    if rng is not None and n_days:
+        k = rng.randrange(n_days)
+        day_order = day_order[k:] + day_order[:k]
+        rng.shuffle(search_rooms)
+    # En uygun oda: kapasiteye göre artan sıra => en düşük boş bit, yeten en küçük oda.
+    # Kapasite verilmemişse sıra değişmez.
+    search_rooms = best_fit_order(search_rooms)
+    room_index = {r["id"]: ri for ri, r in enumerate(search_rooms)}
+    all_rooms = (1 << n_rooms) - 1
+    allowed = [None if m == all_rooms else m for m in room_masks(search_rooms, courses)]
+    reserved = list(reserved or ())
+    for rm, d, start, L in reserved:
+        if rm in room_index:
+            occ.block_room(room_index[rm], d, start, L)
+
+    placed, unplaced = [], []
+    idx_by_id = {c["id"]: i for i, c in enumerate(courses)}
+
+    def splittable(ci):
+        c = courses[ci]
+        return split_on and not c["ardisik"] and int(c["sure"]) > 1
+
+    def place_fixed(ci, d, start, channel, room_id, L=None, commit=True):
+        """PIN/korunan yerleşimi (ya da oturumu) doğrula ve commit ise uygula;
+        geçersizse nedeni döndür."""
+        c = courses[ci]; L = int(c["sure"]) if L is None else int(L)
+        start0 = int(day_start_slot.get(d, 0))
+        use0   = int(day_use_slots.get(d, spd))
+        end_allowed = min(spd, start0 + use0) - 1
+        if start < start0 or start + L - 1 > end_allowed or start + L - 1 >= spd:
+            return f"gün penceresi dışında ({days[d]} {start0}-{end_allowed})"
+
+        if occ.inst_unavailable(c["hoca"], d, start, L):
+            return "hoca uygunsuz saat"
+
+        if enf_inst and occ.inst_busy(c["hoca"], d, start, L):
+            return "hoca çakışması"
+        if enf_class and occ.class_busy(c["sinif"], d, start, L):
+            return "sınıf çakışması"
+
+        if channel == "Online" or c["online"]:
+            if occ.online_full(d, start, L):
+                return "online kapasite dolu"
+            if commit:
+                occ.add(c["hoca"], c["sinif"], d, start, L)
+                placed.append((ci, d, start, "Online", "ONLINE", L))
+        else:
+            if not room_id:
+                return "oda belirtilmemiş"
+            ri = room_index.get(room_id)
+            if ri is None:
+                return f"oda bulunamadı ({room_id})"
+            if allowed[ci] is not None and not allowed[ci] >> ri & 1:
+                return "oda uygun değil (kapasite/özellik)"
+            if occ.room_full(ri, d, start, L):
+                return "oda kapasitesi dolu"
+            if commit:
+                occ.add(c["hoca"], c["sinif"], d, start, L, ri)
+                placed.append((ci, d, start, "FaceToFace", search_rooms[ri]["id"], L))
+        return None
+
+    def place_split(ci, rooms_ok):
+        """Dersi oturumlara bölerek yerleştir; başarılıysa True.
+
+        Her oturum süresi için uygun (gün, başlangıç, oda) adayları bir kez
+        üretilir. Bir süre için hiç aday yoksa daha uzun oturumlar da sığmaz;
+        o süreyi içeren bölünüşler aday üretmeden elenir. Oturumlar kendi
+        aralarında yalnızca zamanda çakışamaz (ve istenirse aynı güne düşemez).
+        """
+        c = courses[ci]; L = int(c["sure"]); online = bool(c["online"])
+        spots = {}
+        def spots_for(l):
+            v = spots.get(l)
+            if v is None:
+                v = spots[l] = []
+                for d in day_order:
+                    start0, end_allowed = avail.windows[d]
+                    for start in range(start0, end_allowed - l + 2):
+                        if occ.inst_unavailable(c["hoca"], d, start, l) \
+                                or (enf_inst and occ.inst_busy(c["hoca"], d, start, l)) \
+                                or (enf_class and occ.class_busy(c["sinif"], d, start, l)):
+                            continue
+                        if online:
+                            if not occ.online_full(d, start, l):
+                                v.append((d, start, None))
+                        else:
+                            ri = occ.free_room(d, start, l, rooms_ok)
+                            if ri is not None:
+                                v.append((d, start, ri))
+            return v
+
+        for pattern in session_patterns(L, n_days if one_per_day else None):
+            if any(not spots_for(l) for l in sorted(set(pattern), reverse=True)):
+                continue
+            chosen, budget = [], [SPLIT_NODE_LIMIT]
+
+            def dfs(k, lo):
+                l = pattern[k]
+                cand = spots_for(l)
+                for i in range(lo, len(cand)):
+                    budget[0] -= 1
+                    if budget[0] < 0:
+                        return False
+                    d, start, ri = cand[i]
+                    if any(d == d2 and (one_per_day or (start < s2 + l2 and s2 < start + l))
+                           for d2, s2, l2, _ in chosen):
+                        continue
+                    chosen.append((d, start, l, ri))
+                    # Eşit süreli ardışık oturumlar yalnızca artan aday sırasıyla (simetri)
+                    nxt = i + 1 if k + 1 < len(pattern) and pattern[k+1] == l else 0
+                    if k + 1 == len(pattern) or dfs(k + 1, nxt):
+                        return True
+                    chosen.pop()
+                return False
+
+            if dfs(0, 0):
+                for d, start, l, ri in sorted(chosen):
+                    if ri is None:
+                        occ.add(c["hoca"], c["sinif"], d, start, l)
+                        placed.append((ci, d, start, "Online", "ONLINE", l))
+                    else:
+                        occ.add(c["hoca"], c["sinif"], d, start, l, ri)
+                        placed.append((ci, d, start, "FaceToFace", search_rooms[ri]["id"], l))
+                return True
+        return False
+
+    # ---- 1) PIN'ler ----
+    pinned_ci = set()
+    for p in pins:
+        cid = p.get("id", "").strip()
+        if cid not in idx_by_id:
+            continue
+        ci = idx_by_id[cid]
+        if ci in pinned_ci:
+            continue
+        reason = place_fixed(ci, int(p.get("day", 0)), int(p.get("start", 0)),
+                             p.get("channel", "FaceToFace"), p.get("room", None))
+        if reason:
+            unplaced.append((ci, f"PIN geçersiz: {reason}"))
+        else:
+            pinned_ci.add(ci)
+
+    # ---- 1b) Korunan yerleşimler (artımlı planlama) ----
+    # Geçersiz hale gelenler sessizce bırakılır ve normal akışta yeniden yerleşir.
+    # Bölünmüş derslerin oturumları birlikte korunur ya da birlikte bırakılır.
+    kept_ci = set()
+    sessions = {}
+    for p in keep or ():
+        sessions.setdefault(p[0], []).append(p)
+    for ci, sess in sessions.items():
+        if ci in pinned_ci:
+            continue
+        if sum(p[5] for p in sess) != int(courses[ci]["sure"]) or (len(sess) > 1 and not splittable(ci)):
+            continue
+        if all(place_fixed(*p, commit=False) is None for p in sess):
+            for p in sess:
+                place_fixed(*p)
+            kept_ci.add(ci)
+    fixed_ci = pinned_ci | kept_ci
+    lap("pins")
+
+    # ---- 2) Sıralama ----
+    idx_offline = [i for i,c in enumerate(courses) if (not c["online"]) and i not in fixed_ci]
+    idx_online  = [i for i,c in enumerate(courses) if c["online"] and i not in fixed_ci]
+
+    # Tam arama: PIN'ler sabit atama; bulunamazsa (yok/sınır) kıtlık-önce greedy'ye düşülür
+    if strategy.startswith("Tam") and not reserved:
+        status, exact_placed, exact_info = exact_search(
+            days, spd, rooms, courses, inst_unav, cs, day_start_slot, day_use_slots,
+            fixed=list(placed), free_ci=idx_offline + idx_online,
+            node_limit=exact_node_limit, time_limit=exact_time_limit)
+        exact_info["status"] = status
+        if stats is not None:
+            stats["exact"] = exact_info
+        if status == "found":
+            placed.extend(exact_placed)
+            idx_offline, idx_online = [], []
+            occ_stale = True
+        lap("exact")
+
+    avail = AvailabilityIndex(n_days, spd, inst_unav, day_start_slot, day_use_slots)
+
+    def scarcity_key(i):
+        c = courses[i]
+        feas = avail.count_feasible_starts(c["hoca"], int(c["sure"]))
+        return (feas, -int(c.get("sinif", 1) == 4), -int(c["sure"]))
+
+    if rng is not None:
+        rng.shuffle(idx_offline)
+        rng.shuffle(idx_online)
+    if strategy.startswith("Kıtlık") or strategy.startswith("Tam"):
+        idx_offline.sort(key=scarcity_key)
+        idx_online.sort(key=scarcity_key)
+    else:
+        idx_offline.sort(key=lambda i: -int(courses[i]["sure"]))
+        idx_online.sort(key=lambda i: -int(courses[i]["sure"]))
+    lap("ordering")
+
+    # Sayaçlar (yerel değişkenler; döngüde sözlük erişimi olmasın)
+    n_cand = n_probe = r_window = r_unav = r_inst = r_class = r_room = r_online = n_split = 0
+    split_later = []
+
+    # ---- 3) Yerleştirme: OFFLINE ----
+    for ci in idx_offline:
+        c = courses[ci]; L = int(c["sure"])
+        rooms_ok = allowed[ci]
+        if rooms_ok == 0:
+            unplaced.append((ci, "Uygun oda yok (kapasite/özellik)"))
+            continue
+        done = False
+        for d in day_order:
+            start0, end_allowed = avail.windows[d]
+            if end_allowed < start0 or L > (end_allowed - start0 + 1):
+                r_window += 1
+                continue
+            for start in range(start0, end_allowed - L + 2):
+                n_cand += 1
+                if occ.inst_unavailable(c["hoca"], d, start, L):
+                    r_unav += 1
+                    continue
+                if enf_inst and occ.inst_busy(c["hoca"], d, start, L):
+                    r_inst += 1
+                    continue
+                if enf_class and occ.class_busy(c["sinif"], d, start, L):
+                    r_class += 1
+                    continue
+                n_probe += 1
+                chosen_ri = occ.free_room(d, start, L, rooms_ok)
+                if chosen_ri is None:
+                    r_room += 1
+                    continue
+                occ.add(c["hoca"], c["sinif"], d, start, L, chosen_ri)
+                placed.append((ci, d, start, "FaceToFace", search_rooms[chosen_ri]["id"], L))
+                done = True
+                break
+            if done: break
+        if not done:
+            if splittable(ci):
+                split_later.append(ci)
+            else:
+                unplaced.append((ci, "Uygun oda/slot (gün penceresi içinde) bulunamadı"))
+    lap("offline")
+
+    # ---- 4) Yerleştirme: ONLINE ----
+    for ci in idx_online:
+        c = courses[ci]; L = int(c["sure"])
+        done = False
+        for d in day_order:
+            start0, end_allowed = avail.windows[d]
+            if end_allowed < start0 or L > (end_allowed - start0 + 1):
+                r_window += 1
+                continue
+            for start in range(start0, end_allowed - L + 2):
+                n_cand += 1
+                if occ.inst_unavailable(c["hoca"], d, start, L):
+                    r_unav += 1
+                    continue
+                if enf_inst and occ.inst_busy(c["hoca"], d, start, L):
+                    r_inst += 1
+                    continue
+                if enf_class and occ.class_busy(c["sinif"], d, start, L):
+                    r_class += 1
+                    continue
+                if occ.online_full(d, start, L):
+                    r_online += 1
+                    continue
+                occ.add(c["hoca"], c["sinif"], d, start, L)
+                placed.append((ci, d, start, "Online", "ONLINE", L))
+                done = True
+                break
+            if done: break
+        if not done:
+            if splittable(ci):
+                split_later.append(ci)
+            else:
+                unplaced.append((ci, "Online kapasite/çakışma (gün penceresi)"))
+    lap("online")
+
+    # ---- 4a) Blok olarak sığmayan ardışık olmayan dersler: oturumlara böl ----
+    for ci in split_later:
+        online = bool(courses[ci]["online"])
+        if place_split(ci, None if online else allowed[ci]):
+            n_split += 1
+        else:
+            unplaced.append((ci, "Online kapasite/çakışma (gün penceresi)" if online else
+                                 "Uygun oda/slot (gün penceresi içinde) bulunamadı; oturumlara da bölünemedi"))
+    if split_later:
+        lap("split")
+
+    # ---- 4b) Onarım (isteğe bağlı, zaman bütçeli) ----
+    if repair_budget and float(repair_budget) > 0 and unplaced and not reserved:
+        placed, unplaced, repair_stats = repair_schedule(
+            days, spd, rooms, courses, inst_unav, cs, day_start_slot, day_use_slots,
+            placed, unplaced, fixed_ci, time_budget=float(repair_budget))
+        occ_stale = True
+        if stats is not None:
+            stats["repair"] = repair_stats
+        lap("repair")
+
+    # ---- 5) Görsel tablo verisi ----
+    grid = build_grid(placed, courses, n_days, spd, rooms)
+    timetable_df = grid_to_frame(grid, days, rooms, time_labels or {})
+    lap("grid")
+
+    # Yerleşemeyenler: PIN dışı her ders için engelleyen-kısıt analizi. Onarım
+    # yerleşimi değiştirmediyse greedy'nin bitset doluluğu aynen kullanılır.
+    targets = [ci for ci, reason in unplaced if not reason.startswith("PIN")]
+    diag = {}
+    if targets:
+        if occ_stale or not isinstance(occ, BitsetOccupancy):
+            occ = build_occupancy(placed, courses, n_days, spd, search_rooms, inst_unav, cs, reserved)
+        diag = diagnose_unplaced(targets, placed, courses, days, spd, avail, occ, cs, time_labels,
+                                 allowed=allowed)
+    diag_rows = []
+    for ci, reason in unplaced:
+        c = courses[ci]
+        info = diag.get(ci)
+        row = {
+            "id": c["id"], "ad": c["ad"], "hoca": c["hoca"], "sinif": c["sinif"],
+            "sure": c["sure"], "online": c["online"], "neden": info["neden"] if info else reason,
+            "aday": info["aday"] if info else None,
+        }
+        for k in CONSTRAINTS:
+            row[f"ret_{k}"] = info["ret"][k] if info else None
+        row["en_iyi_aday"] = ", ".join(info["en_iyi"]) if info else ""
+        row["engelleyenler"] = ", ".join(info["engelleyenler"]) if info else ""
+        diag_rows.append(row)
+    diag_df = pd.DataFrame(diag_rows, columns=DIAG_COLS)
+    lap("diagnostics")
+
+    if stats is not None:
+        stats["counters"] = {
+            "candidates": n_cand, "room_probes": n_probe, "reject_window": r_window,
+            "reject_unavailable": r_unav, "reject_instructor": r_inst, "reject_class": r_class,
+            "reject_room": r_room, "reject_online": r_online, "split_courses": n_split,
+        }
+        log_stats(stats, courses=len(courses), placed=len({p[0] for p in placed}), strategy=strategy)
+    return timetable_df, diag_df, placed, unplaced, grid
+
+def solve_state(state, strategy=None, **options):
+    """Normalize edilmiş bir durum dict'i için greedy_schedule çalıştır.
+
+    options greedy_schedule'a aynen geçer (engine, repair_budget, stats, ...).
+    """
+    return greedy_schedule(
+        state["days"], state["slots_per_day"], state["rooms"], state["courses"],
+        state["instructor_unavailable"], state["constraint_settings"],
+        day_start_slot=state["day_start_slot"],
+        day_use_slots=state["day_use_slots"],
+        pins=state["pins"],
+        strategy=strategy or state["strategy"],
+        time_labels=state["time_labels"],
+        **options,
+    )
@@ -0,0 +1,238 @@
+# ders_programi/store.py
+"""SQLite senaryo deposu: adlandırılmış durumlar ve çözülmüş programları.
+
+JSON tek parça saklanmaz; dersler, odalar, hocalar, uygunsuzluklar, PIN'ler
+ve yerleşimler senaryo kimliği (sid) ile indekslenmiş ayrı tablolara
+yazılır. Böylece listeleme yalnızca sayım sorgusu, yükleme sid indeksli
+birkaç SELECT, iki senaryonun farkı da anahtar bazında karşılaştırmadır.
+Takvim/kısıt/strateji gibi küçük alanlar `settings` sütununda JSON olarak
+durur. Yerleşimler ders ID'siyle saklanır (ders sırasından bağımsız).
+
+JSON dosyası içe/dışa aktarım biçimi olarak kalır (state_to_payload).
+"""
+import io, json, os, sqlite3, time
+
+import pandas as pd
+
+from .model import normalize_state, state_to_payload
+
+DEFAULT_DB = "senaryolar.db"
+SETTINGS_KEYS = ["days", "slots_per_day", "time_labels", "constraint_settings",
+                 "day_start_slot", "day_use_slots", "strategy", "soft_settings"]
+COURSE_FIELDS = ["ad", "hoca", "sinif", "sure", "ardisik", "online", "enrollment", "features"]
+DIFF_COLS = ["Tür", "Anahtar", "Alan", "A", "B"]
+
+SCHEMA = """
+PRAGMA foreign_keys = ON;
+CREATE TABLE IF NOT EXISTS scenarios (
+    sid      INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE,
+    updated  REAL NOT NULL,
+    settings TEXT NOT NULL,
+    diag     TEXT               -- çözüm yoksa NULL; yoksa yerleşemeyenler tablosu (JSON)
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    sid INTEGER NOT NULL REFERENCES scenarios(sid) ON DELETE CASCADE,
+    pos INTEGER NOT NULL, id TEXT NOT NULL, capacity INTEGER NOT NULL, features TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS instructors (
+    sid INTEGER NOT NULL REFERENCES scenarios(sid) ON DELETE CASCADE,
+    pos INTEGER NOT NULL, name TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS unavailable (
+    sid INTEGER NOT NULL REFERENCES scenarios(sid) ON DELETE CASCADE,
+    hoca TEXT NOT NULL, d INTEGER NOT NULL, s INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS courses (
+    sid INTEGER NOT NULL REFERENCES scenarios(sid) ON DELETE CASCADE,
+    pos INTEGER NOT NULL, id TEXT NOT NULL, ad TEXT NOT NULL, hoca TEXT NOT NULL,
+    sinif INTEGER NOT NULL, sure INTEGER NOT NULL, ardisik INTEGER NOT NULL, online INTEGER NOT NULL,
+    enrollment INTEGER NOT NULL, features TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS pins (
+    sid INTEGER NOT NULL REFERENCES scenarios(sid) ON DELETE CASCADE,
+    pos INTEGER NOT NULL, id TEXT NOT NULL, day INTEGER NOT NULL, start INTEGER NOT NULL,
+    channel TEXT NOT NULL, room TEXT);
+CREATE TABLE IF NOT EXISTS placements (
+    sid INTEGER NOT NULL REFERENCES scenarios(sid) ON DELETE CASCADE,
+    id TEXT NOT NULL, d INTEGER NOT NULL, start INTEGER NOT NULL, channel TEXT NOT NULL,
+    room TEXT NOT NULL, L INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS rooms_sid ON rooms(sid, pos);
+CREATE INDEX IF NOT EXISTS instructors_sid ON instructors(sid, pos);
+CREATE INDEX IF NOT EXISTS unavailable_sid ON unavailable(sid, hoca);
+CREATE INDEX IF NOT EXISTS courses_sid ON courses(sid, id);
+CREATE INDEX IF NOT EXISTS pins_sid ON pins(sid, id);
+CREATE INDEX IF NOT EXISTS placements_sid ON placements(sid, id);
+"""
+CHILD_TABLES = ["rooms", "instructors", "unavailable", "courses", "pins", "placements"]
+
+def default_db_path():
+    """DERS_PROGRAMI_DB ortam değişkeni ya da çalışma klasöründe senaryolar.db."""
+    return os.environ.get("DERS_PROGRAMI_DB", DEFAULT_DB)
+
+class ScenarioStore:
+    """`with ScenarioStore(yol) as store:` — kısa ömürlü bağlantı (Streamlit her çalıştırmada açar)."""
+    def __init__(self, path=None):
+        self.path = path or default_db_path()
+        self.con = sqlite3.connect(self.path)
+        self.con.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.con.close()
+
+    def _sid(self, name):
+        row = self.con.execute("SELECT sid FROM scenarios WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"Senaryo bulunamadı: {name}")
+        return row[0]
+
+    # ---------------- Yazma ----------------
+    def save(self, name, state, placed=None, diag_df=None):
+        """Senaryoyu (varsa üzerine) kaydet; placed: (ci, gün, başlangıç, kanal, oda, süre) listesi."""
+        courses = state["courses"]
+        settings = {k: state[k] for k in SETTINGS_KEYS}
+        diag = None
+        if placed is not None:
+            diag = (diag_df if diag_df is not None else pd.DataFrame()).to_json(orient="split", force_ascii=False)
+        with self.con:
+            sid = self.con.execute(
+                "INSERT INTO scenarios(name, updated, settings, diag) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET updated = excluded.updated, settings = excluded.settings, "
+                "diag = excluded.diag RETURNING sid",
+                (name, time.time(), json.dumps(settings, ensure_ascii=False), diag)).fetchone()[0]
+            for table in CHILD_TABLES:
+                self.con.execute(f"DELETE FROM {table} WHERE sid = ?", (sid,))
+            self.con.executemany("INSERT INTO rooms VALUES (?, ?, ?, ?, ?)", (
+                (sid, i, r["id"], int(r.get("capacity") or 0), ",".join(r.get("features") or []))
+                for i, r in enumerate(state["rooms"])))
+            self.con.executemany("INSERT INTO instructors VALUES (?, ?, ?)",
+                                 ((sid, i, h) for i, h in enumerate(state["instructors"])))
+            self.con.executemany("INSERT INTO unavailable VALUES (?, ?, ?, ?)", (
+                (sid, h, int(d), int(s)) for h, slots in state["instructor_unavailable"].items()
+                for d, s in sorted(slots)))
+            self.con.executemany("INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                (sid, i, c["id"], c["ad"], c["hoca"], int(c["sinif"]), int(c["sure"]), bool(c["ardisik"]),
+                 bool(c["online"]), int(c.get("enrollment") or 0), ",".join(c.get("features") or []))
+                for i, c in enumerate(courses)))
+            self.con.executemany("INSERT INTO pins VALUES (?, ?, ?, ?, ?, ?, ?)", (
+                (sid, i, str(p.get("id", "")), int(p.get("day", 0)), int(p.get("start", 0)),
+                 str(p.get("channel", "FaceToFace")), p.get("room"))
+                for i, p in enumerate(state["pins"])))
+            if placed is not None:
+                self.con.executemany("INSERT INTO placements VALUES (?, ?, ?, ?, ?, ?, ?)", (
+                    (sid, courses[ci]["id"], d, start, ch, rm, L) for ci, d, start, ch, rm, L in placed))
+        return sid
+
+    def delete(self, name):
+        with self.con:
+            self.con.execute("DELETE FROM scenarios WHERE sid = ?", (self._sid(name),))
+
+    # ---------------- Okuma ----------------
+    def list_scenarios(self):
+        """Senaryo özeti (en son güncellenen önce)."""
+        rows = self.con.execute("""
+            SELECT s.name, s.updated,
+                   (SELECT COUNT(*) FROM courses c WHERE c.sid = s.sid),
+                   (SELECT COUNT(*) FROM rooms r WHERE r.sid = s.sid),
+                   (SELECT COUNT(*) FROM instructors i WHERE i.sid = s.sid),
+                   CASE WHEN s.diag IS NULL THEN NULL
+                        ELSE (SELECT COUNT(DISTINCT p.id) FROM placements p WHERE p.sid = s.sid) END
+            FROM scenarios s ORDER BY s.updated DESC""").fetchall()
+        df = pd.DataFrame(rows, columns=["Senaryo", "Güncelleme", "Ders", "Oda", "Hoca", "Yerleşen"])
+        df["Yerleşen"] = df["Yerleşen"].astype("Int64")
+        df["Güncelleme"] = pd.to_datetime(df["Güncelleme"], unit="s").dt.strftime("%Y-%m-%d %H:%M")
+        return df
+
+    def names(self):
+        return [r[0] for r in self.con.execute("SELECT name FROM scenarios ORDER BY updated DESC")]
+
+    def _payload(self, sid):
+        settings = json.loads(self.con.execute("SELECT settings FROM scenarios WHERE sid = ?", (sid,)).fetchone()[0])
+        q = lambda sql: self.con.execute(sql, (sid,)).fetchall()
+        instructors = [h for h, in q("SELECT name FROM instructors WHERE sid = ? ORDER BY pos")]
+        unav = {h: [] for h in instructors}
+        for h, d, s in q("SELECT hoca, d, s FROM unavailable WHERE sid = ?"):
+            unav.setdefault(h, []).append((d, s))
+        pins = []
+        for pid, day, start, ch, room in q("SELECT id, day, start, channel, room FROM pins WHERE sid = ? ORDER BY pos"):
+            pin = {"id": pid, "day": day, "start": start, "channel": ch}
+            if room is not None:
+                pin["room"] = room
+            pins.append(pin)
+        return dict(settings,
+            rooms=[{"id": i, "capacity": cap, "features": feat}
+                   for i, cap, feat in q("SELECT id, capacity, features FROM rooms WHERE sid = ? ORDER BY pos")],
+            instructors=instructors,
+            instructor_unavailable=unav,
+            courses=[dict(zip(["id"] + COURSE_FIELDS, row)) for row in q(
+                f"SELECT id, {', '.join(COURSE_FIELDS)} FROM courses WHERE sid = ? ORDER BY pos")],
+            pins=pins)
+
+    def load(self, name):
+        """(normalize edilmiş durum, yerleşim ya da None, yerleşemeyenler tablosu ya da None)."""
+        sid = self._sid(name)
+        state = normalize_state(self._payload(sid))
+        diag = self.con.execute("SELECT diag FROM scenarios WHERE sid = ?", (sid,)).fetchone()[0]
+        if diag is None:
+            return state, None, None
+        index = {c["id"]: ci for ci, c in enumerate(state["courses"])}
+        placed = [(index[cid], d, start, ch, rm, L) for cid, d, start, ch, rm, L in self.con.execute(
+            "SELECT id, d, start, channel, room, L FROM placements WHERE sid = ? ORDER BY rowid", (sid,))
+            if cid in index]
+        return state, placed, pd.read_json(io.StringIO(diag), orient="split")
+
+    def export_payload(self, name):
+        """Senaryoyu timetable_state.json biçiminde döndür."""
+        return state_to_payload(self.load(name)[0])
+
+    # ---------------- Fark ----------------
+    def _keyed(self, sid, sql):
+        out = {}
+        for key, *rest in self.con.execute(sql, (sid,)):
+            out.setdefault(key, []).append(tuple(rest))
+        return out
+
+    def diff(self, a, b):
+        """İki senaryonun farkı: Tür, Anahtar, Alan, A, B (DataFrame)."""
+        sa, sb = self._sid(a), self._sid(b)
+        rows = []
+
+        def compare(tur, left, right, fields=None):
+            for key in sorted(left.keys() | right.keys(), key=str):
+                x, y = left.get(key), right.get(key)
+                if x == y:
+                    continue
+                if x is None or y is None or fields is None:
+                    rows.append((tur, key, "" if x and y else ("silindi" if y is None else "eklendi"),
+                                 _fmt(x), _fmt(y)))
+                    continue
+                for f, vx, vy in zip(fields, x, y):
+                    if vx != vy:
+                        rows.append((tur, key, f, _fmt(vx), _fmt(vy)))
+
+        settings = [json.loads(self.con.execute("SELECT settings FROM scenarios WHERE sid = ?", (s,)).fetchone()[0])
+                    for s in (sa, sb)]
+        compare("Ayar", *({k: (v,) for k, v in s.items()} for s in settings), fields=["değer"])
+        compare("Oda", *(self._keyed(s, "SELECT id, capacity, features FROM rooms WHERE sid = ?") for s in (sa, sb)))
+        compare("Hoca", *(self._keyed(s, "SELECT name FROM instructors WHERE sid = ?") for s in (sa, sb)))
+        cols = ", ".join(COURSE_FIELDS)
+        compare("Ders", *({k: v[0] for k, v in self._keyed(s, f"SELECT id, {cols} FROM courses WHERE sid = ?").items()}
+                          for s in (sa, sb)), fields=COURSE_FIELDS)
+        compare("PIN", *(self._keyed(s, "SELECT id, day, start, channel, room FROM pins WHERE sid = ? ORDER BY pos")
+                         for s in (sa, sb)))
+        compare("Uygunsuzluk", *({h: sorted(v) for h, v in self._keyed(
+            s, "SELECT hoca, d, s FROM unavailable WHERE sid = ?").items()} for s in (sa, sb)))
+        compare("Yerleşim", *({k: sorted(v) for k, v in self._keyed(
+            s, "SELECT id, d, start, channel, room, L FROM placements WHERE sid = ?").items()} for s in (sa, sb)))
+        return pd.DataFrame(rows, columns=DIFF_COLS)
+
+def _fmt(v):
+    if v is None:
+        return ""
+    if isinstance(v, list) and len(v) == 1:
+        v = v[0]
+    if isinstance(v, tuple) and len(v) <= 1:
+        v = v[0] if v else "✓"
+    return v if isinstance(v, str) else json.dumps(v, ensure_ascii=False)
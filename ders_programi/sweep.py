@@ -0,0 +1,205 @@
+# ders_programi/sweep.py
+"""Ne olur? taramaları: parametre kombinasyonlarını süreç havuzunda çöz.
+
+Tarama tanımı {parametre: [değerler]}; tüm kombinasyonlar (kartezyen çarpım)
+greedy ile çözülür. Parametreler:
+- constraint_settings anahtarları: online_cap, max_per_room, enf_..., split_...;
+- "day_use_slots:<gün>" / "day_start_slot:<gün>": o günün penceresi (gün 0'dan);
+- "drop_rooms": çıkarılacak oda ID'leri ("Oda-1+Oda-2"; "-" = hiçbiri);
+- "strategy".
+Her kombinasyonun etkin durumu (varsayılanlarla tamamlanmış kısıtlar, slot
+sayısına kırpılmış gün pencereleri, kalan odalar, strateji) ile çözüm
+seçenekleri özetlenir; aynı özeti veren kombinasyonlar tek kez çözülür.
+Sonuçlar modül düzeyinde LRU önbellekte (CACHE_SIZE) tutulur, sonraki
+taramalar da aynı alt çalıştırmaları yeniden çözmez.
+"""
+import hashlib, itertools, json, os, time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .model import STRATEGIES, _to_bool, default_constraint_settings, state_to_payload
+from .scoring import soft_score
+from .solver import solve_state
+
+CACHE_SIZE = 64
+PARALLEL_RUNS = 16  # workers verilmezse süreç havuzu ancak bu kadar yeni çalıştırmada açılır
+DAY_PARAMS = ["day_use_slots", "day_start_slot"]
+METRIC_COLS = ["Yerleşen", "Yerleşme (%)", "Yerleşemeyen", "Oda doluluğu (%)", "Yumuşak puan", "Süre (sn)"]
+_CACHE = OrderedDict()
+
+# ====================== Tanım ======================
+
+def _parse_value(param, text):
+    text = text.strip()
+    if param == "strategy":
+        hits = [s for s in STRATEGIES if s == text] or [s for s in STRATEGIES if s.lower().startswith(text.lower())]
+        if len(hits) != 1:
+            raise ValueError(f"strategy: '{text}' tanınmadı ({' / '.join(STRATEGIES)})")
+        return hits[0]
+    if param == "drop_rooms":
+        return tuple(x.strip() for x in text.split("+") if x.strip() not in ("", "-"))
+    default = default_constraint_settings().get(param)
+    if isinstance(default, bool):
+        return _to_bool(text)
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"{param}: '{text}' tam sayı değil") from None
+
+def _check_param(param, n_days=None):
+    name, _, day = param.partition(":")
+    if name in DAY_PARAMS:
+        if not day.strip().isdigit():
+            raise ValueError(f"{param}: gün numarası gerekli (ör. {name}:4)")
+        if n_days is not None and int(day) >= n_days:
+            raise ValueError(f"{param}: gün numarası 0..{n_days - 1} aralığında olmalı")
+    elif param not in default_constraint_settings() and param not in ("drop_rooms", "strategy"):
+        raise ValueError(f"Bilinmeyen parametre: {param}")
+
+def parse_spec(text, state=None):
+    """'parametre = d1, d2, ...' satırlarını tarama tanımına çevir; 'a..b' aralığı tam sayılar içindir.
+
+    state verilirse gün numaraları ve drop_rooms oda ID'leri de ona göre doğrulanır.
+    """
+    n_days = len(state["days"]) if state is not None else None
+    room_ids = {r["id"] for r in state["rooms"]} if state is not None else None
+    spec = {}
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        param, sep, values = line.partition("=")
+        param = param.strip()
+        if not sep:
+            raise ValueError(f"'{line}': 'parametre = değerler' biçiminde olmalı")
+        _check_param(param, n_days)
+        out = []
+        for item in values.split(","):
+            lo, dots, hi = item.partition("..")
+            if dots:
+                out.extend(range(int(lo), int(hi) + 1))
+            elif item.strip() or param == "drop_rooms":
+                out.append(_parse_value(param, item))
+        if param == "drop_rooms" and room_ids is not None:
+            unknown = [rid for value in out for rid in value if rid not in room_ids]
+            if unknown:
+                raise ValueError(f"drop_rooms: bilinmeyen oda ID'leri: {', '.join(dict.fromkeys(unknown))}")
+        spec[param] = list(dict.fromkeys(out))
+    return spec
+
+def expand(spec):
+    """Tüm kombinasyonlar: [{parametre: değer}] (tanım sırasıyla)."""
+    keys = list(spec)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(spec[k] for k in keys))]
+
+def apply_variant(state, variant):
+    """Kombinasyonu uygulanmış yeni durum (giriş durumu değişmez)."""
+    cs = dict(default_constraint_settings(), **state["constraint_settings"])
+    out = dict(state, constraint_settings=cs, day_use_slots=dict(state["day_use_slots"]),
+               day_start_slot=dict(state["day_start_slot"]))
+    for param, value in variant.items():
+        name, _, day = param.partition(":")
+        if name in DAY_PARAMS:
+            out[name][int(day)] = int(value)
+        elif param == "drop_rooms":
+            out["rooms"] = [r for r in out["rooms"] if r["id"] not in value]
+        elif param == "strategy":
+            out["strategy"] = value
+        else:
+            cs[param] = value
+    return out
+
+def _digest(base, state, options):
+    """Temel durum özeti + kombinasyonun etkin alanları + çözüm seçenekleri."""
+    spd, n_days = state["slots_per_day"], len(state["days"])
+    windows = []
+    for d in range(n_days):
+        start = int(state["day_start_slot"].get(d, 0))
+        windows.append((start, max(0, min(spd, start + int(state["day_use_slots"].get(d, spd))) - start)))
+    effective = [state["constraint_settings"], windows, [r["id"] for r in state["rooms"]],
+                 state["strategy"], sorted(options.items())]
+    return hashlib.sha1((base + json.dumps(effective, sort_keys=True, default=str)).encode()).hexdigest()
+
+def state_digest(state):
+    payload = state_to_payload(state)
+    payload.pop("_version")
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+# ====================== Çalıştırma ======================
+
+_STATE = None
+_OPTIONS = None
+
+def _init_worker(state, options):
+    global _STATE, _OPTIONS
+    _STATE, _OPTIONS = state, options
+
+def _run(variant):
+    state = apply_variant(_STATE, variant)
+    t0 = time.perf_counter()
+    _, diag_df, placed, _, _ = solve_state(state, **_OPTIONS)
+    seconds = time.perf_counter() - t0
+    courses, n = state["courses"], len(state["courses"])
+    n_placed = len({p[0] for p in placed})
+    spd = state["slots_per_day"]
+    window = sum(max(0, min(spd, int(state["day_start_slot"].get(d, 0)) + int(state["day_use_slots"].get(d, spd)))
+                     - int(state["day_start_slot"].get(d, 0))) for d in range(len(state["days"])))
+    room_slots = len(state["rooms"]) * window * int(state["constraint_settings"]["max_per_room"])
+    used = sum(L for _, _, _, ch, _, L in placed if ch != "Online")
+    metrics = {"Yerleşen": n_placed, "Yerleşme (%)": round(100 * n_placed / n, 1) if n else 100.0,
+               "Yerleşemeyen": n - n_placed,
+               "Oda doluluğu (%)": round(100 * used / room_slots, 1) if room_slots else 0.0,
+               "Yumuşak puan": round(soft_score(placed, courses, len(state["days"]), spd,
+                                                state["soft_settings"])[0], 2),
+               "Süre (sn)": round(seconds, 3)}
+    return placed, diag_df, metrics
+
+def _fmt(value):
+    if isinstance(value, tuple):
+        return "+".join(value) or "-"
+    return value
+
+def sweep_schedule(state, spec, workers=None, **options):
+    """Tüm kombinasyonları çöz: (karşılaştırma tablosu, çalıştırmalar).
+
+    Tablo satırı başına bir kombinasyon (# = çalıştırmalar listesindeki sıra);
+    çalıştırma: {"variant", "placed", "diag_df", "metrics", "cached"}.
+    options solve_state'e aynen geçer (stats hariç). workers=None iken seri
+    çözülür; yeni çalıştırma sayısı PARALLEL_RUNS ve üzeriyse çekirdek sayısı
+    kadar süreç kullanılır.
+    """
+    options = {k: v for k, v in options.items() if k != "stats"}
+    variants = expand(spec)
+    base = state_digest(state)
+    keys = [_digest(base, apply_variant(state, v), options) for v in variants]
+    todo = {}
+    for key, v in zip(keys, variants):
+        if key not in _CACHE and key not in todo:
+            todo[key] = v
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(todo) >= PARALLEL_RUNS else 1
+    workers = min(len(todo), workers)
+    if workers <= 1:
+        _init_worker(state, options)
+        results = [_run(v) for v in todo.values()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(state, options)) as ex:
+            results = list(ex.map(_run, todo.values()))
+    fresh = dict(zip(todo, results))
+    for key, res in fresh.items():
+        _CACHE[key] = res
+    runs, seen = [], set()
+    for key, v in zip(keys, variants):
+        placed, diag_df, metrics = fresh.get(key) or _CACHE[key]
+        _CACHE.move_to_end(key)
+        runs.append({"variant": v, "placed": placed, "diag_df": diag_df, "metrics": metrics,
+                     "cached": key not in fresh or key in seen})
+        seen.add(key)
+    while len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    table = pd.DataFrame([{"#": i, **{k: _fmt(v) for k, v in r["variant"].items()}, **r["metrics"],
+                           "Önbellek": r["cached"]} for i, r in enumerate(runs)])
+    return table, runs
@@ -0,0 +1,191 @@
+# ders_programi/synthetic.py
+"""Tohumlu sentetik örnek üretici (build_state_payload şemasında JSON).
+
+Aynı parametreler ve tohum her zaman aynı durumu üretir. Gerçekçilik için:
+hoca yükleri çarpık dağılır (az sayıda hoca çok ders verir) ama hiçbir hocanın
+yükü gün pencereleri içindeki uygun slot sayısını aşmaz, dersler birden çok
+bölümün sınıflarına (sınıf kodu 10*bölüm + yıl) dağıtılır, uygunsuzluklar
+tek tek slot yerine blok hâlinde (yarım gün, tam gün) seçilir, ders süreleri
+çoğunlukla 2–3 saattir ve PIN'ler birbiriyle çakışmayan geçerli yerlere konur.
+capacities=True iken odalara kapasite (bir kısmına "lab" özelliği), derslere
+öğrenci sayısı verilir; bu değerler ayrı bir tohumdan çekilir, böylece diğer
+alanlar capacities=False ile aynı kalır.
+"""
+import random
+
+from .model import DEFAULT_DAYS, DEFAULT_STRATEGY, default_constraint_settings, default_soft_settings, state_to_payload
+from .occupancy import room_fits
+
+DURATION_WEIGHTS = {1: 2, 2: 4, 3: 3, 4: 1}
+ROOM_CAPACITIES = {30: 3, 50: 4, 80: 3, 120: 2, 200: 1}
+
+def case_name(n_courses, n_rooms, n_instructors, seed):
+    return f"c{n_courses}-r{n_rooms}-h{n_instructors}-s{seed}"
+
+def default_sizes(n_courses):
+    """Ders sayısına göre makul oda ve hoca sayısı."""
+    return max(2, n_courses // 15), max(3, n_courses // 6)
+
+COHORT_LOAD = 0.6  # bir sınıfın haftalık ders saati / gün penceresi (varsayılan bölüm sayısı için)
+
+def _block_unavailability(r, n_days, spd, unavailable):
+    """Hedef orana ulaşana kadar blok blok uygunsuz slot seç."""
+    target = int(round(unavailable * n_days * spd))
+    out = set()
+    while len(out) < target:
+        d = r.randrange(n_days)
+        if r.random() < 0.15:
+            start, L = 0, spd                      # tam gün
+        else:
+            L = r.randint(1, max(1, spd // 2))     # yarım güne kadar blok
+            start = r.randrange(spd - L + 1)
+        out.update((d, s) for s in range(start, start+L))
+    return out
+
+def generate_state(n_courses=1000, n_rooms=None, n_instructors=None, seed=0, n_days=5, slots_per_day=10,
+                   availability=0.8, online_share=0.2, n_pins=0, max_per_room=1, online_cap=None,
+                   enf_class_no_overlap=None, capacities=False, n_departments=None):
+    """Sentetik bir durumun JSON payload'ını döndür (normalize_state ile yüklenebilir).
+
+    availability: hocaların uygun olduğu slotların ortalama oranı (0–1).
+    n_departments=None iken bölüm sayısı, her sınıfın (bölüm × yıl) haftalık
+    yükü gün penceresinin ~COHORT_LOAD katı olacak şekilde seçilir; böylece
+    sınıf çakışması kuralı büyük örneklerde de açık kalabilir.
+    enf_class_no_overlap=None iken kural, en yüklü sınıfın saatleri
+    pencereye sığıyorsa açılır.
+    """
+    default_rooms, default_inst = default_sizes(n_courses)
+    n_rooms = default_rooms if n_rooms is None else int(n_rooms)
+    n_instructors = default_inst if n_instructors is None else int(n_instructors)
+    r = random.Random(f"{seed}-{n_courses}-{n_rooms}-{n_instructors}")
+    spd = int(slots_per_day)
+
+    days = (DEFAULT_DAYS + [f"Gün-{i+1}" for i in range(len(DEFAULT_DAYS), n_days)])[:n_days]
+    rooms = [{"id": f"Derslik-{i+1:03d}"} for i in range(n_rooms)]
+    instructors = [f"Hoca-{i+1:04d}" for i in range(n_instructors)]
+
+    day_start_slot = {d: 0 for d in range(n_days)}
+    day_use_slots = {d: spd for d in range(n_days)}
+    if n_days >= 5:
+        day_use_slots[n_days-1] = max(1, spd - 3)  # son gün kısa
+    window = [(d, s) for d in range(n_days)
+              for s in range(day_start_slot[d], min(spd, day_start_slot[d] + day_use_slots[d]))]
+
+    # Hoca başına ortalama uygunsuzluk oranı etrafında saçılım
+    inst_unav = {}
+    for h in instructors:
+        u = min(0.9, max(0.0, r.gauss(1.0 - availability, 0.1)))
+        inst_unav[h] = _block_unavailability(r, n_days, spd, u) if u > 0 else set()
+
+    durations, dweights = list(DURATION_WEIGHTS), list(DURATION_WEIGHTS.values())
+    lengths = r.choices(durations, weights=dweights, k=n_courses)
+    if n_departments is None:
+        n_departments = max(1, -(-sum(lengths) // int(4 * COHORT_LOAD * len(window) or 1)))
+
+    # Her sınıfa (bölüm × yıl) eşit sayıda ders, karışık sırayla
+    cohorts = [10*dep + year for dep in range(n_departments) for year in range(1, 5)]
+    cohort_of = [cohorts[i % len(cohorts)] for i in range(n_courses)]
+    r.shuffle(cohort_of)
+
+    # Çarpık yük, hocanın penceredeki uygun slot sayısıyla sınırlı; dolan hoca çekilişten çıkar
+    free = {h: sum(ds not in inst_unav[h] for ds in window) for h in instructors}
+    weights = [r.paretovariate(1.5) if free[h] else 0.0 for h in instructors]
+    load = dict.fromkeys(instructors, 0)
+    courses = []
+    for i, L in enumerate(lengths):
+        h = None
+        for _ in range(50):
+            if not any(weights):
+                break
+            k = r.choices(range(len(instructors)), weights=weights)[0]
+            if load[instructors[k]] + L <= free[instructors[k]]:
+                h = instructors[k]
+                break
+            if free[instructors[k]] - load[instructors[k]] < min(durations):
+                weights[k] = 0.0
+        if h is None:  # kapasite tükendiyse en boş hoca (örnek bilerek aşırı yüklü)
+            h = max(instructors, key=lambda x: free[x] - load[x])
+        load[h] += L
+        courses.append({
+            "id": f"D{i+1:05d}",
+            "ad": f"Ders {i+1}",
+            "hoca": h,
+            "sinif": cohort_of[i],
+            "sure": L,
+            "ardisik": L == 1 or r.random() < 0.8,
+            "online": r.random() < online_share,
+        })
+
+    if capacities:
+        rc = random.Random(f"{seed}-{n_courses}-{n_rooms}-kapasite")
+        caps, cweights = list(ROOM_CAPACITIES), list(ROOM_CAPACITIES.values())
+        for room in rooms:
+            room["capacity"] = rc.choices(caps, weights=cweights)[0]
+            room["features"] = ["lab"] if rc.random() < 0.1 else []
+        if rooms and not any(room["features"] for room in rooms):
+            rooms[0]["features"] = ["lab"]
+        largest = max((room["capacity"] for room in rooms), default=0)
+        for c in courses:
+            c["enrollment"] = min(largest, int(rc.lognormvariate(3.5, 0.6)))
+            c["features"] = ["lab"] if not c["online"] and rc.random() < 0.05 else []
+
+    cs = default_constraint_settings()
+    cs["max_per_room"] = int(max_per_room)
+    cs["online_cap"] = max(1, n_courses // 100) if online_cap is None else int(online_cap)
+
+    if enf_class_no_overlap is None:
+        cohort_hours = {}
+        for c in courses:
+            cohort_hours[c["sinif"]] = cohort_hours.get(c["sinif"], 0) + c["sure"]
+        enf_class_no_overlap = max(cohort_hours.values(), default=0) <= len(window)
+    cs["enf_class_no_overlap"] = bool(enf_class_no_overlap)
+
+    # Geçerli, çakışmasız PIN'ler
+    pins, used, online_load = [], set(), {}
+    for ci in r.sample(range(n_courses), min(n_pins, n_courses)):
+        c = courses[ci]
+        for _ in range(20):
+            d = r.randrange(n_days)
+            hi = day_start_slot[d] + day_use_slots[d] - c["sure"]
+            if hi < day_start_slot[d]:
+                continue
+            start = r.randint(day_start_slot[d], hi)
+            fit = [x for x in rooms if room_fits(x, c)] if capacities else rooms
+            room = "ONLINE" if c["online"] else r.choice(fit)["id"] if fit else None
+            if room is None:
+                break
+            slots = [(d, s) for s in range(start, start+c["sure"])]
+            keys = [k for ds in slots for k in (("h", c["hoca"], ds), ("s", c["sinif"], ds))]
+            if room == "ONLINE":
+                if any(online_load.get(ds, 0) >= cs["online_cap"] for ds in slots):
+                    continue
+            else:
+                keys += [("r", room, ds) for ds in slots]
+            if any(ds in inst_unav[c["hoca"]] for ds in slots) or any(k in used for k in keys):
+                continue
+            used.update(keys)
+            if room == "ONLINE":
+                for ds in slots:
+                    online_load[ds] = online_load.get(ds, 0) + 1
+            pin = {"id": c["id"], "day": d, "start": start,
+                   "channel": "Online" if c["online"] else "FaceToFace"}
+            if not c["online"]:
+                pin["room"] = room
+            pins.append(pin)
+            break
+
+    return state_to_payload({
+        "days": days,
+        "slots_per_day": spd,
+        "time_labels": {i: f"{9+i:02d}:00" for i in range(spd)},
+        "rooms": rooms,
+        "instructors": instructors,
+        "instructor_unavailable": inst_unav,
+        "courses": courses,
+        "constraint_settings": cs,
+        "day_start_slot": day_start_slot,
+        "day_use_slots": day_use_slots,
+        "pins": pins,
+        "strategy": DEFAULT_STRATEGY,
+        "soft_settings": default_soft_settings(),
+    })
@@ -0,0 +1,5 @@
+# tests/conftest.py
+import os, sys
+
+# `pytest` doğrudan çalıştırıldığında da paket bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
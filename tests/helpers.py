@@ -0,0 +1,84 @@
+# tests/helpers.py
+"""Testlerin ortak yardımcıları: küçük durum kurucular ve yerleşim denetleyicisi."""
+from ders_programi import default_constraint_settings, generate_state, normalize_state
+from ders_programi.occupancy import room_fits
+
+def synthetic(**kw):
+    return normalize_state(generate_state(**kw))
+
+def tiny_state(courses, rooms=("R1",), n_days=1, spd=4, unavailable=None, pins=(), **cs):
+    """Elle kurulan küçük durum; courses: dict listesi (id/hoca/sinif/sure yeterli)."""
+    settings = dict(default_constraint_settings(), **cs)
+    return normalize_state({
+        "days": [f"G{d}" for d in range(n_days)], "slots_per_day": spd,
+        "rooms": [r if isinstance(r, dict) else {"id": r} for r in rooms],
+        "instructors": sorted({c["hoca"] for c in courses}),
+        "instructor_unavailable": {h: sorted(v) for h, v in (unavailable or {}).items()},
+        "courses": [dict({"ad": c["id"], "sinif": 1, "sure": 1}, **c) for c in courses],
+        "constraint_settings": settings, "pins": list(pins),
+    })
+
+def plan_errors(state, placed, unplaced, reserved=()):
+    """Yerleşimin ihlal ettiği kısıtların listesi (boş liste => geçerli)."""
+    courses, spd, cs = state["courses"], state["slots_per_day"], state["constraint_settings"]
+    rooms = {r["id"]: r for r in state["rooms"]}
+    errors = []
+    sessions = {}
+    for p in placed:
+        sessions.setdefault(p[0], []).append(p)
+    failed = {ci for ci, reason in unplaced if not reason.startswith("PIN")}
+    if failed & sessions.keys():
+        errors.append(f"hem yerleşmiş hem yerleşemeyen: {sorted(failed & sessions.keys())}")
+    if set(range(len(courses))) - failed - sessions.keys():
+        errors.append(f"kayıp dersler: {sorted(set(range(len(courses))) - failed - sessions.keys())}")
+
+    for ci, sess in sessions.items():
+        c = courses[ci]
+        if sum(p[5] for p in sess) != c["sure"]:
+            errors.append(f"{c['id']}: oturum toplamı süreye eşit değil")
+        if len(sess) > 1:
+            if c["ardisik"] or not cs.get("split_sessions", True):
+                errors.append(f"{c['id']}: bölünmemesi gerekirken bölünmüş")
+            days = [p[1] for p in sess]
+            if cs.get("split_one_per_day", True) and len(set(days)) != len(days):
+                errors.append(f"{c['id']}: aynı günde birden çok oturum")
+        if c["online"] and any(p[3] != "Online" for p in sess):
+            errors.append(f"{c['id']}: online ders yüz yüze yerleşmiş")
+
+    room_load, online_load, inst, cls = {}, {}, {}, {}
+    for rm, d, start, L in reserved:
+        for s in range(start, start + L):
+            room_load[rm, d, s] = room_load.get((rm, d, s), 0) + 1
+    for ci, d, start, ch, rm, L in placed:
+        c = courses[ci]
+        start0 = int(state["day_start_slot"].get(d, 0))
+        end = min(spd, start0 + int(state["day_use_slots"].get(d, spd)))
+        if start < start0 or start + L > end:
+            errors.append(f"{c['id']}: gün penceresi dışında")
+        if ch != "Online":
+            if rm not in rooms:
+                errors.append(f"{c['id']}: bilinmeyen oda {rm}")
+            elif not room_fits(rooms[rm], c):
+                errors.append(f"{c['id']}: oda uygun değil ({rm})")
+        for s in range(start, start + L):
+            if (d, s) in state["instructor_unavailable"].get(c["hoca"], ()):
+                errors.append(f"{c['id']}: hoca uygunsuz saat")
+            if ch == "Online":
+                online_load[d, s] = online_load.get((d, s), 0) + 1
+            else:
+                room_load[rm, d, s] = room_load.get((rm, d, s), 0) + 1
+            inst.setdefault((c["hoca"], d, s), set()).add(ci)
+            cls.setdefault((c["sinif"], d, s), set()).add(ci)
+    if any(n > int(cs["max_per_room"]) for n in room_load.values()):
+        errors.append("oda kapasitesi aşıldı")
+    if any(n > int(cs["online_cap"]) for n in online_load.values()):
+        errors.append("online kapasite aşıldı")
+    # Aynı dersin oturumları kendi arasında çakışmaz; bu yüzden slot başına tek yerleşim
+    if any(len(v) > 1 for v in inst.values()) and cs["enf_instructor_no_overlap"]:
+        errors.append("hoca çakışması")
+    if any(len(v) > 1 for v in cls.values()) and cs["enf_class_no_overlap"]:
+        errors.append("sınıf çakışması")
+    return errors
+
+def n_unplaced(result):
+    return len({ci for ci, _ in result[3]} - {p[0] for p in result[2]})
@@ -0,0 +1,38 @@
+# tests/test_availability.py
+import io
+
+from ders_programi import (
+    availability_frame, block_slots, copy_pattern, grid_to_unavailability, import_availability, unavailability_grid,
+)
+
+DAYS = ["Pzt", "Sal", "Çar"]
+LABELS = {0: "09:00", 1: "10:00", 2: "11:00", 3: "12:00"}
+
+def test_grid_round_trip():
+    slots = {(0, 1), (2, 3), (1, 0)}
+    df = unavailability_grid(slots, DAYS, LABELS, 4)
+    assert list(df.columns) == ["Saat"] + DAYS and df.shape == (4, 4)
+    assert grid_to_unavailability(df) == slots
+
+def test_bulk_operations():
+    unav = {"A": {(0, 0)}, "B": set()}
+    copied = copy_pattern(unav, "A", ["B", "C"])
+    assert copied["B"] == copied["C"] == {(0, 0)} and copied["B"] is not unav["A"]
+    blocked = block_slots(unav, ["B"], [1], [], 3, 4)
+    assert blocked["B"] == {(1, s) for s in range(4)} and unav["B"] == set()
+    assert block_slots(blocked, ["B"], [], [2], 3, 4, block=False)["B"] == {(1, 0), (1, 1), (1, 3)}
+
+def test_frame_import_round_trip():
+    unav = {"A": {(0, 1), (2, 3)}, "B": {(1, 0)}}
+    csv = availability_frame(unav, ["A", "B"], DAYS, LABELS, 4).to_csv(index=False)
+    out = import_availability(io.StringIO(csv), "u.csv", {}, ["A", "B"], DAYS, LABELS, 4)
+    assert out["unavailable"] == unav and out["rejected"] == 0 and out["instructors"] == ["A", "B"]
+
+def test_import_wildcards_numbers_and_errors():
+    csv = "hoca,gun,slot\nA,2,\nA,,10:00\nYeni,pzt,1\nA,Paz,1\n,Sal,1\n"
+    out = import_availability(io.StringIO(csv), "u.csv", {"A": {(2, 2)}}, ["A"], DAYS, LABELS, 4)
+    assert out["unavailable"]["A"] == {(1, s) for s in range(4)} | {(d, 1) for d in range(3)}
+    assert out["unavailable"]["Yeni"] == {(0, 0)} and out["new_instructors"] == ["Yeni"]
+    assert out["rejected"] == 2 and list(out["report"]["Satır"]) == [4, 5, 6]
+    merged = import_availability(io.StringIO(csv), "u.csv", {"A": {(2, 2)}}, ["A"], DAYS, LABELS, 4, replace=False)
+    assert (2, 2) in merged["unavailable"]["A"]
@@ -0,0 +1,33 @@
+# tests/test_cli.py
+import json
+
+from ders_programi import normalize_state, state_to_payload
+from ders_programi.cli import main
+from helpers import tiny_state
+
+def _write_state(tmp_path, name="bolum"):
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 2}, {"id": "B", "hoca": "h2", "sinif": 2, "online": True}],
+                       n_days=2, spd=4)
+    path = tmp_path / f"{name}.json"
+    path.write_text(json.dumps(state_to_payload(state), ensure_ascii=False), encoding="utf-8")
+    return state, path
+
+def test_payload_round_trip(tmp_path):
+    state, path = _write_state(tmp_path)
+    assert normalize_state(json.loads(path.read_text(encoding="utf-8"))) == state
+
+def test_plan_writes_every_format(tmp_path, capsys):
+    _, path = _write_state(tmp_path)
+    out = tmp_path / "cikti"
+    assert main(["plan", str(path), "-o", str(out)]) == 0
+    assert sorted(p.name for p in out.iterdir()) == ["bolum.csv", "bolum.pdf", "bolum.xlsx", "bolum_yerlesemeyen.csv"]
+    assert (out / "bolum.pdf").read_bytes().startswith(b"%PDF")
+    assert "Yerleşen ders: 2/2" in capsys.readouterr().out
+
+def test_plan_reports_bad_file_and_continues(tmp_path, capsys):
+    _, path = _write_state(tmp_path)
+    bad = tmp_path / "bozuk.json"
+    bad.write_text("{", encoding="utf-8")
+    assert main(["plan", str(bad), str(path), "-o", str(tmp_path), "-f", "csv"]) == 1
+    captured = capsys.readouterr()
+    assert "bozuk.json: HATA" in captured.err and "Yerleşen ders: 2/2" in captured.out
@@ -0,0 +1,25 @@
+# tests/test_diagnostics.py
+from ders_programi import solve_state
+from ders_programi.diagnostics import CONSTRAINTS
+from helpers import synthetic, tiny_state
+
+def test_blocker_named_for_room_clash():
+    state = tiny_state([{"id": "A", "hoca": "h1"}, {"id": "B", "hoca": "h2", "sinif": 2}], spd=1)
+    _, diag_df, _, unplaced, _ = solve_state(state)
+    row = diag_df.iloc[0]
+    assert [ci for ci, _ in unplaced] == [1] and row["id"] == "B"
+    assert row["aday"] == 1 and row["ret_oda"] == 1 and row["engelleyenler"] == "A"
+    assert "boş oda yok" in row["neden"]
+
+def test_course_longer_than_day():
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 5}], spd=4)
+    _, diag_df, _, _, _ = solve_state(state)
+    assert "sığmıyor" in diag_df.iloc[0]["neden"]
+
+def test_rejection_counts_bounded_by_candidates():
+    state = synthetic(n_courses=200, seed=9, availability=0.6)
+    _, diag_df, placed, unplaced, _ = solve_state(state)
+    assert len(diag_df) == len(unplaced) > 0
+    for _, row in diag_df.iterrows():
+        assert all(0 <= row[f"ret_{k}"] for k in CONSTRAINTS)
+        assert sum(row[f"ret_{k}"] for k in CONSTRAINTS if k != "pencere") >= row["aday"] - row["ret_pencere"]
@@ -0,0 +1,111 @@
+# tests/test_exact.py
+import random
+
+import pytest
+
+from ders_programi import exact_search, solve_state
+from ders_programi.occupancy import room_fits
+from helpers import n_unplaced, plan_errors, tiny_state
+
+def _random_case(i):
+    r = random.Random(i)
+    n_days, spd = r.randint(1, 2), r.randint(3, 4)
+    rooms = [{"id": f"R{k}", "capacity": r.choice([0, 20, 40])} for k in range(r.randint(1, 2))]
+    courses = [{"id": f"C{k}", "hoca": f"h{r.randint(1, 3)}", "sinif": r.randint(1, 2), "sure": r.randint(1, 2),
+                "online": r.random() < 0.25, "enrollment": r.choice([0, 10, 30])}
+               for k in range(r.randint(2, 6))]
+    unavailable = {f"h{k}": {(d, s) for d in range(n_days) for s in range(spd) if r.random() < 0.2}
+                   for k in range(1, 4)}
+    # Kaba kuvvet dersleri tek blok dener; bölünmeyi kapatarak aynı uzayı karşılaştır
+    return tiny_state(courses, rooms=rooms, n_days=n_days, spd=spd, unavailable=unavailable, split_sessions=False,
+                      online_cap=r.randint(0, 1), max_per_room=r.randint(1, 2),
+                      enf_instructor_no_overlap=r.random() < 0.8, enf_class_no_overlap=r.random() < 0.6)
+
+def _brute_force(state):
+    """Her dersi tek blok olarak tüm (gün, başlangıç, kanal) seçenekleriyle dene; çözüm var mı?"""
+    courses, spd, cs = state["courses"], state["slots_per_day"], state["constraint_settings"]
+    n_days = len(state["days"])
+    load = {}
+
+    def options(c):
+        L = c["sure"]
+        for d in range(n_days):
+            for s in range(spd - L + 1):
+                if any((d, t) in state["instructor_unavailable"].get(c["hoca"], ()) for t in range(s, s + L)):
+                    continue
+                if c["online"]:
+                    yield d, s, ("online",), int(cs["online_cap"])
+                else:
+                    for r in state["rooms"]:
+                        if room_fits(r, c):
+                            yield d, s, ("room", r["id"]), int(cs["max_per_room"])
+
+    def rec(k):
+        if k == len(courses):
+            return True
+        c = courses[k]
+        for d, s, chan, cap in options(c):
+            keys = [(chan, d, t) for t in range(s, s + c["sure"])]
+            if cs["enf_instructor_no_overlap"]:
+                keys += [(("hoca", c["hoca"]), d, t) for t in range(s, s + c["sure"])]
+            if cs["enf_class_no_overlap"]:
+                keys += [(("sinif", c["sinif"]), d, t) for t in range(s, s + c["sure"])]
+            limit = lambda key: cap if key[0] == chan else 1
+            if any(load.get(key, 0) >= limit(key) for key in keys):
+                continue
+            for key in keys:
+                load[key] = load.get(key, 0) + 1
+            found = rec(k + 1)
+            for key in keys:
+                load[key] -= 1
+            if found:
+                return True
+        return False
+
+    return rec(0)
+
+@pytest.mark.parametrize("i", range(400))
+def test_exact_matches_brute_force(i):
+    state = _random_case(i)
+    status, placements, info = exact_search(
+        state["days"], state["slots_per_day"], state["rooms"], state["courses"],
+        state["instructor_unavailable"], state["constraint_settings"],
+        state["day_start_slot"], state["day_use_slots"], fixed=[], free_ci=list(range(len(state["courses"]))),
+        node_limit=10**6, time_limit=30.0)
+    assert status == ("found" if _brute_force(state) else "infeasible")
+    if status == "found":
+        assert plan_errors(state, placements, []) == []
+
+def test_exact_respects_fixed_placements():
+    state = tiny_state([{"id": "A", "hoca": "h1"}, {"id": "B", "hoca": "h2", "sinif": 2}], spd=2)
+    status, placements, _ = exact_search(
+        state["days"], 2, state["rooms"], state["courses"], {}, state["constraint_settings"],
+        state["day_start_slot"], state["day_use_slots"], fixed=[(0, 0, 0, "FaceToFace", "R1", 1)], free_ci=[1])
+    assert status == "found" and placements == [(1, 0, 1, "FaceToFace", "R1", 1)]
+
+def test_exact_node_limit():
+    courses = [{"id": f"C{k}", "hoca": f"h{k}", "sinif": k % 4 + 1, "sure": 1} for k in range(9)]
+    state = tiny_state(courses, rooms=("R1", "R2"), spd=4, enf_class_no_overlap=False)
+    status, placements, info = exact_search(
+        state["days"], 4, state["rooms"], state["courses"], {}, state["constraint_settings"],
+        state["day_start_slot"], state["day_use_slots"], fixed=[], free_ci=list(range(9)), node_limit=50)
+    assert status in ("limit", "infeasible") and placements == []
+
+def test_exact_strategy_places_all_when_solvable():
+    # Greedy sırasıyla (uzun ders önce) A2 ilk slota oturur ve B yerleşemez; tam arama yerleştirir
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 2}, {"id": "B", "hoca": "h2", "sinif": 2}],
+                       spd=3, unavailable={"h2": {(0, 2)}})
+    assert n_unplaced(solve_state(state)) == 1
+    result = solve_state(state, strategy="Tam arama (CSP + MRV)")
+    assert n_unplaced(result) == 0
+    assert plan_errors(state, result[2], result[3]) == []
+
+def test_exhausted_search_with_splittable_course_is_not_a_proof():
+    # A (2 saat) tek blok sığmaz ama 0. ve 2. slotlara bölünerek yerleşebilir
+    for split, expected in ((True, "infeasible_unsplit"), (False, "infeasible")):
+        state = tiny_state([{"id": "A", "hoca": "h1", "sure": 2}], spd=3, unavailable={"h1": {(0, 1)}},
+                           split_sessions=split)
+        status, _, info = exact_search(
+            state["days"], 3, state["rooms"], state["courses"], state["instructor_unavailable"],
+            state["constraint_settings"], state["day_start_slot"], state["day_use_slots"], fixed=[], free_ci=[0])
+        assert status == expected and info["split_courses"] == int(split)
@@ -0,0 +1,15 @@
+# tests/test_exporters.py
+from ders_programi.exporters import _grid_page
+
+def test_grid_page_clips_text_to_its_cell():
+    cols = ["Saat", "R1", "R2", "R3"]
+    fig, _ = _grid_page("Pazartesi", cols, [["08:00", "W" * 80, "", ""], ["09:00", "", "KISA", ""]])
+    ax = fig.axes[0]
+    col_w = (0.98 - 0.02) * (1 - 0.08) / 3
+    texts = [t for t in ax.texts if t.get_text()]
+    assert len(texts) == len(cols) + 4
+    for t in texts:
+        box = t.get_clip_box().get_points()
+        x, _ = ax.transData.transform(t.get_position())
+        assert t.get_clip_on() and box[0][0] <= x < box[1][0]
+        assert box[1][0] - box[0][0] <= ax.transData.transform((col_w, 0))[0] - ax.transData.transform((0, 0))[0] + 1e-6
@@ -0,0 +1,92 @@
+# tests/test_faculty.py
+import json
+
+import pytest
+
+from ders_programi import (partition_rooms, room_usage_frame, room_utilization, solve_departments, solve_state,
+                           state_to_payload)
+from ders_programi.cli import main
+from helpers import plan_errors, synthetic, tiny_state
+
+def _dept(name, courses, rooms=("R",), pins=(), **kw):
+    courses = [dict({"hoca": f"{name}-{c['id']}"}, **c) for c in courses]
+    return name, tiny_state(courses, rooms=rooms, pins=pins, **kw)
+
+def _shared_room_overlaps(departments, results):
+    seen = {}
+    for name, state in departments:
+        for ci, d, start, ch, rm, L in results[name][2]:
+            if ch != "Online":
+                for s in range(start, start + L):
+                    seen.setdefault((rm, d, s), []).append(name)
+    return {k: v for k, v in seen.items() if len(v) > 1}
+
+def test_pin_kept_in_room_given_to_other_department():
+    # Tek ortak oda A'ya düşer; B'nin o odadaki PIN'i korunmalı, A çevresinde yerleşmeli
+    A = _dept("A", [{"id": "A0"}, {"id": "A1", "sinif": 2}], spd=2)
+    B = _dept("B", [{"id": "B0"}], spd=2, pins=[{"id": "B0", "day": 0, "start": 0, "channel": "FaceToFace", "room": "R"}])
+    departments = [A, B]
+    assert partition_rooms(departments) == {"A": ["R"], "B": []}
+    results, info = solve_departments(departments, workers=1)
+    assert results["B"][2] == [(0, 0, 0, "FaceToFace", "R", 1)] and results["B"][3] == []
+    assert [p[2] for p in results["A"][2]] == [1]
+    assert _shared_room_overlaps(departments, results) == {}
+
+def test_departments_never_share_a_room_slot():
+    A = _dept("A", [{"id": f"A{k}", "sinif": k % 4 + 1, "sure": 1 + k % 2} for k in range(6)], rooms=("R", "A1"),
+              n_days=2, spd=4)
+    B = _dept("B", [{"id": f"B{k}", "sinif": k % 4 + 1} for k in range(6)], rooms=("R", "B1"), n_days=2, spd=4,
+              pins=[{"id": "B0", "day": 1, "start": 3, "channel": "FaceToFace", "room": "R"}])
+    departments = [A, B]
+    results, info = solve_departments(departments, workers=1)
+    assert _shared_room_overlaps(departments, results) == {}
+    for name, state in departments:
+        assert plan_errors(state, results[name][2], results[name][3]) == []
+    assert (0, 1, 3, "FaceToFace", "R", 1) in results["B"][2]
+    assert set(room_usage_frame(departments, results)["Bölüm"]) == {"A", "B"}
+
+def test_room_utilization_uses_day_window():
+    A = _dept("A", [{"id": "A0"}], n_days=2, spd=4)
+    A[1]["day_use_slots"] = {0: 2, 1: 4}
+    A[1]["day_start_slot"] = {0: 1, 1: 0}
+    results, _ = solve_departments([A], workers=1)
+    row = room_utilization([A], results).iloc[0]
+    assert row["Toplam slot"] == 6 and row["Dolu slot"] == 1
+
+def test_calendar_mismatch_rejected():
+    with pytest.raises(ValueError):
+        solve_departments([_dept("A", [{"id": "A0"}], spd=2), _dept("B", [{"id": "B0"}], spd=3)])
+
+def test_keep_and_reserved_respected():
+    state = synthetic(n_courses=60, seed=5)
+    first = solve_state(state)
+    keep = first[2][:20]
+    reserved = [(state["rooms"][0]["id"], d, 0, 3) for d in range(len(state["days"]))]
+    result = solve_state(state, keep=keep, reserved=reserved)
+    assert plan_errors(state, result[2], result[3], reserved) == []
+    # Rezerve slotlara düşmeyen korunan yerleşimler aynen kalır
+    blocked = {(rm, d, s) for rm, d, start, L in reserved for s in range(start, start + L)}
+    clean = {p[0] for p in keep} - {p[0] for p in keep
+                                    if any((p[4], p[1], s) in blocked for s in range(p[2], p[2] + p[5]))}
+    assert clean and sorted(p for p in result[2] if p[0] in clean) == sorted(p for p in keep if p[0] in clean)
+
+def test_duplicate_department_names_rejected():
+    with pytest.raises(ValueError):
+        solve_departments([_dept("A", [{"id": "A0"}]), _dept("A", [{"id": "A1"}])])
+
+def test_partition_window_respects_day_start():
+    # A'nın penceresi 3. slottan başlar (1 slot); eski hesap 4 sayıp R2'yi B'ye veriyordu
+    A = _dept("A", [{"id": "A0", "sure": 2}, {"id": "A1", "sure": 3}], rooms=("R1", "R2"), spd=4)
+    A[1]["day_start_slot"], A[1]["day_use_slots"] = {0: 3}, {0: 4}
+    B = _dept("B", [{"id": "B0", "sure": 3}], rooms=("R1", "R2"), spd=4)
+    assert partition_rooms([A, B]) == {"A": ["R1", "R2"], "B": []}
+
+def test_cli_uniquifies_department_names(tmp_path):
+    paths = []
+    for folder, name in (("x", "A"), ("y", "B")):
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / "bolum.json"
+        path.write_text(json.dumps(state_to_payload(_dept(name, [{"id": f"{name}0"}])[1])), encoding="utf-8")
+        paths.append(str(path))
+    assert main(["faculty", *paths, "-o", str(tmp_path / "out"), "-f", "csv"]) == 0
+    assert {"bolum.csv", "bolum-2.csv"} <= {p.name for p in (tmp_path / "out").iterdir()}
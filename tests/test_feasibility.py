@@ -0,0 +1,29 @@
+# tests/test_feasibility.py
+import pytest
+
+from ders_programi import check_state, solve_state
+from helpers import n_unplaced, synthetic, tiny_state
+
+def test_impossible_courses_reported():
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 5},
+                        {"id": "B", "hoca": "h2", "sure": 2, "ardisik": True},
+                        {"id": "C", "hoca": "h3", "enrollment": 90}],
+                       rooms=[{"id": "R1", "capacity": 40}], spd=4, unavailable={"h2": {(0, 1), (0, 3)}})
+    findings, lower_bound, _ = check_state(state)
+    assert {f["kapsam"] for f in findings if f["tur"] == "ders"} == {"A", "B", "C"}
+    assert lower_bound == 3 == n_unplaced(solve_state(state))
+
+def test_group_capacity_drops_longest_first():
+    # Tek oda, 4 slot: 3+2+1 saat => en az 1 (3 saatlik) ders yerleşemez
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 3, "ardisik": True},
+                        {"id": "B", "hoca": "h2", "sure": 2, "ardisik": True, "sinif": 2},
+                        {"id": "C", "hoca": "h3", "sinif": 3}], spd=4)
+    findings, lower_bound, _ = check_state(state)
+    assert [f["en_az_yerlesemeyen"] for f in findings if f["tur"] == "yüz yüze"] == [1]
+    assert lower_bound == 1
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lower_bound_never_exceeds_greedy(seed):
+    state = synthetic(n_courses=150, seed=seed, availability=0.5)
+    _, lower_bound, _ = check_state(state)
+    assert lower_bound <= n_unplaced(solve_state(state))
@@ -0,0 +1,23 @@
+# tests/test_grid.py
+from ders_programi import build_grid, day_table, grid_to_frame, solve_state
+from ders_programi.grid import EMPTY, course_label
+from helpers import synthetic, tiny_state
+
+def test_grid_cells_by_day_slot_column():
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 2}, {"id": "B", "hoca": "h2"}, {"id": "C", "hoca": "h3"}],
+                       rooms=("R1", "R2"), spd=3, max_per_room=2, enf_class_no_overlap=False)
+    placed = [(0, 0, 0, "FaceToFace", "R2", 2), (1, 0, 1, "FaceToFace", "R2", 1), (2, 0, 2, "Online", "ONLINE", 1)]
+    grid = build_grid(placed, state["courses"], 1, 3, state["rooms"])
+    a, b, c = (course_label(x) for x in state["courses"])
+    assert grid[0] == [[EMPTY, a, EMPTY], [EMPTY, f"{a} / {b}", EMPTY], [EMPTY, EMPTY, c]]
+    table = day_table(grid, 0, state["rooms"], state["time_labels"])
+    assert list(table.columns) == ["Saat", "R1", "R2", "ONLINE"] and table.iloc[1, 2] == f"{a}\n{b}"
+
+def test_frame_matches_grid():
+    state = synthetic(n_courses=60, seed=4)
+    frame, _, placed, _, grid = solve_state(state)
+    n_cols = len(state["rooms"]) + 1
+    assert len(frame) == len(state["days"]) * state["slots_per_day"] * n_cols
+    assert frame.equals(grid_to_frame(grid, state["days"], state["rooms"], state["time_labels"]))
+    busy = frame[frame["Courses"] != EMPTY]
+    assert len(busy) == len({(p[1], s, p[4]) for p in placed for s in range(p[2], p[2] + p[5])})
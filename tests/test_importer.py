@@ -0,0 +1,47 @@
+# tests/test_importer.py
+import io
+
+import pytest
+
+from ders_programi import import_courses, upsert_courses
+
+CSV = """id,ad,hoca,sinif,sure,ardisik,online,enrollment,features
+D1,Ders 1,Ali,1,2,evet,hayır,30,lab
+D2,Ders 2,Yeni,2,3,false,true,,
+D1,Tekrar,Ali,1,1,true,false,,
+,Boş ID,Ali,1,1,true,false,,
+D3,Sınıf hatalı,Ali,7,1,true,false,,
+D4,Süre hatalı,Ali,1,0,true,false,,
+D5,Öğrenci hatalı,Ali,1,1,true,false,-3,
+"""
+
+def test_import_validates_columns_and_reports_lines():
+    out = import_courses(io.StringIO(CSV), "dersler.csv", existing=[], instructors=["Ali"])
+    assert (out["read"], out["valid"], out["rejected"]) == (7, 2, 5)
+    assert [c["id"] for c in out["courses"]] == ["D1", "D2"]
+    d1 = out["courses"][0]
+    assert d1["ardisik"] is True and d1["online"] is False and d1["enrollment"] == 30 and d1["features"] == ["lab"]
+    assert out["new_instructors"] == ["Yeni"]
+    errors = out["report"][out["report"]["Düzey"] == "hata"]
+    assert list(errors["Satır"]) == [4, 5, 6, 7, 8]
+    assert list(errors["Kolon"]) == ["id", "id", "sinif", "sure", "enrollment"]
+
+def test_unknown_instructor_rejected_when_not_allowed():
+    out = import_courses(io.StringIO(CSV), "dersler.csv", [], ["Ali"], allow_new_instructors=False)
+    assert out["valid"] == 1 and out["new_instructors"] == []
+
+def test_chunked_read_matches_single_read():
+    whole = import_courses(io.StringIO(CSV), "dersler.csv", [], ["Ali"])
+    chunked = import_courses(io.StringIO(CSV), "dersler.csv", [], ["Ali"], chunksize=2)
+    assert whole["courses"] == chunked["courses"] and whole["report"].equals(chunked["report"])
+
+def test_missing_required_column():
+    with pytest.raises(ValueError, match="sure"):
+        import_courses(io.StringIO("id,ad,hoca,sinif,ardisik,online\nD1,a,b,1,1,0\n"), "x.csv", [], [])
+
+def test_upsert_modes():
+    old = [{"id": "A", "ad": "eski"}, {"id": "B", "ad": "b"}]
+    new = [{"id": "A", "ad": "yeni"}, {"id": "C", "ad": "c"}]
+    assert upsert_courses(old, new) == ([{"id": "A", "ad": "yeni"}, old[1], new[1]], 1, 1, 0)
+    assert upsert_courses(old, new, update_existing=False) == ([old[0], old[1], new[1]], 1, 0, 1)
+    assert upsert_courses(old, new, replace_all=True) == (new, 2, 0, 0)
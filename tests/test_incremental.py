@@ -0,0 +1,77 @@
+# tests/test_incremental.py
+import copy
+
+from ders_programi import incremental_schedule, plan_diff, snapshot_plan, solve_state
+from ders_programi.incremental import affected_ids
+from helpers import plan_errors, synthetic, tiny_state
+
+def _planned(state):
+    result = solve_state(state)
+    return result, snapshot_plan(state, result[2])
+
+def test_no_previous_or_structural_change_is_full_solve():
+    state = synthetic(n_courses=40, seed=1)
+    assert incremental_schedule(state, None)[1]["mode"] == "full"
+    _, prev = _planned(state)
+    changed = copy.deepcopy(state)
+    changed["constraint_settings"]["online_cap"] += 1
+    assert incremental_schedule(changed, prev)[1]["mode"] == "full"
+
+def test_plan_diff_detects_courses_pins_and_unavailability():
+    state = synthetic(n_courses=40, seed=1)
+    edited = copy.deepcopy(state)
+    edited["courses"][0]["ad"] = "Yeni ad"
+    edited["pins"].append({"id": edited["courses"][1]["id"], "day": 0, "start": 0, "channel": "Online", "room": "ONLINE"})
+    h = edited["courses"][2]["hoca"]
+    edited["instructor_unavailable"][h] = set(edited["instructor_unavailable"].get(h, ())) | {(0, 0)}
+    structural, changed = plan_diff(state, edited)
+    assert not structural
+    same_inst = {c["id"] for c in state["courses"] if c["hoca"] == h}
+    assert changed == {state["courses"][0]["id"], state["courses"][1]["id"]} | same_inst
+
+def test_name_edit_keeps_every_placement():
+    # Sınıf çakışması kuralı kapalıyken aynı sınıfı paylaşan dersler etkilenmemeli
+    state = synthetic(n_courses=200, seed=2, enf_class_no_overlap=False)
+    full, prev = _planned(state)
+    edited = copy.deepcopy(state)
+    edited["courses"][5]["ad"] = "Yeni ad"
+    assert affected_ids(prev, edited, {edited["courses"][5]["id"]}) == {edited["courses"][5]["id"]}
+    result, info = incremental_schedule(edited, prev)
+    placed_before = {p[0] for p in full[2]}
+    assert info["mode"] == "incremental" and info["kept"] == len(placed_before)
+    assert info["replanned"] == len(state["courses"]) - len(placed_before)
+    assert sorted(p for p in result[2] if p[0] in placed_before) == sorted(full[2])
+
+def test_affected_limited_to_real_clashes():
+    state = tiny_state([{"id": "A", "hoca": "h1"}, {"id": "B", "hoca": "h2"}, {"id": "C", "hoca": "h3", "sinif": 2}],
+                       rooms=("R1", "R2", "R3"), spd=2, enf_class_no_overlap=False)
+    _, prev = _planned(state)
+    assert {p[1:3] for p in prev["placed"]} == {(0, 0)}
+    edited = copy.deepcopy(state)
+    edited["courses"][0]["hoca"] = "h3"
+    # A'nın yeni hocası aynı slottaki C ile çakışır; B aynı sınıfta ama sınıf kuralı kapalı
+    assert affected_ids(prev, edited, {"A"}) == {"A", "C"}
+    edited["constraint_settings"]["enf_class_no_overlap"] = True
+    assert affected_ids(prev, edited, {"A"}) == {"A", "B", "C"}
+
+def test_kept_counts_surviving_placements():
+    state = tiny_state([{"id": "A", "hoca": "h1"}, {"id": "B", "hoca": "h2", "sinif": 2}], spd=3)
+    full, prev = _planned(state)
+    edited = copy.deepcopy(state)
+    # B'nin hocası B'nin mevcut slotunda uygunsuz olur => B korunamaz
+    b = next(p for p in full[2] if p[0] == 1)
+    edited["instructor_unavailable"]["h2"] = {(b[1], b[2])}
+    result, info = incremental_schedule(edited, prev)
+    assert info["kept"] == 1 and info["replanned"] == 1
+    assert plan_errors(edited, result[2], result[3]) == []
+    assert next(p for p in result[2] if p[0] == 1)[2] != b[2]
+
+def test_incremental_result_valid_after_duration_change():
+    state = synthetic(n_courses=120, seed=3, enf_class_no_overlap=True, availability=0.9)
+    _, prev = _planned(state)
+    edited = copy.deepcopy(state)
+    edited["courses"][10]["sure"] += 1
+    del edited["courses"][20]
+    result, info = incremental_schedule(edited, prev)
+    assert info["mode"] == "incremental"
+    assert plan_errors(edited, result[2], result[3]) == []
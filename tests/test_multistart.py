@@ -0,0 +1,37 @@
+# tests/test_multistart.py
+from ders_programi import multistart_schedule, soft_score, solve_state, variant_seeds
+from helpers import n_unplaced, plan_errors, synthetic
+
+def test_variant_seeds_start_with_classic_run():
+    assert variant_seeds(1) == [None]
+    assert variant_seeds(4, seed=3) == variant_seeds(4, seed=3) != variant_seeds(4, seed=4)
+
+def test_multistart_valid_and_not_worse():
+    state = synthetic(n_courses=150, seed=4)
+    result, runs = multistart_schedule(state, n_starts=4, workers=1)
+    assert plan_errors(state, result[2], result[3]) == []
+    assert len(runs) == 4
+    baseline = next(r[0] for r in runs if r[2] is None)
+    assert n_unplaced(result) == min(r[0] for r in runs) <= baseline == n_unplaced(solve_state(state))
+
+def test_winner_returned_without_resolve_and_reproducible():
+    state = synthetic(n_courses=150, seed=4, availability=0.6)
+    opts = dict(repair_budget=0, exact_node_limit=5000, exact_time_limit=None)
+    stats = {}
+    result, runs = multistart_schedule(state, n_starts=4, workers=1, stats=stats, **opts)
+    best = min(runs, key=lambda r: (r[0], r[1], runs.index(r)))
+    again = solve_state(state, seed=best[2], **opts)
+    assert result[2] == again[2] and result[3] == again[3] and result[0].equals(again[0])
+    assert stats["counters"]["candidates"] > 0
+
+def test_variants_ranked_by_state_soft_weights():
+    state = synthetic(n_courses=80, seed=2)
+    state["soft_settings"]["weights"] = dict.fromkeys(state["soft_settings"]["weights"], 0.0) | {"late_slots": 1.0}
+    result, runs = multistart_schedule(state, n_starts=3, workers=1)
+    for n, score, seed in runs:
+        placed = solve_state(state, seed=seed)[2]
+        assert score == soft_score(placed, state["courses"], len(state["days"]), state["slots_per_day"],
+                                   state["soft_settings"])[0]
+    best = min(runs, key=lambda r: (r[0], r[1]))
+    assert n_unplaced(result) == best[0] and soft_score(result[2], state["courses"], len(state["days"]),
+                                                        state["slots_per_day"], state["soft_settings"])[0] == best[1]
@@ -0,0 +1,75 @@
+# tests/test_occupancy.py
+import random
+
+import pytest
+
+from ders_programi import STRATEGIES, count_feasible_starts_for_course, make_occupancy, solve_state
+from ders_programi.occupancy import AvailabilityIndex, best_fit_order, room_fits, room_masks
+from helpers import synthetic
+
+@pytest.mark.parametrize("seed", range(10))
+def test_list_and_bitset_answer_alike(seed):
+    r = random.Random(seed)
+    n_days, spd, n_rooms = 3, 8, 4
+    unav = {"h1": {(0, 1), (2, 5)}, "h2": set()}
+    max_per_room = r.randint(1, 2)
+    occs = [make_occupancy(e, n_days, spd, n_rooms, unav, 2, max_per_room) for e in ("list", "bitset")]
+    for _ in range(60):
+        h, sinif = r.choice(["h1", "h2", "h3"]), r.randint(1, 3)
+        d, L = r.randrange(n_days), r.randint(1, 3)
+        start, allowed = r.randrange(spd - L + 1), r.choice([None, 0b0101, 0b1110])
+        answers = [(o.inst_unavailable(h, d, start, L), o.inst_busy(h, d, start, L), o.class_busy(sinif, d, start, L),
+                    o.online_full(d, start, L), o.free_room(d, start, L, allowed)) for o in occs]
+        assert answers[0] == answers[1]
+        ri = answers[0][4] if r.random() < 0.7 else None
+        if ri is not None or not answers[0][3]:
+            for o in occs:
+                o.add(h, sinif, d, start, L, ri)
+        if r.random() < 0.1:
+            blocked = r.randrange(n_rooms)
+            for o in occs:
+                o.block_room(blocked, d, start, L)
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        solve_state(synthetic(n_courses=10), engine="yok")
+
+def test_room_fit_and_best_fit_order():
+    rooms = [{"id": "B", "capacity": 80}, {"id": "X", "capacity": 0}, {"id": "A", "capacity": 30, "features": ["lab"]}]
+    assert [r["id"] for r in best_fit_order(rooms)] == ["A", "B", "X"]
+    assert room_fits(rooms[1], {"enrollment": 500}) and not room_fits(rooms[0], {"enrollment": 81})
+    assert not room_fits(rooms[0], {"features": ["lab"]}) and room_fits(rooms[2], {"features": ["lab"]})
+    assert room_masks(rooms, [{"enrollment": 40}, {"features": ["lab"]}]) == [0b011, 0b100]
+
+# ====================== Motor Eşdeğerliği ======================
+
+def _case(i):
+    """60 farklı küçük örnek (boyut, kapasite, PIN, oda başına ders, uygunluk)."""
+    return dict(n_courses=(40, 80, 120)[i % 3], seed=i, capacities=bool(i % 2), n_pins=(0, 3)[i // 3 % 2],
+                max_per_room=1 + i // 6 % 2, availability=(0.8, 0.6)[i // 12 % 2])
+
+@pytest.mark.parametrize("i", range(60))
+def test_bitset_engine_matches_list_baseline(i):
+    state = synthetic(**_case(i))
+    strategy = STRATEGIES[i % 2]
+    base = solve_state(state, strategy=strategy, engine="list")
+    fast = solve_state(state, strategy=strategy, engine="bitset")
+    assert fast[2] == base[2] and fast[3] == base[3]
+    assert fast[0].equals(base[0]) and fast[1].equals(base[1])
+
+# ====================== Uygunluk Dizini ======================
+
+def test_availability_index_counts_starts_in_window():
+    avail = AvailabilityIndex(2, 6, {"h": {(0, 2)}}, {0: 0, 1: 1}, {0: 6, 1: 3})
+    # Gün 0: 0-1 ve 3-5 boş => 2'lik başlangıçlar 0, 3, 4; gün 1: pencere 1-3 => 1, 2
+    assert avail.count_feasible_starts("h", 2) == 5
+    assert avail.count_feasible_starts("yok", 4) == 3
+
+def test_availability_index_matches_slot_scan():
+    state = synthetic(n_courses=80, seed=3)
+    avail = AvailabilityIndex(len(state["days"]), state["slots_per_day"], state["instructor_unavailable"],
+                              state["day_start_slot"], state["day_use_slots"])
+    for c in state["courses"]:
+        assert avail.count_feasible_starts(c["hoca"], c["sure"]) == count_feasible_starts_for_course(
+            c, state["day_start_slot"], state["day_use_slots"], state["slots_per_day"],
+            state["instructor_unavailable"], len(state["days"]))
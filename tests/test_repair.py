@@ -0,0 +1,32 @@
+# tests/test_repair.py
+from ders_programi import repair_schedule, solve_state
+from helpers import n_unplaced, plan_errors, synthetic, tiny_state
+
+def _repair(state, result, **kw):
+    return repair_schedule(state["days"], state["slots_per_day"], state["rooms"], state["courses"],
+                           state["instructor_unavailable"], state["constraint_settings"],
+                           state["day_start_slot"], state["day_use_slots"], result[2], result[3], set(), **kw)
+
+def test_repair_moves_blocker_to_recover_course():
+    # A (2 saat) ilk iki slotu alır; B yalnızca 0-1'de uygun => A kaydırılınca B yerleşir
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 2}, {"id": "B", "hoca": "h2", "sinif": 2}],
+                       spd=3, unavailable={"h2": {(0, 2)}})
+    result = solve_state(state)
+    assert n_unplaced(result) == 1
+    placed, unplaced, stats = _repair(state, result)
+    assert unplaced == [] and stats["recovered"] == 1
+    assert plan_errors(state, placed, unplaced) == []
+
+def test_repair_never_worse_and_valid():
+    state = synthetic(n_courses=150, seed=6, availability=0.6)
+    result = solve_state(state)
+    placed, unplaced, stats = _repair(state, result, time_budget=0.5)
+    assert plan_errors(state, placed, unplaced) == []
+    assert len(unplaced) == len(result[3]) - stats["recovered"] and stats["attempted"] >= stats["recovered"]
+    assert n_unplaced(solve_state(state, repair_budget=0.5)) <= n_unplaced(result)
+
+def test_recovery_rate_is_per_budget_second():
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 2}, {"id": "B", "hoca": "h2", "sinif": 2}],
+                       spd=3, unavailable={"h2": {(0, 2)}})
+    _, _, stats = _repair(state, solve_state(state), time_budget=4.0)
+    assert stats["recovered"] == 1 and stats["recovered_per_sec"] == 0.25
@@ -0,0 +1,33 @@
+# tests/test_scoring.py
+import numpy as np
+
+from ders_programi import SOFT_TERMS, SoftScorer, default_soft_settings, quality_score, score_breakdown, solve_state
+from helpers import synthetic, tiny_state
+
+def test_quality_score_counts_daily_gaps():
+    state = tiny_state([{"id": "A", "hoca": "h1"}, {"id": "B", "hoca": "h1"}], spd=5)
+    placed = [(0, 0, 0, "FaceToFace", "R1", 1), (1, 0, 3, "FaceToFace", "R1", 1)]
+    # hoca h1 ve sınıf 1: 0 ve 3 arasında 2'şer boş slot
+    assert quality_score(placed, state["courses"], 1) == 4
+
+def test_soft_terms_on_small_plan():
+    state = tiny_state([{"id": "A", "hoca": "h1"}, {"id": "B", "hoca": "h2"}, {"id": "C", "hoca": "h1"}],
+                       rooms=("R1", "R2"), n_days=2, spd=5)
+    placed = [(0, 0, 0, "FaceToFace", "R1", 1), (1, 0, 1, "FaceToFace", "R2", 1), (2, 0, 4, "Online", "ONLINE", 1)]
+    settings = {"weights": {t: 1.0 for t in SOFT_TERMS}, "late_from": 4}
+    total, raw = SoftScorer(state["courses"], 2, 5, settings).score(placed)
+    assert raw == {"instructor_gaps": 3.0, "class_gaps": 2.0, "load_imbalance": 3.0, "late_slots": 1.0,
+                   "room_changes": 1.0, "channel_switches": 1.0}
+    assert total == sum(raw.values())
+    rows = score_breakdown(placed, state["courses"], 2, 5, settings)
+    assert rows[-1]["Katkı"] == total and len(rows) == len(SOFT_TERMS) + 1
+
+def test_score_many_matches_single_scores():
+    state = synthetic(n_courses=120, seed=8)
+    plans = [solve_state(state, seed=s)[2] for s in (None, 1, 2)] + [[]]
+    scorer = SoftScorer(state["courses"], len(state["days"]), state["slots_per_day"], default_soft_settings())
+    raw, totals = scorer.score_many(plans)
+    for plan, row, total in zip(plans, raw, totals):
+        single_total, single_raw = scorer.score(plan)
+        assert np.isclose(single_total, total) and list(single_raw.values()) == list(row)
+    assert totals[-1] == 0
@@ -0,0 +1,50 @@
+# tests/test_solver.py
+import pytest
+
+from ders_programi import DEFAULT_STRATEGY, solve_state
+from helpers import n_unplaced, plan_errors, synthetic, tiny_state
+
+# ====================== Kısıt Geçerliliği ======================
+
+MODES = {
+    "kıtlık": {"strategy": DEFAULT_STRATEGY},
+    "klasik": {"strategy": "Klasik: uzunluk-önce"},
+    "tohum": {"seed": 7},
+    "liste": {"engine": "list"},
+    "onarım": {"repair_budget": 0.3},
+    "tam": {"strategy": "Tam arama (CSP + MRV)", "exact_node_limit": 20000, "exact_time_limit": 2.0},
+}
+STATES = [dict(n_courses=60, seed=1, n_pins=4),
+          dict(n_courses=120, seed=2, capacities=True, max_per_room=2),
+          dict(n_courses=30, seed=3, availability=0.5, enf_class_no_overlap=True)]
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("kw", STATES)
+def test_every_mode_respects_constraints(mode, kw):
+    state = synthetic(**kw)
+    result = solve_state(state, **MODES[mode])
+    assert plan_errors(state, result[2], result[3]) == []
+    assert len(result[1]) == len(result[3])
+
+def test_strategy_defaults_to_state():
+    # B yalnızca 0. slotta uygun: kıtlık-önce B'yi önce yerleştirir, uzunluk-önce A'yı
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 2}, {"id": "B", "hoca": "h2", "sinif": 2}],
+                       spd=3, unavailable={"h2": {(0, 1), (0, 2)}})
+    assert n_unplaced(solve_state(state)) == 0
+    state["strategy"] = "Klasik: uzunluk-önce"
+    assert n_unplaced(solve_state(state)) == 1
+    assert n_unplaced(solve_state(state, strategy=DEFAULT_STRATEGY)) == 0
+
+def test_invalid_pin_reported_and_course_still_placed():
+    state = tiny_state([{"id": "A", "hoca": "h1"}], unavailable={"h1": {(0, 0)}},
+                       pins=[{"id": "A", "day": 0, "start": 0, "channel": "FaceToFace", "room": "R1"}])
+    _, _, placed, unplaced, _ = solve_state(state)
+    assert [reason for _, reason in unplaced] == ["PIN geçersiz: hoca uygunsuz saat"]
+    assert [p[:3] for p in placed] == [(0, 0, 1)]
+
+def test_split_sessions_use_separate_days():
+    state = tiny_state([{"id": "A", "hoca": "h1", "sure": 3, "ardisik": False}], n_days=3, spd=4,
+                       unavailable={"h1": {(d, s) for d in range(3) for s in (1, 3)}})
+    _, _, placed, unplaced, _ = solve_state(state)
+    assert unplaced == [] and len(placed) == 3 and len({p[1] for p in placed}) == 3
+    assert plan_errors(state, placed, unplaced) == []
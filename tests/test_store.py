@@ -0,0 +1,48 @@
+# tests/test_store.py
+import copy
+
+import pytest
+
+from ders_programi import ScenarioStore, solve_state, state_to_payload
+from helpers import synthetic
+
+@pytest.fixture
+def store(tmp_path):
+    with ScenarioStore(str(tmp_path / "senaryolar.db")) as s:
+        yield s
+
+def test_round_trip_state_and_plan(store):
+    state = synthetic(n_courses=80, seed=10, n_pins=3, capacities=True)
+    _, diag_df, placed, _, _ = solve_state(state)
+    store.save("taslak", state, placed, diag_df)
+    loaded, loaded_placed, loaded_diag = store.load("taslak")
+    assert loaded == state
+    assert loaded_placed == placed
+    assert len(loaded_diag) == len(diag_df) and list(loaded_diag["id"]) == list(diag_df["id"])
+    assert store.export_payload("taslak").keys() == state_to_payload(state).keys()
+
+def test_save_without_plan_overwrite_and_delete(store):
+    state = synthetic(n_courses=20, seed=11)
+    store.save("a", state)
+    assert store.load("a")[1:] == (None, None)
+    edited = copy.deepcopy(state)
+    edited["courses"][0]["ad"] = "Yeni ad"
+    store.save("a", edited)
+    assert store.load("a")[0]["courses"][0]["ad"] == "Yeni ad" and store.names() == ["a"]
+    store.delete("a")
+    with pytest.raises(KeyError):
+        store.load("a")
+
+def test_diff_lists_changes(store):
+    state = synthetic(n_courses=20, seed=12)
+    edited = copy.deepcopy(state)
+    edited["courses"][0]["sure"] += 1
+    edited["constraint_settings"]["online_cap"] += 1
+    del edited["courses"][1]
+    store.save("a", state)
+    store.save("b", edited)
+    diff = store.diff("a", "b")
+    rows = set(zip(diff["Tür"], diff["Anahtar"], diff["Alan"]))
+    assert ("Ders", state["courses"][0]["id"], "sure") in rows
+    assert ("Ders", state["courses"][1]["id"], "silindi") in rows
+    assert ("Ayar", "constraint_settings", "değer") in rows
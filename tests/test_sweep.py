@@ -0,0 +1,48 @@
+# tests/test_sweep.py
+import copy
+
+import pytest
+
+from ders_programi import apply_variant, expand, parse_spec, sweep_schedule
+from ders_programi.sweep import _CACHE
+from helpers import synthetic
+
+def test_parse_spec_values_and_ranges():
+    spec = parse_spec("online_cap = 2, 4..5  # yorum\ndrop_rooms = -, A+B\nstrategy = klasik\n"
+                      "enf_class_no_overlap = evet, hayır\nday_use_slots:4 = 6")
+    assert spec == {"online_cap": [2, 4, 5], "drop_rooms": [(), ("A", "B")], "strategy": ["Klasik: uzunluk-önce"],
+                    "enf_class_no_overlap": [True, False], "day_use_slots:4": [6]}
+    assert len(expand(spec)) == 12
+
+@pytest.mark.parametrize("text", ["yok = 1", "online_cap 3", "online_cap = x", "strategy = z", "day_use_slots = 3"])
+def test_parse_spec_rejects_bad_lines(text):
+    with pytest.raises(ValueError):
+        parse_spec(text)
+
+def test_parse_spec_checks_rooms_and_days_against_state():
+    state = synthetic(n_courses=30, seed=13)
+    room = state["rooms"][0]["id"]
+    assert parse_spec(f"drop_rooms = -, {room}", state) == {"drop_rooms": [(), (room,)]}
+    with pytest.raises(ValueError, match="Yok-1"):
+        parse_spec(f"drop_rooms = {room}+Yok-1", state)
+    with pytest.raises(ValueError, match="gün numarası"):
+        parse_spec(f"day_start_slot:{len(state['days'])} = 1", state)
+
+def test_apply_variant_leaves_input_untouched():
+    state = synthetic(n_courses=30, seed=13)
+    before = copy.deepcopy(state)
+    out = apply_variant(state, {"online_cap": 9, "day_use_slots:0": 2, "drop_rooms": (state["rooms"][0]["id"],)})
+    assert state == before
+    assert out["constraint_settings"]["online_cap"] == 9 and out["day_use_slots"][0] == 2
+    assert len(out["rooms"]) == len(state["rooms"]) - 1
+
+def test_sweep_dedupes_and_caches():
+    _CACHE.clear()
+    state = synthetic(n_courses=60, seed=14)
+    # Pencere slot sayısına kırpılır: 10 ve 12 aynı etkin durum
+    spec = parse_spec("online_cap = 1, 2\nday_use_slots:0 = 10, 12", state)
+    table, runs = sweep_schedule(state, spec)
+    assert len(runs) == 4 and list(table["Önbellek"]) == [False, True, False, True]
+    assert runs[0]["placed"] == runs[1]["placed"]
+    table, _ = sweep_schedule(state, spec)
+    assert table["Önbellek"].all()
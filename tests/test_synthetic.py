@@ -0,0 +1,19 @@
+# tests/test_synthetic.py
+from ders_programi import check_state
+from ders_programi.synthetic import generate_state
+from helpers import synthetic
+
+def test_same_seed_same_state():
+    assert generate_state(200, seed=5) == generate_state(200, seed=5) != generate_state(200, seed=6)
+
+def test_large_instance_stays_placeable_with_class_rule():
+    state = synthetic(n_courses=3000, seed=1)
+    assert state["constraint_settings"]["enf_class_no_overlap"]
+    window = [(d, s) for d in range(len(state["days"])) for s in range(state["day_use_slots"][d])]
+    load = {}
+    for c in state["courses"]:
+        load[c["hoca"]] = load.get(c["hoca"], 0) + c["sure"]
+    for h, hours in load.items():
+        assert hours <= sum(ds not in state["instructor_unavailable"].get(h, ()) for ds in window)
+    _, lower_bound, _ = check_state(state)
+    assert lower_bound <= 0.005 * len(state["courses"])